@@ -0,0 +1,479 @@
+#!/usr/bin/env python
+"""
+Load Test Harness
+Drives the running app at a target request rate and reports latency percentiles
+
+The harness starts a fake OpenWeatherMap upstream, launches the app server
+against it (or targets an already running server) and sends an open-loop
+request stream: requests are scheduled at a fixed rate whether or not
+earlier ones have finished, and latency is measured from the scheduled
+send time so a stalled server is not hidden by the client backing off.
+
+Scenarios:
+    cold    fresh server process, empty cache
+    warm    cache primed before the measurement starts
+    storm   very short cache TTL, so entries keep expiring under load
+
+With --target, the running server must be configured like a started one:
+OPENWEATHER_BASE_URL=http://127.0.0.1:<--upstream-port>/data/2.5 and, for
+the storm scenario, WEATHER_CACHE_DURATION=1. Both are checked before the
+measurement and the scenario fails if they are not in effect. The cold
+scenario is only cold against a freshly started target. Every
+response other than 2xx and 304 counts as an error.
+
+Usage:
+    python benchmarks/loadtest.py                                # all scenarios, runserver
+    python benchmarks/loadtest.py --scenario warm --rate 200 --duration 20
+    python benchmarks/loadtest.py --server uvicorn --concurrency 64
+    python benchmarks/loadtest.py --target http://127.0.0.1:8000 --upstream-port 8765 --scenario warm
+    python benchmarks/loadtest.py --output loadtest.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+DEFAULT_PATHS = ['/', '/api/current', '/api/forecast', '/api/recommendations']
+
+SCENARIOS = ('cold', 'warm', 'storm')
+
+# Cache TTL (seconds) used by the storm scenario
+STORM_CACHE_DURATION = 1
+
+SERVER_COMMANDS = {
+    'runserver': [sys.executable, 'manage.py', 'runserver', '--noreload', '127.0.0.1:{port}'],
+    'gunicorn': [sys.executable, '-m', 'gunicorn', '--bind', '127.0.0.1:{port}', '--workers', '{workers}',
+                 '--threads', '8', 'weather_project.wsgi:application'],
+    'uvicorn': [sys.executable, '-m', 'uvicorn', '--host', '127.0.0.1', '--port', '{port}',
+                '--workers', '{workers}', '--log-level', 'warning', 'weather_project.asgi:application'],
+}
+
+
+def setup_django():
+    """Configure Django so the test helpers building the upstream payloads can be imported"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'weather_project.settings')
+    os.environ.setdefault('OPENWEATHER_API_KEY', 'loadtest')
+    import django
+    django.setup()
+
+
+class FakeUpstreamServer:
+    """
+    Local HTTP server imitating the OpenWeatherMap endpoints
+    """
+
+    def __init__(self, latency=0.05, port=0):
+        """
+        Initialize the fake upstream
+
+        Args:
+            latency: Seconds each upstream response is delayed
+            port: Port to listen on, 0 for any free port
+        """
+        from weather_app.testing import make_current_payload, make_forecast_payload
+
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        current = json.dumps(make_current_payload()).encode('utf-8')
+        forecast = json.dumps(make_forecast_payload(periods=8)).encode('utf-8')
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with upstream._lock:
+                    upstream.calls += 1
+                time.sleep(upstream.latency)
+                body = forecast if self.path.startswith('/data/2.5/forecast') else current
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return 'http://127.0.0.1:{}/data/2.5'.format(self.port)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def free_port():
+    """
+    Find a free local TCP port
+
+    Returns:
+        int: Port number
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_app_server(server, upstream_url, settings_module, workers, cache_duration=None):
+    """
+    Launch the app server against the fake upstream
+
+    Args:
+        server: Server kind ('runserver', 'gunicorn' or 'uvicorn')
+        upstream_url: Base URL of the fake upstream
+        settings_module: DJANGO_SETTINGS_MODULE for the server
+        workers: Worker processes (gunicorn/uvicorn)
+        cache_duration: Override of WEATHER_CACHE_DURATION in seconds
+
+    Returns:
+        tuple: (subprocess.Popen, base URL of the app)
+    """
+    port = free_port()
+    env = dict(os.environ)
+    env.update({
+        'DJANGO_SETTINGS_MODULE': settings_module,
+        'OPENWEATHER_BASE_URL': upstream_url,
+        'OPENWEATHER_API_KEY': env.get('OPENWEATHER_API_KEY', 'loadtest'),
+        'SECRET_KEY': env.get('SECRET_KEY', 'loadtest-secret-key'),
+    })
+    if cache_duration is not None:
+        env['WEATHER_CACHE_DURATION'] = str(cache_duration)
+
+    command = [part.format(port=port, workers=workers) for part in SERVER_COMMANDS[server]]
+    process = subprocess.Popen(command, cwd=ROOT_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("App server exited with status {}".format(process.returncode))
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return process, 'http://127.0.0.1:{}'.format(port)
+        except OSError:
+            time.sleep(0.1)
+
+    process.kill()
+    raise RuntimeError("App server did not start within 30 seconds")
+
+
+def check_target(base_url, upstream, storm):
+    """
+    Check that an already running server is set up for the scenario
+
+    A location no scenario requests is fetched, so the server's cache
+    cannot answer it: the fake upstream must see the request. For the
+    storm scenario, the same location is fetched again once the storm TTL
+    has passed and must reach the upstream again.
+
+    Args:
+        base_url: Base URL of the app
+        upstream: FakeUpstreamServer the server should use
+        storm: Whether the storm scenario's TTL must be in effect
+
+    Raises:
+        RuntimeError: If the server does not use the fake upstream or the storm TTL
+    """
+    path = '/api/current?lat={:.4f}&lon={:.4f}'.format(random.uniform(-60, 60), random.uniform(-170, 170))
+    probe = LoadGenerator(base_url, [path], rate=1, duration=1, concurrency=1)
+
+    calls = upstream.calls
+    probe._send(path, time.perf_counter())
+    if upstream.calls == calls:
+        raise RuntimeError("{} does not fetch from the fake upstream; start it with "
+                           "OPENWEATHER_BASE_URL={}".format(base_url, upstream.base_url))
+    if storm:
+        time.sleep(STORM_CACHE_DURATION + 1)
+        calls = upstream.calls
+        probe._send(path, time.perf_counter())
+        if upstream.calls == calls:
+            raise RuntimeError("{} keeps entries longer than {}s; start it with "
+                               "WEATHER_CACHE_DURATION={} for the storm scenario".format(
+                                   base_url, STORM_CACHE_DURATION, STORM_CACHE_DURATION))
+
+
+class LoadGenerator:
+    """
+    Open-loop HTTP load generator with one connection per worker thread
+    """
+
+    def __init__(self, base_url, paths, rate, duration, concurrency, timeout=10, keep_alive=False):
+        """
+        Initialize the load generator
+
+        Args:
+            base_url: Base URL of the app
+            paths: URL paths requested round-robin
+            rate: Target requests per second
+            duration: Seconds to generate load
+            concurrency: Maximum requests in flight
+            timeout: Per-request timeout in seconds
+            keep_alive: Reuse connections between requests (runserver's
+                keep-alive responses stall on delayed ACKs, so this is off
+                by default)
+        """
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.paths = paths
+        self.rate = rate
+        self.duration = duration
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self._local = threading.local()
+        self._results = []
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            connection.connect()
+            # Avoid Nagle/delayed-ACK stalls on keep-alive connections
+            connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._local.connection = connection
+        return connection
+
+    def _close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _send(self, path, scheduled):
+        status = None
+        for attempt in range(2):
+            try:
+                if attempt:
+                    self._close()
+                connection = self._connection()
+                headers = {'Accept-Encoding': 'gzip'}
+                if not self.keep_alive:
+                    headers['Connection'] = 'close'
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+                if not self.keep_alive or response.getheader('Connection', '').lower() == 'close':
+                    self._close()
+                break
+            except (http.client.HTTPException, OSError):
+                status = None
+        latency = time.perf_counter() - scheduled
+        with self._lock:
+            self._results.append((path, status, latency))
+
+    def run(self):
+        """
+        Generate load for the configured duration
+
+        Returns:
+            dict: Report with latency percentiles, throughput and errors
+        """
+        total = int(self.rate * self.duration)
+        interval = 1.0 / self.rate
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for index in range(total):
+                scheduled = start + index * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self._send, self.paths[index % len(self.paths)], scheduled)
+
+        elapsed = time.perf_counter() - start
+        return summarize(self._results, elapsed, self.rate)
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of sorted values
+
+    Args:
+        sorted_values: Values in ascending order
+        fraction: Percentile as a fraction (e.g. 0.99)
+
+    Returns:
+        float or None if there are no values
+    """
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(results, elapsed, target_rate):
+    """
+    Summarize request results
+
+    Args:
+        results: List of (path, status, latency seconds)
+        elapsed: Wall-clock seconds of the run
+        target_rate: Target requests per second
+
+    Returns:
+        dict: Overall and per-path statistics
+    """
+    def stats(rows):
+        latencies = sorted(row[2] * 1000 for row in rows)
+        errors = sum(1 for row in rows if row[1] is None or not (200 <= row[1] < 300 or row[1] == 304))
+        return {
+            'requests': len(rows),
+            'errors': errors,
+            'error_rate': errors / len(rows) if rows else 0.0,
+            'p50_ms': percentile(latencies, 0.50),
+            'p95_ms': percentile(latencies, 0.95),
+            'p99_ms': percentile(latencies, 0.99),
+            'max_ms': latencies[-1] if latencies else None,
+        }
+
+    report = stats(results)
+    report['target_rate'] = target_rate
+    report['throughput'] = len(results) / elapsed if elapsed else 0.0
+    report['paths'] = {
+        path: stats([row for row in results if row[0] == path])
+        for path in sorted(set(row[0] for row in results))
+    }
+    return report
+
+
+def run_scenario(scenario, args):
+    """
+    Run one load scenario
+
+    Args:
+        scenario: 'cold', 'warm' or 'storm'
+        args: Parsed command line arguments
+
+    Returns:
+        dict: Scenario report
+    """
+    upstream = FakeUpstreamServer(latency=args.upstream_latency, port=args.upstream_port)
+    upstream.start()
+    process = None
+    try:
+        if args.target:
+            base_url = args.target
+            check_target(base_url, upstream, storm=scenario == 'storm')
+        else:
+            cache_duration = STORM_CACHE_DURATION if scenario == 'storm' else None
+            process, base_url = start_app_server(
+                args.server, upstream.base_url, args.settings, args.workers, cache_duration
+            )
+
+        if scenario == 'warm':
+            for path in args.paths:
+                LoadGenerator(base_url, [path], rate=1, duration=1, concurrency=1)._send(path, time.perf_counter())
+
+        calls_before = upstream.calls
+        generator = LoadGenerator(
+            base_url, args.paths, args.rate, args.duration, args.concurrency, keep_alive=args.keep_alive
+        )
+        report = generator.run()
+        report['scenario'] = scenario
+        report['upstream_calls'] = upstream.calls - calls_before
+        return report
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        upstream.stop()
+
+
+def print_report(report):
+    """
+    Print a scenario report
+
+    Args:
+        report: Scenario report
+    """
+    def format_ms(value):
+        return '{:8.1f}'.format(value) if value is not None else '       -'
+
+    print("\n📊 Scenario: {}".format(report['scenario']))
+    print("   Throughput: {:.1f} req/s (target {:.1f}), upstream calls: {}".format(
+        report['throughput'], report['target_rate'], report['upstream_calls']
+    ))
+    print("   {:<24} {:>8} {:>8} {:>8} {:>8} {:>8} {:>8}".format(
+        'path', 'requests', 'errors', 'p50 ms', 'p95 ms', 'p99 ms', 'max ms'
+    ))
+    rows = list(report['paths'].items()) + [('ALL', report)]
+    for path, stats in rows:
+        print("   {:<24} {:>8} {:>8} {} {} {} {}".format(
+            path, stats['requests'], stats['errors'], format_ms(stats['p50_ms']),
+            format_ms(stats['p95_ms']), format_ms(stats['p99_ms']), format_ms(stats['max_ms'])
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the weather app against a fake upstream')
+    parser.add_argument('--scenario', choices=SCENARIOS + ('all',), default='all')
+    parser.add_argument('--rate', type=float, default=100, help='Target requests per second')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds of load per scenario')
+    parser.add_argument('--concurrency', type=int, default=32, help='Maximum requests in flight')
+    parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS, help='URL paths requested round-robin')
+    parser.add_argument('--server', choices=sorted(SERVER_COMMANDS), default='runserver')
+    parser.add_argument('--workers', type=int, default=2, help='Worker processes (gunicorn/uvicorn)')
+    parser.add_argument('--settings', default='weather_project.settings', help='DJANGO_SETTINGS_MODULE')
+    parser.add_argument('--target', help='Use an already running server instead of starting one '
+                                         '(requires --upstream-port, see the module docstring)')
+    parser.add_argument('--upstream-port', type=int, default=0,
+                        help='Port of the fake upstream, 0 for any free port')
+    parser.add_argument('--keep-alive', action='store_true', help='Reuse connections between requests')
+    parser.add_argument('--upstream-latency', type=float, default=0.05, help='Fake upstream delay in seconds')
+    parser.add_argument('--output', help='Write reports to this JSON file')
+    args = parser.parse_args()
+    if args.target and not args.upstream_port:
+        parser.error('--target requires --upstream-port, the port its OPENWEATHER_BASE_URL points to')
+    setup_django()
+
+    scenarios = SCENARIOS if args.scenario == 'all' else (args.scenario,)
+    print("=" * 70)
+    print(" Load test: {} req/s for {}s, {} in flight, server: {}".format(
+        args.rate, args.duration, args.concurrency, args.target or args.server
+    ))
+    print("=" * 70)
+
+    reports = []
+    for scenario in scenarios:
+        report = run_scenario(scenario, args)
+        print_report(report)
+        reports.append(report)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump({'config': vars(args), 'scenarios': reports}, output_file, indent=2)
+        print("\n   Reports written to {}".format(args.output))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+"""
+Benchmark Suite
+Measures parsing, sport evaluation and end-to-end page rendering
+
+Results are written as JSON and can be compared against a stored baseline;
+any benchmark slower than the baseline by more than the threshold is
+reported as a regression and the script exits with status 1. The committed
+benchmarks/baseline.json is a reference run; its 'meta' records the
+machine it was taken on, and comparisons are only meaningful on a similar
+one, so regenerate it with --save-baseline before comparing elsewhere.
+
+Usage:
+    python benchmarks/suite.py                                  # run and print
+    python benchmarks/suite.py --output results.json            # save results
+    python benchmarks/suite.py --save-baseline                  # store benchmarks/baseline.json
+    python benchmarks/suite.py --compare benchmarks/baseline.json [--threshold 0.1]
+    python benchmarks/suite.py --filter sport                   # run a subset
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Forecast sizes: 24 hours, 5 days and a long synthetic horizon (3-hour steps)
+PERIOD_COUNTS = (8, 40, 1000)
+
+
+def setup_django():
+    """Configure Django for benchmarks that need settings or views"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'weather_project.settings')
+    os.environ.setdefault('OPENWEATHER_API_KEY', 'benchmark')
+    import django
+    django.setup()
+
+
+def measure(func, min_time=0.2, repeat=5):
+    """
+    Time a callable, calibrating the loop count to the minimum run time
+
+    Args:
+        func: Callable without arguments
+        min_time: Minimum seconds per timed run
+        repeat: Number of timed runs
+
+    Returns:
+        dict: Per-call timings in seconds
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1000000:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        runs.append((time.perf_counter() - start) / loops)
+
+    return {
+        'min_s': min(runs),
+        'median_s': statistics.median(runs),
+        'max_s': max(runs),
+        'loops': loops,
+        'repeat': repeat,
+    }
+
+
+def build_benchmarks():
+    """
+    Create the benchmark callables
+
+    Returns:
+        list: (name, callable) pairs
+    """
+    from django.test import Client
+    from weather_app.services.sport_service import SportRecommendationService
+    from weather_app.services.weather_service import WeatherService
+    from weather_app.testing import make_current_payload, make_forecast_payload
+
+    weather_service = WeatherService()
+    sport_service = SportRecommendationService()
+    benchmarks = []
+
+    current_payload = make_current_payload(rain_1h=0.3)
+    benchmarks.append(('parse_current_weather', lambda: weather_service._parse_current_weather(current_payload)))
+
+    forecasts = {}
+    for periods in PERIOD_COUNTS:
+        payload = make_forecast_payload(periods=periods)
+        forecasts[periods] = weather_service._parse_forecast(payload)
+        benchmarks.append((
+            'parse_forecast[{}]'.format(periods),
+            lambda payload=payload: weather_service._parse_forecast(payload)
+        ))
+
+    current = weather_service._parse_current_weather(current_payload)
+    benchmarks.append(('evaluate_sport[cycling]', lambda: sport_service.evaluate_sport('cycling', current)))
+    benchmarks.append(('evaluate_sport[running]', lambda: sport_service.evaluate_sport('running', current)))
+
+    for periods in PERIOD_COUNTS:
+        benchmarks.append((
+            'recommendations_for_forecast[{}]'.format(periods),
+            lambda forecast=forecasts[periods]: sport_service.get_recommendations_for_forecast(forecast)
+        ))
+
+    client = Client(HTTP_HOST='localhost')
+
+    def index_warm():
+        response = client.get('/')
+        assert response.status_code == 200
+
+    def index_cold():
+        weather_service.clear_cache()
+        index_warm()
+
+    benchmarks.append(('index[warm_cache]', index_warm))
+    benchmarks.append(('index[cold_cache]', index_cold))
+
+    return benchmarks
+
+
+def run(name_filter=None, min_time=0.2, repeat=5):
+    """
+    Run all benchmarks
+
+    The fake upstream is patched in for the whole run, so patching is not
+    part of the timed calls.
+
+    Args:
+        name_filter: Only run benchmarks whose name contains this string
+        min_time: Minimum seconds per timed run
+        repeat: Number of timed runs
+
+    Returns:
+        dict: Machine-readable results
+    """
+    setup_django()
+    from unittest.mock import patch
+    from weather_app.services.weather_service import WeatherService
+    from weather_app.testing import FakeUpstream
+
+    results = {}
+    with patch('weather_app.services.weather_service.requests.get', new=FakeUpstream()):
+        for name, func in build_benchmarks():
+            if name_filter and name_filter not in name:
+                continue
+            WeatherService().clear_cache()
+            results[name] = measure(func, min_time=min_time, repeat=repeat)
+            print("   {:<40} {:>12.2f} µs  (median {:.2f} µs, {} loops)".format(
+                name, results[name]['min_s'] * 1e6, results[name]['median_s'] * 1e6, results[name]['loops']
+            ))
+
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """
+    Compare results against a baseline
+
+    The fastest run (min_s) is compared because it is the least affected
+    by noise from other processes.
+
+    Args:
+        current: Results of this run
+        baseline: Stored baseline results
+        threshold: Allowed slowdown as a fraction (0.1 = 10%)
+
+    Returns:
+        list: Names of regressed benchmarks
+    """
+    regressions = []
+    print("\n   {:<40} {:>12} {:>12} {:>9}".format('benchmark', 'baseline µs', 'current µs', 'change'))
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            print("   {:<40} {:>12} {:>12.2f} {:>9}".format(name, '-', result['min_s'] * 1e6, 'new'))
+            continue
+        change = result['min_s'] / reference['min_s'] - 1
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        print("   {:<40} {:>12.2f} {:>12.2f} {:>+8.1f}% {}".format(
+            name, reference['min_s'] * 1e6, result['min_s'] * 1e6, change * 100,
+            '❌ REGRESSION' if regressed else '✅'
+        ))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the weather app benchmark suite')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store results as the baseline ({})'.format(DEFAULT_BASELINE))
+    parser.add_argument('--compare', metavar='BASELINE', help='Compare against a stored baseline JSON file')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Allowed slowdown (default: 0.10)')
+    parser.add_argument('--filter', help='Only run benchmarks whose name contains this string')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Minimum seconds per timed run')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per benchmark')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(" Benchmark suite")
+    print("=" * 70)
+    results = run(name_filter=args.filter, min_time=args.min_time, repeat=args.repeat)
+
+    for path in filter(None, [args.output, DEFAULT_BASELINE if args.save_baseline else None]):
+        with open(path, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+        print("\n   Results written to {}".format(path))
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\n❌ {} regression(s) above {:.0f}%: {}".format(
+                len(regressions), args.threshold * 100, ', '.join(regressions)
+            ))
+            return 1
+        print("\n✅ No regressions above {:.0f}%".format(args.threshold * 100))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+Request Throughput Benchmark
+Compares index page throughput of the default and production settings profiles
+
+Each profile runs in its own process against a fake OpenWeatherMap upstream,
+calling the WSGI application directly so only Django's request handling,
+middleware, view and template work is measured.
+
+Usage:
+    python benchmarks/throughput.py [--requests 2000] [--path /]
+"""
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+PROFILES = [
+    'weather_project.settings',
+    'weather_project.settings_production',
+]
+
+
+def run_worker(requests_count, path):
+    """
+    Measure throughput of the configured settings profile (child process)
+
+    Args:
+        requests_count: Number of timed requests
+        path: URL path to request
+
+    Returns:
+        dict: Benchmark result
+    """
+    import django
+    django.setup()
+
+    from unittest.mock import patch
+    from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+    from django.core.management import call_command
+    from django.core.wsgi import get_wsgi_application
+    from weather_app.testing import FakeUpstream
+
+    # Hashed static names need a manifest, as in a real deployment
+    if isinstance(staticfiles_storage, ManifestFilesMixin):
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    application = get_wsgi_application()
+    statuses = []
+
+    def start_response(status, headers, exc_info=None):
+        statuses.append(status)
+
+    def make_environ():
+        return {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': '',
+            'SCRIPT_NAME': '',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.url_scheme': 'http',
+            'wsgi.errors': sys.stderr,
+        }
+
+    def call():
+        result = application(make_environ(), start_response)
+        body = b''.join(result)
+        if hasattr(result, 'close'):
+            result.close()
+        return body
+
+    with patch('weather_app.services.weather_service.requests.get', new=FakeUpstream()):
+        # Warm up caches and lazily initialized Django internals
+        for _ in range(50):
+            call()
+        statuses.clear()
+
+        start = time.perf_counter()
+        for _ in range(requests_count):
+            call()
+        elapsed = time.perf_counter() - start
+
+    return {
+        'settings': os.environ['DJANGO_SETTINGS_MODULE'],
+        'requests': requests_count,
+        'seconds': round(elapsed, 4),
+        'requests_per_second': round(requests_count / elapsed, 1),
+        'mean_ms': round(elapsed / requests_count * 1000, 4),
+        'errors': sum(1 for status in statuses if not status.startswith('200')),
+    }
+
+
+def run_profile(settings_module, requests_count, path):
+    """
+    Run the benchmark for one settings profile in a separate process
+
+    Args:
+        settings_module: Dotted path of the settings module
+        requests_count: Number of timed requests
+        path: URL path to request
+
+    Returns:
+        dict: Benchmark result reported by the child process
+    """
+    env = dict(os.environ)
+    env['DJANGO_SETTINGS_MODULE'] = settings_module
+    env.setdefault('OPENWEATHER_API_KEY', 'benchmark')
+    env.setdefault('SECRET_KEY', 'benchmark-secret-key')
+    # Compare middleware and settings, not the rendered page cache
+    env.setdefault('WEATHER_PAGE_CACHE', 'false')
+
+    output = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), '--worker',
+         '--requests', str(requests_count), '--path', path],
+        env=env, cwd=ROOT_DIR
+    )
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare request throughput of settings profiles')
+    parser.add_argument('--requests', type=int, default=2000, help='Timed requests per profile')
+    parser.add_argument('--path', default='/', help='URL path to request')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.requests, args.path)))
+        return 0
+
+    print("=" * 70)
+    print(" Request throughput: {} ({} requests)".format(args.path, args.requests))
+    print("=" * 70)
+
+    results = [run_profile(profile, args.requests, args.path) for profile in PROFILES]
+    for result in results:
+        print("   {:<40} {:>10.1f} req/s {:>9.3f} ms/req  errors: {}".format(
+            result['settings'], result['requests_per_second'], result['mean_ms'], result['errors']
+        ))
+
+    baseline, production = results
+    gain = (production['requests_per_second'] / baseline['requests_per_second'] - 1) * 100
+    print("\n   Production profile throughput gain: {:+.1f}%".format(gain))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -37,24 +37,57 @@ const WeatherCharts = (function () {
         console.log('Initializing weather charts...');
 
         // Get forecast data
-        const forecastData = window.forecastData || [];
+        const forecastData = window.forecastData;
 
-        if (!forecastData || forecastData.length === 0) {
+        if (!hasData(forecastData)) {
             console.warn('No forecast data available for charts');
             return;
         }
 
         // Initialize each chart
-        initTemperatureChart(forecastData);
-        initPrecipitationChart(forecastData);
-        initWindChart(forecastData);
+        renderCharts(forecastData);
 
         console.log('Charts initialized successfully');
     }
 
+    /**
+     * Check whether a columnar forecast payload contains any periods
+     * @param {Object} data - Columnar forecast payload
+     * @returns {boolean} True if there is data to chart
+     */
+    function hasData(data) {
+        return !!(data && data.temperature && data.temperature.length > 0);
+    }
+
+    /**
+     * Render all charts from a columnar forecast payload
+     * @param {Object} data - Columnar forecast payload
+     */
+    function renderCharts(data) {
+        const labels = buildLabels(data);
+
+        initTemperatureChart(labels, data.temperature);
+        initPrecipitationChart(labels, data.precipitation);
+        initWindChart(labels, data.wind_speed);
+    }
+
+    /**
+     * Build the time labels of a columnar forecast payload
+     * @param {Object} data - Payload with t0/step or explicit timestamps (epoch seconds)
+     * @returns {Array} Formatted time labels (HH:MM)
+     */
+    function buildLabels(data) {
+        const labels = new Array(data.temperature.length);
+        for (let i = 0; i < labels.length; i++) {
+            const seconds = data.timestamps ? data.timestamps[i] : data.t0 + i * (data.step || 0);
+            labels[i] = formatTime(seconds * 1000);
+        }
+        return labels;
+    }
+
     /**
      * Format timestamp to readable time
-     * @param {string} timestamp - ISO timestamp
+     * @param {number} timestamp - Epoch milliseconds
      * @returns {string} Formatted time (HH:MM)
      */
     function formatTime(timestamp) {
@@ -71,9 +104,10 @@ const WeatherCharts = (function () {
 
     /**
      * Initialize temperature chart
-     * @param {Array} data - Forecast data array
+     * @param {Array} labels - Time labels
+     * @param {Array} temperatures - Temperature series
      */
-    function initTemperatureChart(data) {
+    function initTemperatureChart(labels, temperatures) {
         const canvas = document.getElementById('temperatureChart');
         if (!canvas) {
             console.error('Temperature chart canvas not found');
@@ -82,10 +116,6 @@ const WeatherCharts = (function () {
 
         const ctx = canvas.getContext('2d');
 
-        // Extract data
-        const labels = data.map(function (item) { return formatTime(item.timestamp); });
-        const temperatures = data.map(function (item) { return item.temperature; });
-
         // Destroy existing chart if any
         if (temperatureChart) {
             temperatureChart.destroy();
@@ -178,9 +208,10 @@ const WeatherCharts = (function () {
 
     /**
      * Initialize precipitation chart
-     * @param {Array} data - Forecast data array
+     * @param {Array} labels - Time labels
+     * @param {Array} precipitation - Precipitation series
      */
-    function initPrecipitationChart(data) {
+    function initPrecipitationChart(labels, precipitation) {
         const canvas = document.getElementById('precipitationChart');
         if (!canvas) {
             console.error('Precipitation chart canvas not found');
@@ -189,10 +220,6 @@ const WeatherCharts = (function () {
 
         const ctx = canvas.getContext('2d');
 
-        // Extract data
-        const labels = data.map(function (item) { return formatTime(item.timestamp); });
-        const precipitation = data.map(function (item) { return item.precipitation; });
-
         // Destroy existing chart if any
         if (precipitationChart) {
             precipitationChart.destroy();
@@ -280,9 +307,10 @@ const WeatherCharts = (function () {
 
     /**
      * Initialize wind speed chart
-     * @param {Array} data - Forecast data array
+     * @param {Array} labels - Time labels
+     * @param {Array} windSpeeds - Wind speed series
      */
-    function initWindChart(data) {
+    function initWindChart(labels, windSpeeds) {
         const canvas = document.getElementById('windChart');
         if (!canvas) {
             console.error('Wind chart canvas not found');
@@ -291,10 +319,6 @@ const WeatherCharts = (function () {
 
         const ctx = canvas.getContext('2d');
 
-        // Extract data
-        const labels = data.map(function (item) { return formatTime(item.timestamp); });
-        const windSpeeds = data.map(function (item) { return item.wind_speed; });
-
         // Destroy existing chart if any
         if (windChart) {
             windChart.destroy();
@@ -387,18 +411,16 @@ const WeatherCharts = (function () {
 
     /**
      * Update all charts with new data
-     * @param {Array} data - New forecast data
+     * @param {Object} data - New columnar forecast payload
      */
     function updateCharts(data) {
-        if (!data || data.length === 0) {
+        if (!hasData(data)) {
             console.warn('No data provided for chart update');
             return;
         }
 
         // Reinitialize charts with new data
-        initTemperatureChart(data);
-        initPrecipitationChart(data);
-        initWindChart(data);
+        renderCharts(data);
     }
 
     /**
@@ -7,7 +7,7 @@ const WeatherApp = (function () {
     'use strict';
 
     // Application state
-    let forecastData = [];
+    let forecastData = null;
     let currentPreferences = {};
 
     /**
@@ -29,6 +29,9 @@ const WeatherApp = (function () {
         // Set up event listeners
         setupEventListeners();
 
+        // Subscribe to live weather updates if enabled
+        connectLiveUpdates();
+
         // Show success message
         showNotification('Application loaded successfully', 'success');
     }
@@ -56,6 +59,77 @@ const WeatherApp = (function () {
         });
     }
 
+    /**
+     * Subscribe to the Server-Sent Events stream of live weather updates
+     */
+    function connectLiveUpdates() {
+        if (!window.liveUpdatesUrl || typeof EventSource === 'undefined') {
+            return;
+        }
+
+        const source = new EventSource(window.liveUpdatesUrl);
+
+        source.addEventListener('current', function (event) {
+            updateCurrentWeather(JSON.parse(event.data).current_weather);
+        });
+
+        source.addEventListener('forecast', function (event) {
+            forecastData = JSON.parse(event.data);
+            if (typeof WeatherCharts !== 'undefined') {
+                WeatherCharts.update(forecastData);
+            }
+        });
+
+        source.addEventListener('recommendations', function (event) {
+            const recommendations = JSON.parse(event.data);
+            updateRecommendation('cyclingRecommendation', recommendations.cycling);
+            updateRecommendation('runningRecommendation', recommendations.running);
+        });
+    }
+
+    /**
+     * Update the current weather cards
+     * @param {Object} weather - Current weather data
+     */
+    function updateCurrentWeather(weather) {
+        if (!weather) {
+            return;
+        }
+        setText('currentTemperature', weather.temperature.toFixed(1));
+        setText('currentWindSpeed', weather.wind_speed.toFixed(1));
+        setText('currentHumidity', weather.humidity);
+        setText('currentPrecipitation', weather.precipitation.toFixed(1));
+    }
+
+    /**
+     * Update a sport recommendation card
+     * @param {string} cardId - Sport card element ID
+     * @param {Object} recommendation - Recommendation with recommended flag and reasons
+     */
+    function updateRecommendation(cardId, recommendation) {
+        const card = document.getElementById(cardId);
+        if (!card || !recommendation) {
+            return;
+        }
+        card.classList.toggle('recommended', recommendation.recommended);
+        card.classList.toggle('not-recommended', !recommendation.recommended);
+        card.querySelector('.recommendation-status').textContent =
+            recommendation.recommended ? '✅ Recommended' : '❌ Not Recommended';
+        card.querySelector('.recommendation-reason').textContent = recommendation.reasons.join(' ');
+    }
+
+    /**
+     * Set the text content of an element if it exists
+     * @param {string} id - Element ID
+     * @param {string} text - New text
+     */
+    function setText(id, text) {
+        const element = document.getElementById(id);
+        if (element) {
+            element.textContent = text;
+        }
+    }
+
     /**
      * Handle preferences form submission
      * @param {Event} event - Form submit event
@@ -195,7 +269,7 @@ const WeatherApp = (function () {
 
     /**
      * Get current forecast data
-     * @returns {Array} Forecast data array
+     * @returns {Object} Columnar forecast payload
      */
     function getForecastData() {
         return forecastData;
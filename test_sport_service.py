@@ -209,6 +209,19 @@ def test_edge_cases():
     print("✅ All edge cases passed!")
 
 
+def test_is_suitable_matches_evaluation():
+    """Test that the quick check agrees with the full evaluation"""
+    service = SportRecommendationService()
+    
+    for temperature in (-5, 0, 10, 20, 25, 30):
+        for wind_speed in (0, 30, 31):
+            for rain in (0, 2, 3, 4):
+                weather = {'temperature': temperature, 'wind_speed': wind_speed, 'rain': rain}
+                for sport in ('cycling', 'running', 'swimming'):
+                    assert service.is_suitable(sport, weather) == service.evaluate_sport(sport, weather)[0]
+    print("✅ Test passed!")
+
+
 def main():
     """Run all tests"""
     print("=" * 60)
@@ -224,6 +237,7 @@ def main():
         test_custom_thresholds()
         test_forecast_recommendations()
         test_edge_cases()
+        test_is_suitable_matches_evaluation()
         
         print("\n" + "=" * 60)
         print("✅ ALL TESTS PASSED!")
@@ -4,3 +4,26 @@ from django.apps import AppConfig
 class WeatherAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'weather_app'
+
+    def ready(self):
+        from django.conf import settings
+        from .events import publish_cache_update
+        from .recommendations import materialize_recommendations
+        from .services import timing
+        from .services.weather_service import WeatherService
+
+        WeatherService.add_update_listener(publish_cache_update)
+        WeatherService.add_update_listener(materialize_recommendations)
+        timing.configure(getattr(settings, 'WEATHER_TIMING', False))
+        
+        if getattr(settings, 'WEATHER_HISTORY', False):
+            from .climate import record_climate
+            from .history import record_observation
+            from .revisions import record_forecast
+            WeatherService.add_update_listener(record_observation)
+            WeatherService.add_update_listener(record_forecast)
+            WeatherService.add_update_listener(record_climate)
+        
+        # Serve the last known data right away instead of a cold fetch
+        if getattr(settings, 'WEATHER_SNAPSHOT_PATH', ''):
+            WeatherService().prime_from_snapshot()
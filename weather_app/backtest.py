@@ -0,0 +1,165 @@
+"""
+Threshold Backtesting
+Replays retained observations through the sport recommendation rules
+"""
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from django.db import connections
+from django.db.models import Max, Min
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .services.sport_service import SportRecommendationService
+
+# (latitude, longitude, start, end) with end exclusive
+Shard = Tuple[float, float, datetime, datetime]
+
+
+def plan_shards(shard_days: int = 90, location=None, since: Optional[datetime] = None,
+                until: Optional[datetime] = None) -> List[Shard]:
+    """
+    Split the retained observations into per-location time ranges
+
+    Args:
+        shard_days: Length of each time range in days
+        location: (lat, lon) tuple, or None for all locations
+        since: Earliest observation time (inclusive)
+        until: Latest observation time (exclusive)
+
+    Returns:
+        List of shards, longest first
+    """
+    from .history import filter_observations
+
+    ranges = filter_observations(location, since, until).values('latitude', 'longitude').annotate(
+        first=Min('observed_at'), last=Max('observed_at')
+    )
+
+    shards = []
+    step = timedelta(days=shard_days)
+    for item in ranges.order_by('latitude', 'longitude'):
+        start = item['first'].replace(minute=0, second=0, microsecond=0)
+        end = item['last'] + timedelta(microseconds=1)
+        while start < end:
+            shards.append((item['latitude'], item['longitude'], start, min(start + step, end)))
+            start += step
+    # Long-running shards first keeps the pool busy until the end
+    shards.sort(key=lambda shard: shard[3] - shard[2], reverse=True)
+    return shards
+
+
+def run_shard(shard: Shard, thresholds: Optional[Dict] = None, chunk_size: int = 2000) -> Counter:
+    """
+    Count hours and suitable hours of one shard
+
+    Observations are grouped by hour; the last observation of each hour
+    decides whether the hour was suitable for a sport.
+
+    Args:
+        shard: (latitude, longitude, start, end)
+        thresholds: Custom thresholds as accepted by SportRecommendationService
+        chunk_size: Rows fetched per database round trip
+
+    Returns:
+        Counter of (sport, month, location, 'hours' or 'suitable')
+    """
+    # Imported here so spawned workers can import this module before
+    # Django is set up (see init_worker)
+    from .models import Observation
+
+    latitude, longitude, start, end = shard
+    sport_service = SportRecommendationService(thresholds)
+    sports = sorted(sport_service.get_all_thresholds())
+    location = "{:.4f},{:.4f}".format(latitude, longitude)
+    counts = Counter()
+
+    def count_hour(hour, weather):
+        month = hour.strftime('%Y-%m')
+        for sport in sports:
+            counts[(sport, month, location, 'hours')] += 1
+            if sport_service.is_suitable(sport, weather):
+                counts[(sport, month, location, 'suitable')] += 1
+
+    rows = Observation.objects.filter(
+        latitude=latitude, longitude=longitude, observed_at__gte=start, observed_at__lt=end
+    ).order_by('observed_at').values_list('observed_at', 'temperature', 'wind_speed', 'precipitation')
+
+    current_hour = weather = None
+    for observed_at, temperature, wind_speed, precipitation in rows.iterator(chunk_size=chunk_size):
+        hour = observed_at.replace(minute=0, second=0, microsecond=0)
+        if hour != current_hour and current_hour is not None:
+            count_hour(current_hour, weather)
+        current_hour = hour
+        weather = {'temperature': temperature, 'wind_speed': wind_speed, 'rain': precipitation}
+    if current_hour is not None:
+        count_hour(current_hour, weather)
+
+    return counts
+
+
+def init_worker() -> None:
+    """
+    Prepare a pool worker process for database reads
+
+    Spawned workers start without Django, forked ones with the parent's
+    database connections, which they must not share.
+    """
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+def map_shards(function: Callable, shards: List[Shard], args: tuple = (), workers: int = 1) -> List:
+    """
+    Run a function over shards, in a process pool with more than one worker
+
+    Each pool worker reads its shards over its own database connection.
+    With one worker, or a single shard, the shards run in this process.
+
+    Args:
+        function: Module-level callable taking (shard, *args)
+        shards: Shards from plan_shards
+        args: Further arguments of function
+        workers: Number of worker processes
+
+    Returns:
+        Results of function, in shard order
+    """
+    if workers <= 1 or len(shards) <= 1:
+        return [function(shard, *args) for shard in shards]
+
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        futures = [executor.submit(function, shard, *args) for shard in shards]
+        return [future.result() for future in futures]
+
+
+def run_backtest(shards: List[Shard], thresholds: Optional[Dict] = None, workers: int = 1,
+                 chunk_size: int = 2000) -> Dict[Tuple[str, str, str], Dict[str, int]]:
+    """
+    Backtest thresholds over the given shards
+
+    With more than one worker, shards run in a process pool, each worker
+    reading its shards over its own database connection. With one worker
+    they run in this process.
+
+    Args:
+        shards: Shards from plan_shards
+        thresholds: Custom thresholds as accepted by SportRecommendationService
+        workers: Number of worker processes
+        chunk_size: Rows fetched per database round trip
+
+    Returns:
+        Dictionary of (sport, month, location) -> {'hours', 'suitable'}
+    """
+    totals = Counter()
+    for counts in map_shards(run_shard, shards, (thresholds, chunk_size), workers):
+        totals.update(counts)
+
+    report = {}
+    for (sport, month, location, kind), count in totals.items():
+        report.setdefault((sport, month, location), {'hours': 0, 'suitable': 0})[kind] = count
+    return dict(sorted(report.items()))
@@ -0,0 +1,210 @@
+"""
+Climate Sketches
+Per-location, per-month quantile sketches of observations and the
+sport thresholds they suggest
+"""
+
+from django.db import transaction
+from django.utils import timezone
+from typing import Dict, Iterable, List, Optional
+
+from .backtest import Shard, map_shards
+from .services.sketch import TDigest
+from .services.sport_service import SportRecommendationService
+from .services.weather_service import WeatherService
+
+# Observation fields sketched, named as in Observation
+CLIMATE_FIELDS = ('temperature', 'wind_speed', 'precipitation')
+
+
+def _parse_sketches(row) -> Dict[str, TDigest]:
+    return {field: TDigest.from_dict(row.sketches[field]) if field in row.sketches else TDigest()
+            for field in CLIMATE_FIELDS}
+
+
+def record_climate(key: str, data, version: str) -> None:
+    """
+    WeatherService update listener adding fresh current weather to the
+    sketches of its location and month
+
+    Observations not newer than the last one sketched for the location
+    and month (e.g. the same upstream observation cached again) are
+    skipped, as is stale data served from a snapshot.
+
+    Args:
+        key: Updated cache key
+        data: New cached data
+        version: New cache version
+    """
+    from .models import ClimateSketch
+
+    base_key, latitude, longitude = WeatherService.split_cache_key(key)
+    if base_key != WeatherService.CURRENT_CACHE_KEY or data.get('stale'):
+        return
+
+    observed_at = data['timestamp']
+    if timezone.is_naive(observed_at):
+        observed_at = timezone.make_aware(observed_at)
+    with transaction.atomic():
+        row, _ = ClimateSketch.objects.select_for_update().get_or_create(
+            latitude=latitude, longitude=longitude, month=observed_at.month
+        )
+        if row.last_observed_at is not None and observed_at <= row.last_observed_at:
+            return
+        sketches = _parse_sketches(row)
+        for field in CLIMATE_FIELDS:
+            sketches[field].add(data.get(field) or 0)
+        row.sketches = {field: sketch.to_dict() for field, sketch in sketches.items()}
+        row.last_observed_at = observed_at
+        row.save()
+
+
+def sketch_shard(shard: Shard, chunk_size: int = 2000) -> Dict[tuple, Dict]:
+    """
+    Sketch the observations of one shard
+
+    Args:
+        shard: (latitude, longitude, start, end) from backtest.plan_shards
+        chunk_size: Rows fetched per database round trip
+
+    Returns:
+        Dictionary of (latitude, longitude, month) -> {'sketches': field ->
+        TDigest, 'last_observed_at': datetime}
+    """
+    # Imported here so spawned workers can import this module before
+    # Django is set up
+    from .models import Observation
+
+    latitude, longitude, start, end = shard
+    rows = Observation.objects.filter(
+        latitude=latitude, longitude=longitude, observed_at__gte=start, observed_at__lt=end
+    ).order_by('observed_at').values_list('observed_at', *CLIMATE_FIELDS)
+
+    result = {}
+    for observed_at, *values in rows.iterator(chunk_size=chunk_size):
+        item = result.get((latitude, longitude, observed_at.month))
+        if item is None:
+            item = result[(latitude, longitude, observed_at.month)] = {
+                'sketches': {field: TDigest() for field in CLIMATE_FIELDS}, 'last_observed_at': observed_at,
+            }
+        for field, value in zip(CLIMATE_FIELDS, values):
+            item['sketches'][field].add(value)
+        item['last_observed_at'] = observed_at
+    return result
+
+
+def build_sketches(shards: List[Shard], workers: int = 1, chunk_size: int = 2000) -> Dict[tuple, Dict]:
+    """
+    Sketch retained observations, merging the sketches of all shards
+
+    With more than one worker, shards run in a process pool (see
+    backtest.map_shards).
+
+    Args:
+        shards: Shards from backtest.plan_shards
+        workers: Number of worker processes
+        chunk_size: Rows fetched per database round trip
+
+    Returns:
+        Dictionary as returned by sketch_shard, covering all shards
+    """
+    merged = {}
+    for result in map_shards(sketch_shard, shards, (chunk_size,), workers):
+        for key, item in result.items():
+            if key not in merged:
+                merged[key] = item
+                continue
+            for field, sketch in item['sketches'].items():
+                merged[key]['sketches'][field].merge(sketch)
+            merged[key]['last_observed_at'] = max(merged[key]['last_observed_at'], item['last_observed_at'])
+    return merged
+
+
+def store_sketches(built: Dict[tuple, Dict]) -> int:
+    """
+    Replace stored sketches with rebuilt ones
+
+    Args:
+        built: Result of build_sketches
+
+    Returns:
+        Number of rows written
+    """
+    from .models import ClimateSketch
+
+    with transaction.atomic():
+        for (latitude, longitude, month), item in built.items():
+            ClimateSketch.objects.update_or_create(
+                latitude=latitude, longitude=longitude, month=month,
+                defaults={
+                    'sketches': {field: sketch.to_dict() for field, sketch in item['sketches'].items()},
+                    'last_observed_at': item['last_observed_at'],
+                }
+            )
+    return len(built)
+
+
+def load_sketches(location, months: Optional[Iterable[int]] = None) -> Optional[Dict[str, TDigest]]:
+    """
+    Get the sketches of a location, merged over the given months
+
+    Args:
+        location: (lat, lon) tuple
+        months: Calendar months (1-12), or None for the whole year
+
+    Returns:
+        Dictionary of field -> TDigest, or None if nothing was sketched
+    """
+    from .models import ClimateSketch
+
+    latitude, longitude = (round(float(value), 4) for value in location)
+    rows = ClimateSketch.objects.filter(latitude=latitude, longitude=longitude)
+    if months is not None:
+        rows = rows.filter(month__in=list(months))
+
+    merged = None
+    for row in rows:
+        sketches = _parse_sketches(row)
+        if merged is None:
+            merged = sketches
+        else:
+            for field, sketch in sketches.items():
+                merged[field].merge(sketch)
+    if merged is None or not merged['temperature'].count:
+        return None
+    return merged
+
+
+def suggest_thresholds(sketches: Dict[str, TDigest], share: float = 0.4,
+                       sport_service: Optional[SportRecommendationService] = None) -> Dict[str, Dict]:
+    """
+    Suggest thresholds recommending a sport in the most comfortable share of hours
+
+    Treating the fields as independent, each condition keeps
+    share ** (1/3) of the hours: the calmest and driest ones for wind and
+    rain, and for temperature the range of that share closest to the
+    middle of the sport's current temperature range.
+
+    Args:
+        sketches: Field -> TDigest, e.g. from load_sketches
+        share: Share of hours the thresholds should recommend
+        sport_service: Service whose thresholds give each sport's comfort temperature
+
+    Returns:
+        Thresholds per sport, as accepted by SportRecommendationService
+    """
+    sport_service = sport_service or SportRecommendationService()
+    part = share ** (1 / 3)
+    temperature = sketches['temperature']
+
+    suggested = {}
+    for sport, thresholds in sport_service.get_all_thresholds().items():
+        comfort = (thresholds['temp_min'] + thresholds['temp_max']) / 2
+        low = min(max(temperature.cdf(comfort) - part / 2, 0.0), 1.0 - part)
+        suggested[sport] = {
+            'temp_min': round(temperature.quantile(low), 1),
+            'temp_max': round(temperature.quantile(low + part), 1),
+            'wind_max': round(sketches['wind_speed'].quantile(part), 1),
+            'rain_max': round(sketches['precipitation'].quantile(part), 1),
+        }
+    return suggested
@@ -0,0 +1,126 @@
+"""
+Live Weather Events
+Fans out cache updates to Server-Sent Events clients
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .services.weather_service import WeatherService
+from .services.sport_service import SportRecommendationService
+
+logger = logging.getLogger(__name__)
+
+
+class EventBroadcaster:
+    """
+    In-process publish/subscribe hub for Server-Sent Events
+
+    Each message is formatted once and handed to every subscriber queue, so
+    the cost of a refresh does not grow with the number of clients beyond a
+    queue put. Publishing is thread-safe and may happen from any thread.
+    """
+
+    def __init__(self, queue_size: int = 16):
+        """
+        Initialize the broadcaster
+
+        Args:
+            queue_size: Maximum pending messages per subscriber
+        """
+        self.queue_size = queue_size
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        Subscribe to events from within a running event loop
+
+        Returns:
+            asyncio.Queue receiving formatted event messages
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """
+        Remove a subscriber
+
+        Args:
+            queue: Queue returned by subscribe()
+        """
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def has_subscribers(self) -> bool:
+        """
+        Check whether any client is connected
+
+        Returns:
+            True if there is at least one subscriber
+        """
+        return bool(self._subscribers)
+
+    def publish(self, event: str, data: str) -> None:
+        """
+        Send an event to all subscribers
+
+        Args:
+            event: SSE event name
+            data: Serialized event data (single line JSON)
+        """
+        message = "event: {}\ndata: {}\n\n".format(event, data).encode('utf-8')
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, message)
+            except RuntimeError:
+                # Event loop already closed, the client is gone
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, message: bytes) -> None:
+        """
+        Put a message on a subscriber queue, dropping the oldest if full
+
+        Args:
+            queue: Subscriber queue
+            message: Formatted event message
+        """
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+
+broadcaster = EventBroadcaster()
+
+
+def publish_cache_update(key: str, data, version: str) -> None:
+    """
+    WeatherService update listener publishing live events
+
+    Payloads are only built when at least one client is connected, and
+    then only once per update for all clients.
+
+    Args:
+        key: Updated cache key
+        data: New cached data
+        version: New cache version
+    """
+    if not broadcaster.has_subscribers():
+        return
+
+    if key == WeatherService.CURRENT_CACHE_KEY:
+        broadcaster.publish('current', json.dumps({'current_weather': data}, cls=DjangoJSONEncoder))
+        recommendations = SportRecommendationService().get_recommendations(data)
+        broadcaster.publish('recommendations', json.dumps(recommendations, cls=DjangoJSONEncoder))
+    elif key == WeatherService.CHART_CACHE_KEY:
+        # Chart payload is already serialized once at cache time
+        broadcaster.publish('forecast', data)
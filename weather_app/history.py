@@ -0,0 +1,143 @@
+"""
+Weather History
+Retains fetched observations and streams them back out for exports
+"""
+
+from datetime import date, datetime, time, timedelta
+from django.utils import timezone
+from typing import Iterator, List, Optional
+
+from .models import Observation
+from .services.sport_service import SportRecommendationService
+from .services.weather_service import WeatherService
+
+# Columns of exported rows, in order
+EXPORT_COLUMNS = (
+    'observed_at', 'latitude', 'longitude', 'location', 'temperature', 'feels_like',
+    'humidity', 'wind_speed', 'precipitation', 'description',
+)
+
+
+def record_observation(key: str, data, version: str) -> None:
+    """
+    WeatherService update listener storing fresh current weather
+
+    Stale data served from a snapshot is not recorded, and an observation
+    already stored for the location is kept as is.
+
+    Args:
+        key: Updated cache key
+        data: New cached data
+        version: New cache version
+    """
+    base_key, latitude, longitude = WeatherService.split_cache_key(key)
+    if base_key != WeatherService.CURRENT_CACHE_KEY or data.get('stale'):
+        return
+
+    observed_at = data['timestamp']
+    if timezone.is_naive(observed_at):
+        observed_at = timezone.make_aware(observed_at)
+    Observation.objects.bulk_create([Observation(
+        latitude=latitude,
+        longitude=longitude,
+        location=data.get('location', ''),
+        observed_at=observed_at,
+        temperature=data['temperature'],
+        feels_like=data['feels_like'],
+        humidity=data['humidity'],
+        wind_speed=data['wind_speed'],
+        precipitation=data.get('precipitation') or 0,
+        description=data.get('description', ''),
+        icon=data.get('icon', ''),
+    )], ignore_conflicts=True)
+
+
+def day_range(first: Optional[date], last: Optional[date]) -> tuple:
+    """
+    Convert an inclusive range of days into observation time bounds
+
+    Args:
+        first: First day, or None for no lower bound
+        last: Last day, or None for no upper bound
+
+    Returns:
+        Tuple (since, until) of aware datetimes, until exclusive
+    """
+    since = until = None
+    if first is not None:
+        since = timezone.make_aware(datetime.combine(first, time.min))
+    if last is not None:
+        until = timezone.make_aware(datetime.combine(last + timedelta(days=1), time.min))
+    return since, until
+
+
+def filter_observations(location=None, since: Optional[datetime] = None, until: Optional[datetime] = None):
+    """
+    Build the queryset of observations to export, oldest first
+
+    Args:
+        location: (lat, lon) tuple, or None for all locations
+        since: Earliest observation time (inclusive)
+        until: Latest observation time (exclusive)
+
+    Returns:
+        Observation queryset
+    """
+    observations = Observation.objects.all()
+    if location is not None:
+        observations = observations.filter(latitude=location[0], longitude=location[1])
+    if since is not None:
+        observations = observations.filter(observed_at__gte=since)
+    if until is not None:
+        observations = observations.filter(observed_at__lt=until)
+    return observations.order_by('observed_at', 'id')
+
+
+def iter_export_rows(observations, chunk_size: int = 2000,
+                     sport_service: Optional[SportRecommendationService] = None) -> Iterator[List]:
+    """
+    Lazily produce export rows with the sport suitability of each observation
+
+    Observations are read from the database in chunks of `chunk_size`
+    rows as plain tuples, so memory use does not depend on the size of the
+    result set.
+
+    Args:
+        observations: Observation queryset
+        chunk_size: Rows fetched per database round trip
+        sport_service: Service with the thresholds to apply, defaults to the default thresholds
+
+    Returns:
+        Iterator of rows: EXPORT_COLUMNS values followed by one boolean per sport
+    """
+    sport_service = sport_service or SportRecommendationService()
+    sports = sorted(sport_service.get_all_thresholds())
+    temperature = EXPORT_COLUMNS.index('temperature')
+    wind_speed = EXPORT_COLUMNS.index('wind_speed')
+    precipitation = EXPORT_COLUMNS.index('precipitation')
+
+    for values in observations.values_list(*EXPORT_COLUMNS).iterator(chunk_size=chunk_size):
+        weather = {
+            'temperature': values[temperature],
+            'wind_speed': values[wind_speed],
+            'rain': values[precipitation],
+        }
+        row = list(values)
+        row[0] = row[0].isoformat()
+        for sport in sports:
+            row.append(sport_service.is_suitable(sport, weather))
+        yield row
+
+
+def export_columns(sport_service: Optional[SportRecommendationService] = None) -> List[str]:
+    """
+    Get the header of exported rows
+
+    Args:
+        sport_service: Service whose sports are exported
+
+    Returns:
+        Column names matching iter_export_rows
+    """
+    sport_service = sport_service or SportRecommendationService()
+    return list(EXPORT_COLUMNS) + sorted(sport_service.get_all_thresholds())
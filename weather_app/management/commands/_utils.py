@@ -0,0 +1,25 @@
+"""
+Argument helpers shared by the management commands
+"""
+
+import argparse
+from datetime import date, datetime
+
+
+def parse_day(value: str) -> date:
+    """
+    Parse a YYYY-MM-DD command line date
+
+    Args:
+        value: Date string
+
+    Returns:
+        Parsed date
+
+    Raises:
+        argparse.ArgumentTypeError: If the date is invalid
+    """
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid date {!r}, expected YYYY-MM-DD".format(value))
@@ -0,0 +1,106 @@
+"""
+Backtest sport thresholds over retained observations
+"""
+
+import csv
+import json
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+
+from weather_app.backtest import plan_shards, run_backtest
+from weather_app.history import day_range
+from weather_app.services.sport_service import SportRecommendationService
+
+from ._utils import parse_day
+
+
+class Command(BaseCommand):
+    help = (
+        "Report how many hours each sport would have been recommended, per "
+        "sport, month and location, using the default or given thresholds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--thresholds',
+                            help="Custom thresholds as JSON, or @path of a JSON file, "
+                                 "e.g. '{\"running\": {\"temp_min\": 5}}'")
+        parser.add_argument('--lat', type=float, help="Latitude of the location (requires --lon)")
+        parser.add_argument('--lon', type=float, help="Longitude of the location (requires --lat)")
+        parser.add_argument('--since', type=parse_day, help="First day to replay (YYYY-MM-DD)")
+        parser.add_argument('--until', type=parse_day, help="Last day to replay (YYYY-MM-DD)")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Worker processes, 1 to run in this process")
+        parser.add_argument('--shard-days', type=int, default=90, help="Days of one location per shard")
+        parser.add_argument('--chunk-size', type=int, default=2000, help="Rows read per database round trip")
+        parser.add_argument('--format', choices=['table', 'csv'], default='table')
+
+    def handle(self, *args, **options):
+        if (options['lat'] is None) != (options['lon'] is None):
+            raise CommandError("--lat and --lon must be given together")
+        if options['shard_days'] < 1 or options['chunk_size'] < 1:
+            raise CommandError("--shard-days and --chunk-size must be positive")
+
+        location = None
+        if options['lat'] is not None:
+            location = (round(options['lat'], 4), round(options['lon'], 4))
+        since, until = day_range(options['since'], options['until'])
+        thresholds = self._load_thresholds(options['thresholds'])
+
+        start = time.perf_counter()
+        shards = plan_shards(options['shard_days'], location, since, until)
+        report = run_backtest(shards, thresholds, workers=options['workers'], chunk_size=options['chunk_size'])
+
+        if options['format'] == 'csv':
+            self._write_csv(report)
+        else:
+            self._write_table(report)
+        self.stderr.write("Replayed {} shards in {:.1f}s".format(len(shards), time.perf_counter() - start))
+
+    def _load_thresholds(self, value):
+        if not value:
+            return None
+        try:
+            if value.startswith('@'):
+                with open(value[1:], encoding='utf-8') as thresholds_file:
+                    thresholds = json.load(thresholds_file)
+            else:
+                thresholds = json.loads(value)
+        except (OSError, ValueError) as e:
+            raise CommandError("Invalid thresholds: {}".format(e))
+        self._check_thresholds(thresholds)
+        return thresholds
+
+    def _check_thresholds(self, thresholds):
+        # Checked here so mistakes are reported before any worker starts
+        defaults = SportRecommendationService.DEFAULT_THRESHOLDS
+        if not isinstance(thresholds, dict):
+            raise CommandError("Invalid thresholds: expected an object of sports")
+        for sport, values in thresholds.items():
+            if sport not in defaults:
+                raise CommandError("Invalid thresholds: unknown sport '{}' (known: {})".format(
+                    sport, ', '.join(sorted(defaults))
+                ))
+            if not isinstance(values, dict):
+                raise CommandError("Invalid thresholds: '{}' must be an object of thresholds".format(sport))
+            for name, threshold in values.items():
+                if name not in defaults[sport]:
+                    raise CommandError("Invalid thresholds: unknown threshold '{}' for '{}'".format(name, sport))
+                if isinstance(threshold, bool) or not isinstance(threshold, (int, float)):
+                    raise CommandError("Invalid thresholds: '{}.{}' must be a number".format(sport, name))
+
+    def _write_csv(self, report):
+        writer = csv.writer(self.stdout, lineterminator='')
+        writer.writerow(['sport', 'month', 'location', 'hours', 'suitable_hours'])
+        for (sport, month, location), counts in report.items():
+            writer.writerow([sport, month, location, counts['hours'], counts['suitable']])
+
+    def _write_table(self, report):
+        self.stdout.write("{:<10} {:<8} {:<18} {:>7} {:>9} {:>6}".format(
+            'Sport', 'Month', 'Location', 'Hours', 'Suitable', 'Share'
+        ))
+        for (sport, month, location), counts in report.items():
+            self.stdout.write("{:<10} {:<8} {:<18} {:>7} {:>9} {:>5.0%}".format(
+                sport, month, location, counts['hours'], counts['suitable'],
+                counts['suitable'] / counts['hours']
+            ))
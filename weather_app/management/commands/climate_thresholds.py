@@ -0,0 +1,63 @@
+"""
+Suggest sport thresholds from the local climate
+"""
+
+import json
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+
+from weather_app.backtest import plan_shards
+from weather_app.climate import build_sketches, load_sketches, store_sketches, suggest_thresholds
+from weather_app.services.weather_service import WeatherService
+
+
+class Command(BaseCommand):
+    help = (
+        "Suggest thresholds recommending each sport in the most comfortable "
+        "share of hours of a location, from its climate sketches. The output "
+        "can be passed to backtest_thresholds --thresholds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lat', type=float, help="Latitude of the location (requires --lon), default Reinach BL")
+        parser.add_argument('--lon', type=float, help="Longitude of the location (requires --lat)")
+        parser.add_argument('--month', type=int, action='append', choices=range(1, 13), metavar='1-12',
+                            help="Calendar month to use, repeatable (default all)")
+        parser.add_argument('--share', type=float, default=0.4,
+                            help="Share of hours the thresholds should recommend")
+        parser.add_argument('--rebuild', action='store_true',
+                            help="Rebuild the sketches of all locations from the retained observations first")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Worker processes for --rebuild, 1 to run in this process")
+        parser.add_argument('--shard-days', type=int, default=90, help="Days of one location per rebuild shard")
+        parser.add_argument('--chunk-size', type=int, default=2000, help="Rows read per database round trip")
+
+    def handle(self, *args, **options):
+        if (options['lat'] is None) != (options['lon'] is None):
+            raise CommandError("--lat and --lon must be given together")
+        if not 0 < options['share'] <= 1:
+            raise CommandError("--share must be between 0 and 1")
+        if options['shard_days'] < 1 or options['chunk_size'] < 1:
+            raise CommandError("--shard-days and --chunk-size must be positive")
+
+        location = (WeatherService.REINACH_LAT, WeatherService.REINACH_LON)
+        if options['lat'] is not None:
+            location = (round(options['lat'], 4), round(options['lon'], 4))
+
+        if options['rebuild']:
+            start = time.perf_counter()
+            shards = plan_shards(options['shard_days'])
+            built = build_sketches(shards, workers=options['workers'], chunk_size=options['chunk_size'])
+            self.stderr.write("Rebuilt {} sketches from {} shards in {:.1f}s".format(
+                store_sketches(built), len(shards), time.perf_counter() - start
+            ))
+
+        sketches = load_sketches(location, options['month'])
+        if sketches is None:
+            raise CommandError("No climate sketches for {:.4f},{:.4f}; enable WEATHER_HISTORY or use --rebuild".format(
+                *location
+            ))
+
+        self.stdout.write(json.dumps(suggest_thresholds(sketches, options['share']), indent=2))
+        self.stderr.write("Based on {:.0f} observations".format(sketches['temperature'].count))
@@ -0,0 +1,82 @@
+"""
+Export retained weather observations with their sport suitability
+"""
+
+import csv
+import io
+import json
+from itertools import islice
+from django.core.management.base import BaseCommand, CommandError
+
+from weather_app.history import day_range, export_columns, filter_observations, iter_export_rows
+
+from ._utils import parse_day
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream retained observations and their sport suitability as CSV, or "
+        "as columnar JSON Lines with one object of column arrays per chunk."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=['csv', 'columnar'], default='csv')
+        parser.add_argument('--output', default='-', help="Output file, '-' for stdout")
+        parser.add_argument('--lat', type=float, help="Latitude of the location (requires --lon)")
+        parser.add_argument('--lon', type=float, help="Longitude of the location (requires --lat)")
+        parser.add_argument('--since', type=parse_day, help="First day to export (YYYY-MM-DD)")
+        parser.add_argument('--until', type=parse_day, help="Last day to export (YYYY-MM-DD)")
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help="Rows read from the database and written per chunk")
+
+    def handle(self, *args, **options):
+        if (options['lat'] is None) != (options['lon'] is None):
+            raise CommandError("--lat and --lon must be given together")
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be positive")
+
+        location = None
+        if options['lat'] is not None:
+            location = (round(options['lat'], 4), round(options['lon'], 4))
+        since, until = day_range(options['since'], options['until'])
+
+        observations = filter_observations(location, since, until)
+        rows = iter_export_rows(observations, chunk_size=options['chunk_size'])
+        write = self._write_csv if options['format'] == 'csv' else self._write_columnar
+
+        if options['output'] == '-':
+            count = write(lambda text: self.stdout.write(text, ending=''), rows, options['chunk_size'])
+        else:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+                count = write(output.write, rows, options['chunk_size'])
+
+        self.stderr.write("Exported {} observations".format(count))
+
+    def _chunks(self, rows, chunk_size):
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _write_csv(self, write, rows, chunk_size):
+        count = 0
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(export_columns())
+        for chunk in self._chunks(rows, chunk_size):
+            writer.writerows(chunk)
+            write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+            count += len(chunk)
+        write(buffer.getvalue())
+        return count
+
+    def _write_columnar(self, write, rows, chunk_size):
+        count = 0
+        columns = export_columns()
+        for chunk in self._chunks(rows, chunk_size):
+            write(json.dumps(dict(zip(columns, map(list, zip(*chunk)))), separators=(',', ':')) + '\n')
+            count += len(chunk)
+        return count
@@ -0,0 +1,45 @@
+"""
+Pre-render the index pages of the configured locations
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from weather_app.prerender import get_prerenderer
+from weather_app.services.refresher import WeatherRefresher
+from weather_app.services.weather_service import WeatherService
+
+
+class Command(BaseCommand):
+    help = (
+        "Keep the weather of Reinach BL and WEATHER_PRERENDER_LOCATIONS warm and "
+        "write their index pages to WEATHER_PRERENDER_DIR after every refresh. "
+        "Run one instance per host, e.g. as a systemd service, or with --once "
+        "from cron; the web workers do not pre-render themselves."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=settings.WEATHER_REFRESH_INTERVAL,
+                            help="Seconds between refresh checks")
+        parser.add_argument('--once', action='store_true', help="Refresh and render once, then exit")
+
+    def handle(self, *args, **options):
+        prerenderer = get_prerenderer()
+        if prerenderer is None:
+            raise CommandError("Set WEATHER_PRERENDER_DIR to pre-render pages")
+        if options['interval'] <= 0:
+            raise CommandError("--interval must be positive")
+
+        WeatherService().prime_from_snapshot()
+        refresher = WeatherRefresher(interval=options['interval'], locations=prerenderer.locations)
+        if options['once']:
+            refresher.refresh()
+            self.stderr.write("Pre-rendered {} pages in {}".format(prerenderer.render_all(), prerenderer.directory))
+            return
+
+        refresher.after_refresh.append(prerenderer.render_all)
+        self.stderr.write("Pre-rendering pages in {} every {:g}s".format(prerenderer.directory, options['interval']))
+        try:
+            refresher.run()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,33 @@
+"""
+Middleware for the weather app
+"""
+
+import time
+
+from .services import timing
+
+
+class ServerTimingMiddleware:
+    """
+    Report per-stage latencies of a request in a Server-Timing header
+
+    Does nothing unless stage timing is enabled (WEATHER_TIMING).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not timing.is_enabled():
+            return self.get_response(request)
+
+        token = timing.start_request()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            timings = timing.finish_request(token)
+        timings.append(('total', time.perf_counter() - start, 1))
+
+        response['Server-Timing'] = timing.format_server_timing(timings)
+        return response
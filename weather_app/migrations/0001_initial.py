@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Observation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('location', models.CharField(blank=True, max_length=100)),
+                ('observed_at', models.DateTimeField()),
+                ('temperature', models.FloatField()),
+                ('feels_like', models.FloatField()),
+                ('humidity', models.IntegerField()),
+                ('wind_speed', models.FloatField(help_text='km/h')),
+                ('precipitation', models.FloatField(default=0, help_text='mm/h')),
+                ('description', models.CharField(blank=True, max_length=100)),
+                ('icon', models.CharField(blank=True, max_length=10)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['observed_at'], name='observation_observed_at')],
+                'constraints': [models.UniqueConstraint(fields=('latitude', 'longitude', 'observed_at'), name='unique_observation')],
+            },
+        ),
+    ]
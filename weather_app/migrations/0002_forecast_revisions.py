@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ForecastFetch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('issued_at', models.DateTimeField()),
+                ('first_target', models.DateTimeField()),
+                ('last_target', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['latitude', 'longitude', 'issued_at'], name='forecast_fetch_issued_at')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ForecastRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('target_time', models.DateTimeField()),
+                ('issued_at', models.DateTimeField()),
+                ('temperature', models.FloatField(null=True)),
+                ('feels_like', models.FloatField(null=True)),
+                ('humidity', models.IntegerField(null=True)),
+                ('wind_speed', models.FloatField(help_text='km/h', null=True)),
+                ('precipitation', models.FloatField(help_text='mm in the period', null=True)),
+                ('description', models.CharField(max_length=100, null=True)),
+                ('icon', models.CharField(max_length=10, null=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('latitude', 'longitude', 'target_time', 'issued_at'), name='unique_forecast_revision')],
+            },
+        ),
+    ]
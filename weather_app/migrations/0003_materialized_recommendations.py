@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather_app', '0002_forecast_revisions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterializedRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('sport', models.CharField(max_length=50)),
+                ('time', models.DateTimeField()),
+                ('recommended', models.BooleanField()),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sport', 'time', 'recommended'], name='recommendation_sport_time')],
+                'constraints': [models.UniqueConstraint(fields=('latitude', 'longitude', 'sport', 'time'), name='unique_recommendation')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather_app', '0003_materialized_recommendations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClimateSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('month', models.PositiveSmallIntegerField(help_text='1-12, in UTC')),
+                ('sketches', models.JSONField(default=dict, help_text='Field name -> serialized t-digest')),
+                ('last_observed_at', models.DateTimeField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('latitude', 'longitude', 'month'), name='unique_climate_sketch')],
+            },
+        ),
+    ]
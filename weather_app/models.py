@@ -1,3 +1,139 @@
 from django.db import models
 
-# Create your models here.
+
+class Observation(models.Model):
+    """
+    Current weather observation retained for history and exports
+
+    Recorded whenever fresh current weather is cached (see
+    weather_app.history); each upstream observation is stored once per
+    location.
+    """
+
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    location = models.CharField(max_length=100, blank=True)
+    observed_at = models.DateTimeField()
+    temperature = models.FloatField()
+    feels_like = models.FloatField()
+    humidity = models.IntegerField()
+    wind_speed = models.FloatField(help_text="km/h")
+    precipitation = models.FloatField(default=0, help_text="mm/h")
+    description = models.CharField(max_length=100, blank=True)
+    icon = models.CharField(max_length=10, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['latitude', 'longitude', 'observed_at'], name='unique_observation'),
+        ]
+        indexes = [
+            models.Index(fields=['observed_at'], name='observation_observed_at'),
+        ]
+
+    def __str__(self):
+        return "{} at {}".format(self.location or "{},{}".format(self.latitude, self.longitude), self.observed_at)
+
+
+class ForecastFetch(models.Model):
+    """
+    Forecast fetch of a location, the periods it covered and when
+
+    Together with ForecastRevision, allows reconstructing the forecast as
+    issued at any past fetch.
+    """
+
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    issued_at = models.DateTimeField()
+    first_target = models.DateTimeField()
+    last_target = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['latitude', 'longitude', 'issued_at'], name='forecast_fetch_issued_at'),
+        ]
+
+    def __str__(self):
+        return "{},{} issued at {}".format(self.latitude, self.longitude, self.issued_at)
+
+
+class ForecastRevision(models.Model):
+    """
+    Values of a forecast period that changed in one fetch
+
+    Fields left null are unchanged since the previous revision of the same
+    location and target time; the first revision holds every value.
+    """
+
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    target_time = models.DateTimeField()
+    issued_at = models.DateTimeField()
+    temperature = models.FloatField(null=True)
+    feels_like = models.FloatField(null=True)
+    humidity = models.IntegerField(null=True)
+    wind_speed = models.FloatField(null=True, help_text="km/h")
+    precipitation = models.FloatField(null=True, help_text="mm in the period")
+    description = models.CharField(max_length=100, null=True)
+    icon = models.CharField(max_length=10, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['latitude', 'longitude', 'target_time', 'issued_at'], name='unique_forecast_revision'
+            ),
+        ]
+
+    def __str__(self):
+        return "{},{} for {} issued at {}".format(self.latitude, self.longitude, self.target_time, self.issued_at)
+
+
+class MaterializedRecommendation(models.Model):
+    """
+    Sport suitability of one hour of a cached forecast
+
+    Written when WEATHER_RECOMMENDATIONS_PERSIST is enabled, so that other
+    processes and analysts can query the materialized recommendations.
+    """
+
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    sport = models.CharField(max_length=50)
+    time = models.DateTimeField()
+    recommended = models.BooleanField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['latitude', 'longitude', 'sport', 'time'], name='unique_recommendation'),
+        ]
+        indexes = [
+            models.Index(fields=['sport', 'time', 'recommended'], name='recommendation_sport_time'),
+        ]
+
+    def __str__(self):
+        return "{} at {},{} {}".format(self.sport, self.latitude, self.longitude, self.time)
+
+
+class ClimateSketch(models.Model):
+    """
+    Quantile sketches of the observations of a location in one calendar month
+
+    Holds a serialized t-digest per field (see weather_app.climate), updated
+    as observations are recorded; its size does not grow with the history.
+    """
+
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    month = models.PositiveSmallIntegerField(help_text="1-12, in UTC")
+    sketches = models.JSONField(default=dict, help_text="Field name -> serialized t-digest")
+    last_observed_at = models.DateTimeField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['latitude', 'longitude', 'month'], name='unique_climate_sketch'),
+        ]
+
+    def __str__(self):
+        return "{},{} month {}".format(self.latitude, self.longitude, self.month)
@@ -0,0 +1,85 @@
+"""
+Rendered Page Cache
+Caches rendered index pages keyed by location and data version
+"""
+
+import threading
+import time
+from typing import Optional, Tuple
+
+
+class PageCache:
+    """
+    Thread-safe cache of rendered pages
+
+    Each location keeps only the page rendered for the latest data versions,
+    so a data refresh invalidates the page automatically and the cache never
+    holds more than one page per location. A short burst window additionally
+    serves the last page without checking data versions at all, absorbing
+    traffic spikes.
+    """
+
+    def __init__(self, burst_seconds: float = 1.0):
+        """
+        Initialize the page cache
+
+        Args:
+            burst_seconds: How long a page is served without version checks
+        """
+        self.burst_seconds = burst_seconds
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    def get_burst(self, location: str) -> Optional[Tuple[Tuple, bytes]]:
+        """
+        Get a page still inside its burst window
+
+        Args:
+            location: Location key
+
+        Returns:
+            Tuple of (data versions, rendered page content) or None
+        """
+        entry = self._pages.get(location)
+        if entry is None or time.monotonic() >= entry[2]:
+            return None
+        return entry[0], entry[1]
+
+    def get(self, location: str, versions: Tuple) -> Optional[bytes]:
+        """
+        Get the page rendered for the given data versions
+
+        A hit also reopens the burst window for the page.
+
+        Args:
+            location: Location key
+            versions: Versions of the data the page depends on
+
+        Returns:
+            Rendered page content or None if missing or outdated
+        """
+        with self._lock:
+            entry = self._pages.get(location)
+            if entry is None or entry[0] != versions:
+                return None
+            self._pages[location] = (versions, entry[1], time.monotonic() + self.burst_seconds)
+            return entry[1]
+
+    def set(self, location: str, versions: Tuple, content: bytes) -> None:
+        """
+        Store the page rendered for the given data versions
+
+        Args:
+            location: Location key
+            versions: Versions of the data the page depends on
+            content: Rendered page content
+        """
+        with self._lock:
+            self._pages[location] = (versions, content, time.monotonic() + self.burst_seconds)
+
+    def clear(self) -> None:
+        """
+        Remove all cached pages
+        """
+        with self._lock:
+            self._pages.clear()
@@ -0,0 +1,149 @@
+"""
+Pre-rendered Pages
+Writes the index page of each configured location to static files
+"""
+
+import gzip
+import logging
+import os
+import tempfile
+import threading
+from django.conf import settings
+from django.template.loader import render_to_string
+from typing import Iterable, Optional
+
+from .services.page_context import build_index_context
+from .services.weather_service import WeatherService
+
+logger = logging.getLogger(__name__)
+
+
+def page_name(location=None) -> str:
+    """
+    Get the file name of a location's pre-rendered page
+
+    Args:
+        location: (lat, lon) tuple or "lat,lon" string, None for Reinach BL
+
+    Returns:
+        "index.html", or e.g. "47.5596,7.5886.html" (4 decimals)
+    """
+    if location is None:
+        return 'index.html'
+    if isinstance(location, str):
+        location = location.split(',')
+    return "{:.4f},{:.4f}.html".format(*(float(value) for value in location))
+
+
+class PagePrerenderer:
+    """
+    Renders the index page of each location into a directory
+
+    Pages are rendered from the cached data only, and only when the data
+    versions changed since the page was last written, so calling
+    render_all() after every background refresh is cheap. Each page is
+    written atomically together with a gzip variant, and a front proxy can
+    serve them without any Python work per request, falling back to the
+    index view for everything else. Error pages are never written; the
+    previous page stays in place instead.
+
+    One process renders for the whole host: the prerender_pages command,
+    rather than every web worker.
+    """
+
+    def __init__(self, directory: str, locations: Iterable = ()):
+        """
+        Initialize the prerenderer
+
+        Args:
+            directory: Output directory, created if missing
+            locations: Locations besides Reinach BL, as accepted by WeatherService
+        """
+        self.directory = directory
+        self.locations = tuple(locations)
+        # page name -> data versions it was rendered from
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def render_all(self) -> int:
+        """
+        Render the pages of all locations whose data changed
+
+        Returns:
+            Number of pages written
+        """
+        written = 0
+        for location in (None,) + self.locations:
+            try:
+                written += self.render(location)
+            except Exception as e:
+                logger.error("Could not pre-render page for {}: {}".format(location or 'Reinach BL', str(e)))
+        return written
+
+    def render(self, location=None) -> bool:
+        """
+        Render the page of one location if its data changed
+
+        Args:
+            location: (lat, lon) tuple or "lat,lon" string, None for Reinach BL
+
+        Returns:
+            True if the page was written
+        """
+        name = page_name(location)
+        weather_service = WeatherService()
+        weather_service.get_current_weather(location)
+        weather_service.get_forecast_24h(location)
+        versions = tuple(
+            weather_service.get_cache_version(weather_service.get_source(key)[0])
+            for key in (WeatherService.CURRENT_CACHE_KEY, WeatherService.FORECAST_CACHE_KEY)
+        )
+        if None in versions:
+            return False
+
+        with self._lock:
+            if self._versions.get(name) == versions:
+                return False
+            context = build_index_context(location)
+            if context['error']:
+                return False
+            content = render_to_string('weather_app/index.html', context).encode('utf-8')
+
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, name)
+            self._write(path + '.gz', gzip.compress(content, compresslevel=9, mtime=0))
+            self._write(path, content)
+            self._versions[name] = versions
+        logger.info("Pre-rendered {}".format(path))
+        return True
+
+    def _write(self, path: str, content: bytes) -> None:
+        """
+        Replace a file atomically, readable by the serving proxy
+
+        Args:
+            path: File path
+            content: File content
+        """
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, prefix='.page-')
+        try:
+            with os.fdopen(descriptor, 'wb') as page_file:
+                page_file.write(content)
+            os.chmod(temporary_path, 0o644)
+            os.replace(temporary_path, path)
+        except OSError:
+            os.unlink(temporary_path)
+            raise
+
+
+def get_prerenderer() -> Optional[PagePrerenderer]:
+    """
+    Create the prerenderer configured by WEATHER_PRERENDER_DIR
+
+    Returns:
+        PagePrerenderer, or None if pre-rendering is disabled
+    """
+    directory = getattr(settings, 'WEATHER_PRERENDER_DIR', '')
+    if not directory:
+        return None
+    return PagePrerenderer(directory, getattr(settings, 'WEATHER_PRERENDER_LOCATIONS', ()))
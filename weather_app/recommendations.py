@@ -0,0 +1,129 @@
+"""
+Materialized Recommendations
+Keeps forecast recommendations of every cached location up to date
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from typing import Dict, List, Optional
+
+from .models import MaterializedRecommendation
+from .services.recommendations import RecommendationTable
+from .services.sport_service import SportRecommendationService
+from .services.weather_service import WeatherService
+
+# Process-wide table, refreshed whenever an hourly forecast is cached and
+# holding at most as many locations as the in-process cache holds entries
+table = RecommendationTable(max_rows=getattr(settings, 'WEATHER_CACHE_MAX_ENTRIES', 256))
+
+
+def materialize_recommendations(key: str, data, version: str) -> None:
+    """
+    WeatherService update listener materializing forecast recommendations
+
+    Args:
+        key: Updated cache key
+        data: New cached data
+        version: New cache version
+    """
+    if WeatherService.split_cache_key(key)[0] != WeatherService.HOURLY_CACHE_KEY or not data:
+        return
+    refresh(key, version, data)
+
+
+def refresh(key: str, version: str, hourly: List[Dict]) -> List[Dict]:
+    """
+    Evaluate every sport for every hour of a forecast and store the result
+
+    With WEATHER_RECOMMENDATIONS_PERSIST, the hours are also written to
+    the MaterializedRecommendation table.
+
+    Args:
+        key: Hourly forecast cache key
+        version: Its cache version
+        hourly: Hourly forecast series
+
+    Returns:
+        Forecast recommendations, one per hour
+    """
+    _, latitude, longitude = WeatherService.split_cache_key(key)
+    recommendations = SportRecommendationService().get_recommendations_for_forecast(hourly)
+    table.refresh(key, (latitude, longitude), version, recommendations)
+    if getattr(settings, 'WEATHER_RECOMMENDATIONS_PERSIST', False):
+        _persist(latitude, longitude, recommendations)
+    return recommendations
+
+
+def _persist(latitude: float, longitude: float, recommendations: List[Dict]) -> None:
+    computed_at = timezone.now()
+    rows = []
+    for period in recommendations:
+        time = period['timestamp']
+        if timezone.is_naive(time):
+            time = timezone.make_aware(time)
+        for sport, recommendation in period['recommendations'].items():
+            rows.append(MaterializedRecommendation(
+                latitude=latitude, longitude=longitude, sport=sport, time=time,
+                recommended=recommendation['recommended'], computed_at=computed_at
+            ))
+    if not rows:
+        return
+
+    times = [row.time for row in rows]
+    with transaction.atomic():
+        MaterializedRecommendation.objects.filter(
+            latitude=latitude, longitude=longitude, time__range=(min(times), max(times))
+        ).delete()
+        MaterializedRecommendation.objects.bulk_create(rows)
+
+
+def get_forecast_recommendations(weather_service: WeatherService, hourly: List[Dict]) -> List[Dict]:
+    """
+    Get the recommendations of the hourly forecast just looked up
+
+    Served from the table when it holds the same forecast version, and
+    evaluated (and materialized) otherwise.
+
+    Args:
+        weather_service: Service that returned the hourly forecast
+        hourly: The hourly forecast series
+
+    Returns:
+        Forecast recommendations, one per hour
+    """
+    key = weather_service.get_source(WeatherService.HOURLY_CACHE_KEY)[0]
+    version = weather_service.get_cache_version(key)
+    if version is None:
+        # Not cached (e.g. expired meanwhile), nothing to materialize
+        return SportRecommendationService().get_recommendations_for_forecast(hourly)
+
+    recommendations = table.get(key, version)
+    if recommendations is None:
+        recommendations = refresh(key, version, hourly)
+    return recommendations
+
+
+def suitable_locations(sport: str, start, end, weather_service: Optional[WeatherService] = None) -> List:
+    """
+    Find cached locations where a sport is suitable for a whole time range
+
+    Rows whose forecast is no longer cached are dropped from the table.
+
+    Args:
+        sport: Name of the sport
+        start: Start of the range
+        end: End of the range (exclusive)
+        weather_service: Service to check cache versions with
+
+    Returns:
+        List of (lat, lon), sorted
+    """
+    weather_service = weather_service or WeatherService()
+    locations = []
+    for location, key, version in table.suitable_locations(sport, start, end):
+        if weather_service.get_cache_version(key) != version:
+            table.remove(key)
+            continue
+        locations.append(location)
+    return locations
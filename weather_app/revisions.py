@@ -0,0 +1,140 @@
+"""
+Forecast Revisions
+Stores successive forecast fetches as per-period deltas
+"""
+
+from datetime import datetime
+from django.db import transaction
+from django.utils import timezone
+from typing import Dict, List, Optional
+
+from .models import ForecastFetch, ForecastRevision
+from .services.weather_service import WeatherService
+
+# Forecast period fields tracked across revisions
+REVISED_FIELDS = ('temperature', 'feels_like', 'humidity', 'wind_speed', 'precipitation', 'description', 'icon')
+
+
+def _aware(value: datetime) -> datetime:
+    return timezone.make_aware(value) if timezone.is_naive(value) else value
+
+
+def _latest_values(latitude: float, longitude: float, first: datetime, last: datetime,
+                   at: datetime) -> Dict[datetime, Dict]:
+    """
+    Fold the revisions of a range of target times up to a fetch time
+
+    Args:
+        latitude: Latitude
+        longitude: Longitude
+        first: First target time
+        last: Last target time
+        at: Latest fetch time to include
+
+    Returns:
+        Dictionary of target time -> field values
+    """
+    rows = ForecastRevision.objects.filter(
+        latitude=latitude, longitude=longitude, target_time__range=(first, last), issued_at__lte=at
+    ).order_by('target_time', 'issued_at').values_list('target_time', *REVISED_FIELDS)
+
+    values = {}
+    for target_time, *fields in rows:
+        current = values.setdefault(target_time, {})
+        for name, value in zip(REVISED_FIELDS, fields):
+            if value is not None:
+                current[name] = value
+    return values
+
+
+def record_forecast(key: str, data, version: str) -> None:
+    """
+    WeatherService update listener storing what changed in a forecast
+
+    Only fields differing from the latest stored revision of the same
+    location and target time are written; periods without changes get
+    no row. Every fetch is logged with the range of periods it covered.
+
+    Args:
+        key: Updated cache key
+        data: New cached data
+        version: New cache version
+    """
+    base_key, latitude, longitude = WeatherService.split_cache_key(key)
+    if base_key != WeatherService.FORECAST_CACHE_KEY or not data:
+        return
+
+    issued_at = timezone.now()
+    periods = {_aware(item['timestamp']): item for item in data}
+    first, last = min(periods), max(periods)
+
+    with transaction.atomic():
+        latest = _latest_values(latitude, longitude, first, last, issued_at)
+        revisions = []
+        for target_time, item in periods.items():
+            previous = latest.get(target_time, {})
+            changes = {
+                name: item[name] for name in REVISED_FIELDS
+                if item.get(name) is not None and item[name] != previous.get(name)
+            }
+            if changes:
+                revisions.append(ForecastRevision(
+                    latitude=latitude, longitude=longitude, target_time=target_time, issued_at=issued_at, **changes
+                ))
+        ForecastRevision.objects.bulk_create(revisions)
+        ForecastFetch.objects.create(
+            latitude=latitude, longitude=longitude, issued_at=issued_at, first_target=first, last_target=last
+        )
+
+
+def forecast_as_issued(location, at: Optional[datetime] = None) -> Optional[Dict]:
+    """
+    Reconstruct the forecast of a location as of its last fetch before a time
+
+    Args:
+        location: (lat, lon) tuple
+        at: Point in time, defaults to now
+
+    Returns:
+        Dictionary with the fetch 'issued_at' and the 'forecast' periods
+        (each with 'timestamp' and the REVISED_FIELDS), or None if no
+        forecast was fetched before
+    """
+    latitude, longitude = location
+    fetch = ForecastFetch.objects.filter(
+        latitude=latitude, longitude=longitude, issued_at__lte=at or timezone.now()
+    ).order_by('-issued_at').first()
+    if fetch is None:
+        return None
+
+    values = _latest_values(latitude, longitude, fetch.first_target, fetch.last_target, fetch.issued_at)
+    return {
+        'issued_at': fetch.issued_at,
+        'forecast': [dict(values[target_time], timestamp=target_time) for target_time in sorted(values)],
+    }
+
+
+def revision_history(location, target_time: datetime) -> List[Dict]:
+    """
+    Get how the forecast of one period evolved over successive fetches
+
+    Args:
+        location: (lat, lon) tuple
+        target_time: Time of the forecast period
+
+    Returns:
+        List of revisions, oldest first, each with 'issued_at', the
+        'changes' of that fetch and the resulting 'values'
+    """
+    latitude, longitude = location
+    rows = ForecastRevision.objects.filter(
+        latitude=latitude, longitude=longitude, target_time=_aware(target_time)
+    ).order_by('issued_at').values_list('issued_at', *REVISED_FIELDS)
+
+    history = []
+    values = {}
+    for issued_at, *fields in rows:
+        changes = {name: value for name, value in zip(REVISED_FIELDS, fields) if value is not None}
+        values = dict(values, **changes)
+        history.append({'issued_at': issued_at, 'changes': changes, 'values': values})
+    return history
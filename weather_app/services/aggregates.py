@@ -0,0 +1,70 @@
+"""
+Forecast Aggregates
+Per-day and whole-forecast summaries computed once per cached forecast
+"""
+
+from typing import Dict, List, Optional
+
+
+def _new_aggregate(start) -> Dict:
+    return {
+        'start': start,
+        'end': start,
+        'temp_min': None,
+        'temp_max': None,
+        'precipitation_total': 0.0,
+        'wind_peak': 0.0,
+        'periods': 0,
+    }
+
+
+def _add_period(aggregate: Dict, item: Dict) -> None:
+    temperature = item['temperature']
+    if aggregate['temp_min'] is None or temperature < aggregate['temp_min']:
+        aggregate['temp_min'] = temperature
+    if aggregate['temp_max'] is None or temperature > aggregate['temp_max']:
+        aggregate['temp_max'] = temperature
+    aggregate['precipitation_total'] += item.get('precipitation') or 0
+    aggregate['wind_peak'] = max(aggregate['wind_peak'], item.get('wind_speed') or 0)
+    aggregate['end'] = item['timestamp']
+    aggregate['periods'] += 1
+
+
+def _rounded(aggregate: Dict) -> Dict:
+    aggregate['precipitation_total'] = round(aggregate['precipitation_total'], 2)
+    aggregate['wind_peak'] = round(aggregate['wind_peak'], 2)
+    return aggregate
+
+
+def summarize_forecast(forecasts: List[Dict]) -> Optional[Dict]:
+    """
+    Aggregate forecast periods in a single pass
+
+    Each aggregate holds the first and last period timestamps ('start',
+    'end'), minimum and maximum temperature, total precipitation in mm,
+    peak wind speed in km/h and the number of periods. Days follow the
+    local date of the period timestamps.
+
+    Args:
+        forecasts: Parsed forecast periods in time order
+
+    Returns:
+        Dictionary with the 'period' aggregate of the whole forecast and a
+        list of 'days' aggregates with their 'date', or None if empty
+    """
+    if not forecasts:
+        return None
+
+    period = _new_aggregate(forecasts[0]['timestamp'])
+    days = []
+    for item in forecasts:
+        date = item['timestamp'].date()
+        if not days or days[-1]['date'] != date:
+            days.append(dict(_new_aggregate(item['timestamp']), date=date))
+        _add_period(days[-1], item)
+        _add_period(period, item)
+
+    return {
+        'period': _rounded(period),
+        'days': [_rounded(day) for day in days],
+    }
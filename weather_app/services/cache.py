@@ -0,0 +1,337 @@
+"""
+In-Process Cache
+Thread-safe, size-bounded LRU cache with TTL expiry and memory accounting
+"""
+
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from .metrics import CACHE_EVICTIONS, registry
+
+# Caches with a name, reported by the occupancy collector
+_named_caches = weakref.WeakSet()
+
+# Number of striped locks used for single-flight fetching
+_FLIGHT_LOCK_STRIPES = 16
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Approximate the memory used by a value in bytes
+
+    Follows dictionaries, lists, tuples and sets recursively; shared
+    objects are counted each time they appear, so the result is an upper
+    bound good enough for budgeting, not an exact measurement.
+
+    Args:
+        value: Value to measure
+
+    Returns:
+        Approximate size in bytes
+    """
+    size = sys.getsizeof(value)
+    if _depth > 8:
+        return size
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key, _depth + 1) + estimate_size(item, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    return size
+
+
+class LRUCache:
+    """
+    Thread-safe cache bounded by entry count and approximate byte size
+
+    Entries expire after their TTL and, when either bound is exceeded, the
+    least recently used entries are evicted first. All operations take a
+    single lock and run in O(1) apart from evictions.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 8 * 1024 * 1024,
+                 default_ttl: Optional[float] = None, name: Optional[str] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of entries
+            max_bytes: Maximum approximate size of all entries in bytes
+            default_ttl: Seconds entries live when set without a TTL (None = no expiry)
+            name: Name reported in metrics (unnamed caches are not reported)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.name = name
+        # key -> (value, expires_at or None, size)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._lock = threading.Lock()
+        self._flight_locks = [threading.Lock() for _ in range(_FLIGHT_LOCK_STRIPES)]
+        if name:
+            _named_caches.add(self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a value and mark it as recently used
+
+        Args:
+            key: Cache key
+            default: Value returned if the key is missing or expired
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            if entry[1] is not None and time.monotonic() >= entry[1]:
+                self._remove(key, 'expired')
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting least recently used entries if needed
+
+        Values larger than the whole byte budget are not stored.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Seconds until the entry expires (defaults to default_ttl)
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = estimate_size(key) + estimate_size(value)
+
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[2]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)), 'lru')
+
+    def delete(self, key: str) -> None:
+        """
+        Remove an entry if present
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[2]
+
+    def clear(self) -> None:
+        """
+        Remove all entries
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str, reason: str) -> None:
+        """
+        Evict an entry (caller holds the lock)
+
+        Args:
+            key: Cache key
+            reason: 'lru' or 'expired'
+        """
+        self._bytes -= self._entries.pop(key)[2]
+        if reason == 'expired':
+            self._expirations += 1
+        else:
+            self._evictions += 1
+        if self.name:
+            CACHE_EVICTIONS.inc(cache=self.name, reason=reason)
+
+    @contextmanager
+    def lock(self, key: str):
+        """
+        Hold an exclusive lock for a key within this process
+
+        Used for single-flight fetching: the first thread to miss fetches
+        while the others wait and then find the fresh entry.
+
+        Args:
+            key: Cache key
+        """
+        with self._flight_locks[hash(key) % _FLIGHT_LOCK_STRIPES]:
+            yield
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[1] is None or time.monotonic() < entry[1])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """
+        Get occupancy and eviction statistics
+
+        Returns:
+            Dictionary with entries, bytes, limits, hits, misses, evictions and expirations
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+            }
+
+
+class TieredCache:
+    """
+    Two-tier cache: an in-process LRUCache (L1) in front of a shared backend (L2)
+
+    The backend can be any object with get(key), set(key, value, ttl),
+    delete(key) and clear(), and optionally lock(key). Reads are served from L1 when possible; L2 hits
+    are copied into L1 for at most l1_ttl seconds, so changes written to the
+    backend by other processes become visible within that time.
+    """
+
+    def __init__(self, l1: LRUCache, l2, l1_ttl: float = 5.0):
+        """
+        Initialize the tiered cache
+
+        Args:
+            l1: In-process cache
+            l2: Shared backend
+            l1_ttl: Maximum seconds an entry is served from L1
+        """
+        self.l1 = l1
+        self.l2 = l2
+        self.l1_ttl = l1_ttl
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a value from L1, falling back to the backend
+
+        Args:
+            key: Cache key
+            default: Value returned if the key is missing in both tiers
+
+        Returns:
+            Cached value or default
+        """
+        value = self.l1.get(key)
+        if value is not None:
+            return value
+        value = self.l2.get(key)
+        if value is None:
+            return default
+        self.l1.set(key, value, ttl=self.l1_ttl)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value in both tiers
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Seconds until the entry expires in the backend
+        """
+        self.l2.set(key, value, ttl)
+        self.l1.set(key, value, ttl=self.l1_ttl if ttl is None else min(ttl, self.l1_ttl))
+
+    def delete(self, key: str) -> None:
+        """
+        Remove an entry from both tiers
+
+        Args:
+            key: Cache key
+        """
+        self.l2.delete(key)
+        self.l1.delete(key)
+
+    def clear(self) -> None:
+        """
+        Remove all entries from both tiers
+        """
+        self.l2.clear()
+        self.l1.clear()
+
+    def lock(self, key: str):
+        """
+        Hold the backend's lock for a key, or the L1 lock if it has none
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Context manager
+        """
+        if hasattr(self.l2, 'lock'):
+            return self.l2.lock(key)
+        return self.l1.lock(key)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def stats(self) -> Dict:
+        """
+        Get statistics of both tiers
+
+        Returns:
+            Dictionary with 'l1' and, if the backend reports them, 'l2' statistics
+        """
+        stats = {'l1': self.l1.stats()}
+        if hasattr(self.l2, 'stats'):
+            stats['l2'] = self.l2.stats()
+        return stats
+
+
+def _cache_occupancy_lines() -> List[str]:
+    """
+    Render the occupancy of named caches as Prometheus gauges
+
+    Returns:
+        Exposition lines, empty if there are no named caches
+    """
+    caches = sorted(_named_caches, key=lambda cache: cache.name)
+    if not caches:
+        return []
+
+    lines = []
+    for metric, field, documentation in (
+        ('weather_cache_entries', 'entries', 'Entries held by the in-process cache.'),
+        ('weather_cache_bytes', 'bytes', 'Approximate bytes held by the in-process cache.'),
+        ('weather_cache_max_bytes', 'max_bytes', 'Byte budget of the in-process cache.'),
+    ):
+        lines.append('# HELP {} {}'.format(metric, documentation))
+        lines.append('# TYPE {} gauge'.format(metric))
+        for cache in caches:
+            lines.append('{}{{cache="{}"}} {}'.format(metric, cache.name, cache.stats()[field]))
+    return lines
+
+
+registry.add_collector(_cache_occupancy_lines)
@@ -0,0 +1,116 @@
+"""
+Forecast Interpolation
+Evenly spaced hourly series derived from the 3-hour forecast periods
+"""
+
+import math
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# Fields interpolated linearly between period timestamps
+INTERPOLATED_FIELDS = ('temperature', 'feels_like', 'humidity', 'wind_speed')
+
+
+def interpolate_forecast(forecasts: List[Dict], step: timedelta = timedelta(hours=1)) -> List[Dict]:
+    """
+    Resample forecast periods to a finer, evenly spaced series
+
+    Temperature, feels-like temperature, humidity and wind speed are
+    interpolated linearly between period timestamps and held after the
+    last one. Each period's precipitation is spread evenly over the interval
+    starting at its timestamp, so 'precipitation' becomes mm per step and
+    the total is kept when the periods are whole multiples of the step.
+    Description and icon are those of the period a point falls in. The
+    series starts at the first period and ends with the last period's
+    interval, e.g. 24 hourly points for 8 periods of 3 hours.
+
+    Args:
+        forecasts: Parsed forecast periods in time order
+        step: Spacing of the series
+
+    Returns:
+        List of forecast dictionaries, one per step
+    """
+    if not forecasts:
+        return []
+
+    step_seconds = step.total_seconds()
+    times = [item['timestamp'].timestamp() for item in forecasts]
+    # Each period lasts until the next one; the last as long as the one before
+    durations = [later - earlier for earlier, later in zip(times, times[1:])]
+    durations.append(durations[-1] if durations else step_seconds)
+
+    # Column per field, read once from the period dictionaries
+    columns = {
+        field: [float(item.get(field) or 0) for item in forecasts]
+        for field in INTERPOLATED_FIELDS
+    }
+    rates = [
+        (item.get('precipitation') or 0) * step_seconds / (duration or step_seconds)
+        for item, duration in zip(forecasts, durations)
+    ]
+
+    count = max(1, math.ceil((times[-1] + durations[-1] - times[0]) / step_seconds - 1e-9))
+    series = []
+    period = 0
+    for number in range(count):
+        moment = times[0] + number * step_seconds
+        while period + 1 < len(times) and times[period + 1] <= moment:
+            period += 1
+        if period + 1 < len(times):
+            weight = (moment - times[period]) / (times[period + 1] - times[period])
+        else:
+            weight = 0.0
+
+        point = {'timestamp': datetime.fromtimestamp(moment)}
+        for field, values in columns.items():
+            value = values[period]
+            if weight:
+                value += (values[period + 1] - value) * weight
+            point[field] = value
+        point['humidity'] = int(round(point['humidity']))
+        point['precipitation'] = rates[period]
+        point['description'] = forecasts[period].get('description', '')
+        point['icon'] = forecasts[period].get('icon', '')
+        series.append(point)
+
+    return series
+
+
+def forecast_at(series: List[Dict], moment: datetime, tolerance: timedelta = timedelta(hours=3)) -> Optional[Dict]:
+    """
+    Get the forecast at a point in time from an evenly spaced series
+
+    Interpolated fields are interpolated between the surrounding points;
+    precipitation, description and icon are those of the step the moment
+    falls in. Moments shortly before the first point (within `tolerance`,
+    e.g. before the first forecast period has started) get the first point.
+
+    Args:
+        series: Series from interpolate_forecast
+        moment: Point in time
+        tolerance: How long before the first point it is still used
+
+    Returns:
+        Forecast dictionary with the moment as 'timestamp', or None if the
+        moment is outside the series
+    """
+    if not series:
+        return None
+
+    times = [point['timestamp'].timestamp() for point in series]
+    step = times[1] - times[0] if len(times) > 1 else 3600.0
+    seconds = moment.timestamp()
+    if seconds < times[0] - tolerance.total_seconds() or seconds >= times[-1] + step:
+        return None
+
+    position = max(bisect_right(times, seconds) - 1, 0)
+    point = dict(series[position], timestamp=moment)
+    if position + 1 < len(series) and seconds > times[position]:
+        weight = (seconds - times[position]) / (times[position + 1] - times[position])
+        following = series[position + 1]
+        for field in INTERPOLATED_FIELDS:
+            point[field] = point[field] + (following[field] - point[field]) * weight
+        point['humidity'] = int(round(point['humidity']))
+    return point
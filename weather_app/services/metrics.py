@@ -0,0 +1,363 @@
+"""
+Metrics Registry
+Thread-safe counters and histograms exposed in Prometheus text format
+"""
+
+import bisect
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Pipeline stage buckets in seconds, down to the 100 µs of a cache lookup
+STAGE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class _ShardedMetric:
+    """
+    Base class for metrics recorded in per-thread shards
+
+    Every thread writes only to its own shard, so recording a value never
+    takes a lock shared with other threads. Shards are summed when the
+    metric is collected, and shards of finished threads are folded into a
+    retired total so thread churn does not grow memory.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        """
+        Initialize the metric
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the metric labels
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._lock = threading.Lock()
+
+    def _shard(self) -> Dict:
+        """
+        Get the calling thread's shard, creating it on first use
+
+        Returns:
+            Dictionary of label values -> recorded state
+        """
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = {}
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _label_key(self, labels: Dict) -> Tuple:
+        """
+        Convert label keyword arguments into a shard key
+
+        Args:
+            labels: Label values by name
+
+        Returns:
+            Tuple of label values in labelnames order
+        """
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _collect_shards(self) -> List[Dict]:
+        """
+        Snapshot all shards, retiring those of finished threads
+
+        Returns:
+            List of shard copies (including the retired total)
+        """
+        with self._lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    self._merge(self._retired, self._copy(shard))
+            self._shards = live
+            snapshots = [self._copy(self._retired)]
+            snapshots.extend(self._copy(shard) for _, shard in live)
+        return snapshots
+
+    def _copy(self, shard: Dict) -> Dict:
+        raise NotImplementedError
+
+    def _merge(self, target: Dict, shard: Dict) -> None:
+        raise NotImplementedError
+
+    def collect(self) -> Dict:
+        """
+        Get the current values summed over all threads
+
+        Returns:
+            Dictionary of label values tuple -> value
+        """
+        total = {}
+        for shard in self._collect_shards():
+            self._merge(total, shard)
+        return total
+
+    def _format_labels(self, key: Tuple, extra: Optional[Tuple] = None) -> str:
+        """
+        Format label values for the text exposition format
+
+        Args:
+            key: Label values in labelnames order
+            extra: Additional (name, value) label pair
+
+        Returns:
+            Label string such as '{endpoint="weather"}' or ''
+        """
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ''
+        escaped = [
+            '{}="{}"'.format(name, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for name, value in pairs
+        ]
+        return '{' + ','.join(escaped) + '}'
+
+
+class Counter(_ShardedMetric):
+    """
+    Monotonically increasing counter
+    """
+
+    TYPE = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """
+        Increment the counter
+
+        Args:
+            amount: Amount to add
+            **labels: Label values
+        """
+        shard = self._shard()
+        key = self._label_key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def _copy(self, shard: Dict) -> Dict:
+        return dict(shard)
+
+    def _merge(self, target: Dict, shard: Dict) -> None:
+        for key, value in shard.items():
+            target[key] = target.get(key, 0) + value
+
+    def expose(self) -> List[str]:
+        """
+        Render the counter in Prometheus text format
+
+        Returns:
+            Exposition lines
+        """
+        lines = []
+        for key, value in sorted(self.collect().items()):
+            lines.append('{}{} {}'.format(self.name, self._format_labels(key), _format_value(value)))
+        return lines
+
+
+class Histogram(_ShardedMetric):
+    """
+    Cumulative histogram of observed values
+    """
+
+    TYPE = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Initialize the histogram
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the metric labels
+            buckets: Sorted bucket upper bounds
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels) -> None:
+        """
+        Record an observation
+
+        Args:
+            value: Observed value
+            **labels: Label values
+        """
+        shard = self._shard()
+        key = self._label_key(labels)
+        state = shard.get(key)
+        if state is None:
+            # [bucket counts..., +Inf count], sum
+            state = shard[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    def _copy(self, shard: Dict) -> Dict:
+        return {key: [list(state[0]), state[1]] for key, state in list(shard.items())}
+
+    def _merge(self, target: Dict, shard: Dict) -> None:
+        for key, (counts, total) in shard.items():
+            existing = target.get(key)
+            if existing is None:
+                target[key] = [list(counts), total]
+            else:
+                existing[0] = [a + b for a, b in zip(existing[0], counts)]
+                existing[1] += total
+
+    def expose(self) -> List[str]:
+        """
+        Render the histogram in Prometheus text format
+
+        Returns:
+            Exposition lines
+        """
+        lines = []
+        bounds = [_format_value(bound) for bound in self.buckets] + ['+Inf']
+        for key, (counts, total) in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                lines.append('{}_bucket{} {}'.format(
+                    self.name, self._format_labels(key, ('le', bound)), cumulative
+                ))
+            lines.append('{}_sum{} {}'.format(self.name, self._format_labels(key), _format_value(total)))
+            lines.append('{}_count{} {}'.format(self.name, self._format_labels(key), cumulative))
+        return lines
+
+
+def _format_value(value: float) -> str:
+    """
+    Format a sample value for the exposition format
+
+    Args:
+        value: Sample value
+
+    Returns:
+        String representation without a trailing '.0' for integers
+    """
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    Collection of named metrics
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        """
+        Get or create a counter
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the metric labels
+
+        Returns:
+            Counter
+        """
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """
+        Get or create a histogram
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the metric labels
+            buckets: Sorted bucket upper bounds
+
+        Returns:
+            Histogram
+        """
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        """
+        Register a callable rendering extra metrics at exposition time
+
+        Args:
+            collector: Callable returning exposition lines
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def expose(self) -> str:
+        """
+        Render all metrics in Prometheus text format
+
+        Returns:
+            Text exposition (version 0.0.4)
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.append('# HELP {} {}'.format(metric.name, metric.documentation))
+            lines.append('# TYPE {} {}'.format(metric.name, metric.TYPE))
+            lines.extend(metric.expose())
+        for collector in list(self._collectors):
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+CACHE_REQUESTS = registry.counter(
+    'weather_cache_requests_total', 'Weather cache lookups by cache key and result (hit or miss).',
+    ('key', 'result')
+)
+UPSTREAM_REQUESTS = registry.counter(
+    'weather_upstream_requests_total', 'Upstream weather API calls by endpoint and HTTP status.',
+    ('endpoint', 'status')
+)
+UPSTREAM_LATENCY = registry.histogram(
+    'weather_upstream_latency_seconds', 'Upstream weather API call latency in seconds.',
+    ('endpoint',)
+)
+CACHE_EVICTIONS = registry.counter(
+    'weather_cache_evictions_total', 'Entries removed from the in-process cache by cache and reason (lru or expired).',
+    ('cache', 'reason')
+)
+HEDGED_REQUESTS = registry.counter(
+    'weather_hedged_requests_total', 'Upstream calls hedged to the secondary provider by winning provider.',
+    ('winner',)
+)
+STALE_SERVES = registry.counter(
+    'weather_stale_serves_total', 'Responses served from expired data because the upstream failed.',
+    ('key',)
+)
+STAGE_DURATION = registry.histogram(
+    'weather_stage_duration_seconds', 'Duration of index pipeline stages in seconds.',
+    ('stage',), buckets=STAGE_BUCKETS
+)
+PAGE_CACHE_REQUESTS = registry.counter(
+    'weather_page_cache_requests_total', 'Rendered page cache lookups by result (burst, hit or miss).',
+    ('result',)
+)
@@ -0,0 +1,92 @@
+"""
+Index Page Context
+Weather data and sport recommendations shown on the index page
+"""
+
+import logging
+from django.conf import settings
+from typing import Dict
+
+from .sport_service import SportRecommendationService
+from .timing import stage
+from .weather_service import WeatherService
+
+logger = logging.getLogger(__name__)
+
+
+def build_index_context(location=None) -> Dict:
+    """
+    Fetch weather data and sport recommendations for the index template
+
+    Used by the index view and the page prerenderer.
+
+    Args:
+        location: (lat, lon) tuple or "lat,lon" string, defaults to Reinach BL
+
+    Returns:
+        Template context, with 'error' set if data could not be fetched
+    """
+    context = {
+        'error': None,
+        # The event stream only carries Reinach BL updates
+        'live_updates': getattr(settings, 'WEATHER_LIVE_UPDATES', False) and location is None,
+        'location': None,
+        'current_weather': None,
+        'forecast_24h': None,
+        'forecast_summary': None,
+        'cycling_recommendation': None,
+        'running_recommendation': None,
+    }
+
+    try:
+        # Initialize weather service
+        weather_service = WeatherService()
+
+        if location is not None:
+            coordinates = location.split(',') if isinstance(location, str) else location
+            context['location'] = "{:.4f}, {:.4f}".format(*(float(value) for value in coordinates))
+
+        with stage('fetch'):
+            # Fetch current weather
+            current_weather = weather_service.get_current_weather(location)
+            context['current_weather'] = current_weather
+
+            # Fetch 24-hour forecast
+            forecast_24h = weather_service.get_forecast_24h(location)
+            context['forecast_24h'] = forecast_24h
+
+        # Columnar chart payload, serialized once when the forecast is cached
+        if forecast_24h:
+            context['forecast_json'] = weather_service.get_forecast_chart_json(location) or 'null'
+            context['forecast_summary'] = weather_service.get_forecast_summary(location)
+        else:
+            context['forecast_json'] = 'null'
+
+        # Initialize sport service with default thresholds
+        sport_service = SportRecommendationService()
+
+        # Get cycling recommendation
+        cycling_recommended, cycling_reasons = sport_service.evaluate_sport(
+            sport='cycling',
+            weather_data=current_weather
+        )
+        context['cycling_recommendation'] = {
+            'recommended': cycling_recommended,
+            'reason': ' '.join(cycling_reasons)
+        }
+
+        # Get running recommendation
+        running_recommended, running_reasons = sport_service.evaluate_sport(
+            sport='running',
+            weather_data=current_weather
+        )
+        context['running_recommendation'] = {
+            'recommended': running_recommended,
+            'reason': ' '.join(running_reasons)
+        }
+
+    except Exception as e:
+        logger.error("Error fetching weather data or generating recommendations: {}".format(str(e)))
+        context['error'] = "Unable to fetch weather data. Please try again later."
+
+    return context
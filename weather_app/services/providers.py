@@ -0,0 +1,630 @@
+"""
+Weather Providers
+Upstream weather sources returning data in one normalized schema
+
+Normalized current weather (dictionary):
+    temperature, feels_like (°C), humidity (%), wind_speed (km/h),
+    precipitation (mm in the last hour), description, icon (OpenWeatherMap
+    icon code), timestamp (datetime of the observation), location
+
+Normalized forecast (list of dictionaries, one per 3-hour period):
+    timestamp, temperature, feels_like, humidity, wind_speed,
+    precipitation (mm in 3 hours), description, icon
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import requests
+
+from .metrics import HEDGED_REQUESTS, UPSTREAM_LATENCY, UPSTREAM_REQUESTS
+from .timing import stage
+
+
+def get_json(url: str, params: Dict, endpoint: str, timeout: float = 10) -> Dict:
+    """
+    Call an upstream endpoint and record upstream metrics
+
+    Args:
+        url: Endpoint URL
+        params: Query parameters
+        endpoint: Endpoint label for metrics
+        timeout: Request timeout in seconds
+
+    Returns:
+        Decoded JSON response
+
+    Raises:
+        requests.exceptions.RequestException: On timeouts, connection and HTTP errors
+    """
+    status = 'error'
+    start = time.perf_counter()
+    try:
+        response = requests.get(url, params=params, timeout=timeout)
+        status = str(response.status_code)
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.Timeout:
+        status = 'timeout'
+        raise
+    finally:
+        UPSTREAM_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+        UPSTREAM_REQUESTS.inc(endpoint=endpoint, status=status)
+
+
+class WeatherProvider:
+    """
+    Base class for weather providers
+
+    Subclasses implement the raw calls (_get_current, _get_forecast) and the
+    conversion into the normalized schema (parse_current, parse_forecast),
+    and declare how often the upstream publishes new data.
+    """
+
+    name = 'provider'
+
+    # Upstream publication schedule: a new observation about every
+    # observation_interval, and a new forecast model run every
+    # model_run_interval (runs aligned to midnight UTC), available
+    # model_run_delay after the run time
+    observation_interval = timedelta(minutes=10)
+    model_run_interval = timedelta(hours=3)
+    model_run_delay = timedelta(0)
+
+    def next_model_run(self, now: datetime) -> datetime:
+        """
+        Get when the next forecast model run becomes available
+
+        Args:
+            now: Current (naive local) time
+
+        Returns:
+            Availability time of the next model run, after now
+        """
+        interval = self.model_run_interval.total_seconds()
+        delay = self.model_run_delay.total_seconds()
+        latest = (now.timestamp() - delay) // interval * interval + delay
+        return datetime.fromtimestamp(latest + interval)
+
+    def fetch_current(self, lat: float, lon: float) -> Dict:
+        """
+        Get current weather in the normalized schema
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+
+        Returns:
+            Normalized current weather
+
+        Raises:
+            requests.exceptions.RequestException: If the upstream call fails
+        """
+        with stage('upstream_current'):
+            data = self._get_current(lat, lon)
+        with stage('parse_current'):
+            return self.parse_current(data)
+
+    def fetch_forecast(self, lat: float, lon: float, periods: int = 8) -> List[Dict]:
+        """
+        Get the forecast in the normalized schema
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            periods: Number of 3-hour periods
+
+        Returns:
+            Normalized forecast periods
+
+        Raises:
+            requests.exceptions.RequestException: If the upstream call fails
+        """
+        with stage('upstream_forecast'):
+            data = self._get_forecast(lat, lon, periods)
+        with stage('parse_forecast'):
+            return self.parse_forecast(data)
+
+    def _get_current(self, lat: float, lon: float) -> Dict:
+        raise NotImplementedError
+
+    def _get_forecast(self, lat: float, lon: float, periods: int) -> Dict:
+        raise NotImplementedError
+
+    def parse_current(self, data: Dict) -> Dict:
+        raise NotImplementedError
+
+    def parse_forecast(self, data: Dict) -> List[Dict]:
+        raise NotImplementedError
+
+
+class OpenWeatherMapProvider(WeatherProvider):
+    """
+    OpenWeatherMap current weather and 5 day / 3 hour forecast API
+    """
+
+    name = 'openweathermap'
+
+    # Observations about every 10 minutes, the 3-hour forecast every 3 hours
+    observation_interval = timedelta(minutes=10)
+    model_run_interval = timedelta(hours=3)
+
+    def __init__(self, api_key: str, base_url: str = "https://api.openweathermap.org/data/2.5"):
+        """
+        Initialize the provider
+
+        Args:
+            api_key: OpenWeatherMap API key
+            base_url: API base URL
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+
+    def _get_current(self, lat: float, lon: float) -> Dict:
+        params = {
+            'lat': lat,
+            'lon': lon,
+            'appid': self.api_key,
+            'units': 'metric'
+        }
+        return get_json("{}/weather".format(self.base_url), params, 'weather')
+
+    def _get_forecast(self, lat: float, lon: float, periods: int) -> Dict:
+        params = {
+            'lat': lat,
+            'lon': lon,
+            'appid': self.api_key,
+            'units': 'metric',
+            'cnt': periods  # 3-hour intervals
+        }
+        return get_json("{}/forecast".format(self.base_url), params, 'forecast')
+
+    def parse_current(self, data: Dict) -> Dict:
+        """
+        Parse current weather API response
+
+        Args:
+            data: Raw API response
+
+        Returns:
+            Normalized current weather
+        """
+        return {
+            'temperature': data['main']['temp'],
+            'feels_like': data['main']['feels_like'],
+            'humidity': data['main']['humidity'],
+            'wind_speed': data['wind']['speed'] * 3.6,  # Convert m/s to km/h
+            'precipitation': data.get('rain', {}).get('1h', 0),  # mm in last hour
+            'description': data['weather'][0]['description'],
+            'icon': data['weather'][0]['icon'],
+            'timestamp': datetime.fromtimestamp(data['dt']),
+            'location': f"{data['name']}, {data['sys']['country']}"
+        }
+
+    def parse_forecast(self, data: Dict) -> List[Dict]:
+        """
+        Parse forecast API response
+
+        Args:
+            data: Raw API response
+
+        Returns:
+            Normalized forecast periods
+        """
+        forecasts = []
+
+        for item in data['list']:
+            forecast = {
+                'timestamp': datetime.fromtimestamp(item['dt']),
+                'temperature': item['main']['temp'],
+                'feels_like': item['main']['feels_like'],
+                'humidity': item['main']['humidity'],
+                'wind_speed': item['wind']['speed'] * 3.6,  # Convert m/s to km/h
+                'precipitation': item.get('rain', {}).get('3h', 0),  # mm in 3 hours
+                'description': item['weather'][0]['description'],
+                'icon': item['weather'][0]['icon']
+            }
+            forecasts.append(forecast)
+
+        return forecasts
+
+
+# WMO weather interpretation codes -> (description, OpenWeatherMap icon without day/night suffix)
+WMO_CODES = {
+    0: ('clear sky', '01'),
+    1: ('mainly clear', '02'),
+    2: ('partly cloudy', '03'),
+    3: ('overcast', '04'),
+    45: ('fog', '50'),
+    48: ('depositing rime fog', '50'),
+    51: ('light drizzle', '09'),
+    53: ('drizzle', '09'),
+    55: ('dense drizzle', '09'),
+    56: ('freezing drizzle', '09'),
+    57: ('dense freezing drizzle', '09'),
+    61: ('light rain', '10'),
+    63: ('rain', '10'),
+    65: ('heavy rain', '10'),
+    66: ('freezing rain', '13'),
+    67: ('heavy freezing rain', '13'),
+    71: ('light snow', '13'),
+    73: ('snow', '13'),
+    75: ('heavy snow', '13'),
+    77: ('snow grains', '13'),
+    80: ('light rain showers', '09'),
+    81: ('rain showers', '09'),
+    82: ('violent rain showers', '09'),
+    85: ('snow showers', '13'),
+    86: ('heavy snow showers', '13'),
+    95: ('thunderstorm', '11'),
+    96: ('thunderstorm with hail', '11'),
+    99: ('thunderstorm with heavy hail', '11'),
+}
+
+OPEN_METEO_FIELDS = 'temperature_2m,apparent_temperature,relative_humidity_2m,wind_speed_10m,precipitation,weather_code'
+
+
+class OpenMeteoProvider(WeatherProvider):
+    """
+    Open-Meteo forecast API (no API key required)
+
+    Hourly values are combined into 3-hour periods to match the
+    OpenWeatherMap forecast.
+    """
+
+    name = 'openmeteo'
+
+    # 15-minutely current conditions, forecasts refreshed every hour
+    observation_interval = timedelta(minutes=15)
+    model_run_interval = timedelta(hours=1)
+
+    def __init__(self, base_url: str = "https://api.open-meteo.com/v1", location_name: Optional[str] = None):
+        """
+        Initialize the provider
+
+        Args:
+            base_url: API base URL
+            location_name: Location reported in current weather (Open-Meteo has no place names)
+        """
+        self.base_url = base_url
+        self.location_name = location_name
+
+    def _get_current(self, lat: float, lon: float) -> Dict:
+        params = {
+            'latitude': lat,
+            'longitude': lon,
+            'current': OPEN_METEO_FIELDS + ',is_day',
+            'wind_speed_unit': 'kmh',
+            'timeformat': 'unixtime',
+        }
+        data = get_json("{}/forecast".format(self.base_url), params, 'openmeteo_current')
+        data.setdefault('location', self.location_name or "{}, {}".format(lat, lon))
+        return data
+
+    def _get_forecast(self, lat: float, lon: float, periods: int) -> Dict:
+        params = {
+            'latitude': lat,
+            'longitude': lon,
+            'hourly': OPEN_METEO_FIELDS,
+            'forecast_hours': periods * 3,
+            'wind_speed_unit': 'kmh',
+            'timeformat': 'unixtime',
+        }
+        return get_json("{}/forecast".format(self.base_url), params, 'openmeteo_forecast')
+
+    def _describe(self, code: int, is_day: bool = True):
+        description, icon = WMO_CODES.get(code, ('unknown', '03'))
+        return description, icon + ('d' if is_day else 'n')
+
+    def parse_current(self, data: Dict) -> Dict:
+        """
+        Parse an Open-Meteo current weather response
+
+        Args:
+            data: Raw API response
+
+        Returns:
+            Normalized current weather
+        """
+        current = data['current']
+        description, icon = self._describe(current['weather_code'], current.get('is_day', 1))
+        return {
+            'temperature': current['temperature_2m'],
+            'feels_like': current['apparent_temperature'],
+            'humidity': current['relative_humidity_2m'],
+            'wind_speed': current['wind_speed_10m'],
+            'precipitation': current.get('precipitation', 0),
+            'description': description,
+            'icon': icon,
+            'timestamp': datetime.fromtimestamp(current['time']),
+            'location': data['location']
+        }
+
+    def parse_forecast(self, data: Dict) -> List[Dict]:
+        """
+        Parse an Open-Meteo hourly forecast into 3-hour periods
+
+        Each period takes the values of its first hour, except precipitation
+        which is summed over the three hours.
+
+        Args:
+            data: Raw API response
+
+        Returns:
+            Normalized forecast periods
+        """
+        hourly = data['hourly']
+        forecasts = []
+
+        for start in range(0, len(hourly['time']) - 2, 3):
+            description, icon = self._describe(hourly['weather_code'][start])
+            forecasts.append({
+                'timestamp': datetime.fromtimestamp(hourly['time'][start]),
+                'temperature': hourly['temperature_2m'][start],
+                'feels_like': hourly['apparent_temperature'][start],
+                'humidity': hourly['relative_humidity_2m'][start],
+                'wind_speed': hourly['wind_speed_10m'][start],
+                'precipitation': sum(value or 0 for value in hourly['precipitation'][start:start + 3]),
+                'description': description,
+                'icon': icon
+            })
+
+        return forecasts
+
+
+class LatencyTracker:
+    """
+    Sliding window of recent call latencies
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        Initialize the tracker
+
+        Args:
+            window: Number of recent latencies kept
+            min_samples: Samples needed before quantiles are reported
+        """
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Get a latency quantile
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Latency in seconds, or None if there are too few samples
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+# Latency history per provider name, kept for the lifetime of the process
+_latency_trackers = {}
+_latency_trackers_lock = threading.Lock()
+
+# Bounded call pools per provider name, kept for the lifetime of the process
+_provider_pools = {}
+_provider_pools_lock = threading.Lock()
+
+
+def get_latency_tracker(name: str) -> LatencyTracker:
+    """
+    Get the process-wide latency tracker of a provider
+
+    Args:
+        name: Provider name
+
+    Returns:
+        LatencyTracker
+    """
+    with _latency_trackers_lock:
+        return _latency_trackers.setdefault(name, LatencyTracker())
+
+
+class ProviderPool:
+    """
+    Bounded thread pool running the calls of one provider
+
+    At most `size` calls are in flight. While all of them are busy, e.g.
+    hanging until their request timeout during an upstream brownout,
+    further calls are refused rather than queued behind them, so one
+    slow provider cannot delay every later fetch.
+    """
+
+    def __init__(self, name: str, size: int = 4):
+        """
+        Initialize the pool
+
+        Args:
+            name: Provider name, used for thread names
+            size: Maximum calls in flight
+        """
+        self.size = size
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix='weather-{}'.format(name))
+        self._slots = threading.BoundedSemaphore(size)
+
+    def submit(self, function, *args) -> Optional[Future]:
+        """
+        Run a call in the pool if a slot is free
+
+        The call runs in a copy of the caller's context, so stage timings
+        reach the request.
+
+        Args:
+            function: Callable to run
+            *args: Its arguments
+
+        Returns:
+            Future of the call, or None if all slots are busy
+        """
+        if not self._slots.acquire(blocking=False):
+            return None
+        context = contextvars.copy_context()
+        try:
+            future = self._executor.submit(context.run, function, *args)
+        except RuntimeError:
+            self._slots.release()
+            raise
+        # Also called when the future is cancelled before it started
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+
+def get_provider_pool(name: str, size: int = 4) -> ProviderPool:
+    """
+    Get the process-wide call pool of a provider
+
+    Args:
+        name: Provider name
+        size: Maximum calls in flight, used when the pool is created
+
+    Returns:
+        ProviderPool
+    """
+    with _provider_pools_lock:
+        if name not in _provider_pools:
+            _provider_pools[name] = ProviderPool(name, size)
+        return _provider_pools[name]
+
+
+class HedgedProvider(WeatherProvider):
+    """
+    Provider sending a backup request to a secondary provider when the primary is slow
+
+    The primary is always called first. If it has not answered within the
+    hedge delay (the primary's recent p95 latency, within bounds), the same
+    query goes to the secondary and the first successful answer wins. A
+    primary failure hedges immediately. A losing call that has not started
+    is cancelled; a running one finishes within its request timeout and
+    its result is discarded.
+
+    Each provider runs in its own bounded pool (see ProviderPool). When
+    the primary's pool is full, the query goes to the secondary directly;
+    when the secondary's is full, the query is not hedged; when both are
+    full, it fails at once. No call waits longer than `timeout`.
+    """
+
+    name = 'hedged'
+
+    def __init__(self, primary: WeatherProvider, secondary: WeatherProvider, quantile: float = 0.95,
+                 default_delay: float = 0.5, min_delay: float = 0.05, max_delay: float = 2.0,
+                 tracker: Optional[LatencyTracker] = None, pool_size: int = 4, timeout: float = 10):
+        """
+        Initialize the hedged provider
+
+        Args:
+            primary: Provider asked first
+            secondary: Provider asked when the primary is slow or fails
+            quantile: Primary latency quantile used as the hedge delay
+            default_delay: Hedge delay until enough latencies were observed
+            min_delay: Lower bound of the hedge delay in seconds
+            max_delay: Upper bound of the hedge delay in seconds
+            tracker: Primary latency history (defaults to the process-wide one)
+            pool_size: Maximum calls in flight per provider
+            timeout: Maximum seconds to wait for an answer, the upstream request timeout
+        """
+        self.primary = primary
+        self.secondary = secondary
+        self.quantile = quantile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.tracker = tracker or get_latency_tracker(primary.name)
+        self.timeout = timeout
+        self._primary_pool = get_provider_pool(primary.name, pool_size)
+        self._secondary_pool = get_provider_pool(secondary.name, pool_size)
+        # Data is cached on the primary's schedule
+        self.observation_interval = primary.observation_interval
+        self.model_run_interval = primary.model_run_interval
+        self.model_run_delay = primary.model_run_delay
+
+    def hedge_delay(self) -> float:
+        """
+        Get the current hedge delay
+
+        Returns:
+            Seconds to wait for the primary before hedging
+        """
+        delay = self.tracker.quantile(self.quantile)
+        if delay is None:
+            delay = self.default_delay
+        return max(self.min_delay, min(delay, self.max_delay))
+
+    def fetch_current(self, lat: float, lon: float) -> Dict:
+        return self._hedged('fetch_current', lat, lon)
+
+    def fetch_forecast(self, lat: float, lon: float, periods: int = 8) -> List[Dict]:
+        return self._hedged('fetch_forecast', lat, lon, periods)
+
+    def _hedged(self, method: str, *args):
+        """
+        Call a provider method with hedging
+
+        Args:
+            method: 'fetch_current' or 'fetch_forecast'
+            *args: Method arguments
+
+        Returns:
+            First successful result
+
+        Raises:
+            requests.exceptions.RequestException: If both providers fail,
+            are busy or do not answer within the timeout
+        """
+        start = time.perf_counter()
+        futures = []
+        primary = self._primary_pool.submit(getattr(self.primary, method), *args)
+        if primary is not None:
+            def record_latency(future):
+                # Slow answers count too, even if the secondary won
+                if not future.cancelled() and future.exception() is None:
+                    self.tracker.observe(time.perf_counter() - start)
+
+            primary.add_done_callback(record_latency)
+            try:
+                return primary.result(timeout=self.hedge_delay())
+            except FuturesTimeoutError:
+                pass
+            except requests.exceptions.RequestException:
+                pass
+            futures.append(primary)
+
+        secondary = self._secondary_pool.submit(getattr(self.secondary, method), *args)
+        if secondary is not None:
+            futures.append(secondary)
+        if not futures:
+            raise requests.exceptions.ConnectionError("All weather providers are busy")
+
+        error = None
+        try:
+            for future in as_completed(futures, timeout=max(0.0, start + self.timeout - time.perf_counter())):
+                try:
+                    result = future.result()
+                except requests.exceptions.RequestException as e:
+                    error = e
+                    continue
+                HEDGED_REQUESTS.inc(winner='primary' if future is primary else 'secondary')
+                return result
+        except FuturesTimeoutError:
+            raise requests.exceptions.Timeout("No weather provider answered within {}s".format(self.timeout))
+        finally:
+            for future in futures:
+                future.cancel()
+        raise error
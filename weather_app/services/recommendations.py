@@ -0,0 +1,151 @@
+"""
+Materialized Recommendations
+Forecast recommendations of every cached location, indexed by sport and hour
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+HOUR = 3600
+
+
+def _hour(moment: datetime) -> int:
+    """Epoch seconds of the start of the hour"""
+    return int(moment.timestamp()) // HOUR * HOUR
+
+
+class RecommendationTable:
+    """
+    Thread-safe table of forecast recommendations per location
+
+    Each location holds the output of
+    SportRecommendationService.get_recommendations_for_forecast together
+    with the version of the forecast it was computed from. Suitable hours
+    are indexed per sport, so "where is running suitable from 07:00 to
+    09:00" is answered by intersecting a few sets rather than by
+    evaluating any forecast.
+
+    Rows are only dropped when found stale or when the table is full, so
+    it is bounded like the forecast cache: beyond `max_rows`, the rows
+    refreshed longest ago go first, as their forecasts are the first the
+    cache evicts.
+    """
+
+    def __init__(self, max_rows: Optional[int] = None):
+        """
+        Initialize an empty table
+
+        Args:
+            max_rows: Maximum number of locations, None for no limit
+        """
+        self.max_rows = max_rows
+        # key -> (version, (lat, lon), recommendations), oldest refresh first
+        self._rows = {}
+        # sport -> hour (epoch seconds) -> set of keys
+        self._suitable = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, key: str, location: Tuple[float, float], version: str,
+                recommendations: List[Dict]) -> None:
+        """
+        Replace the recommendations of a location
+
+        Args:
+            key: Cache key of the forecast they were computed from
+            location: (lat, lon)
+            version: Cache version of that forecast
+            recommendations: Forecast recommendations, one per period
+        """
+        with self._lock:
+            self._discard(key)
+            self._rows[key] = (version, location, recommendations)
+            for period in recommendations:
+                hour = _hour(period['timestamp'])
+                for sport, recommendation in period['recommendations'].items():
+                    if recommendation['recommended']:
+                        self._suitable.setdefault(sport, {}).setdefault(hour, set()).add(key)
+            while self.max_rows is not None and len(self._rows) > self.max_rows:
+                self._discard(next(iter(self._rows)))
+
+    def remove(self, key: str) -> None:
+        """
+        Remove the recommendations of a location if present
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key: str) -> None:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        for period in row[2]:
+            hour = _hour(period['timestamp'])
+            for sport in period['recommendations']:
+                keys = self._suitable.get(sport, {}).get(hour)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._suitable[sport][hour]
+
+    def get(self, key: str, version: Optional[str] = None) -> Optional[List[Dict]]:
+        """
+        Get the recommendations of a location
+
+        Args:
+            key: Cache key
+            version: Required forecast version, None for any
+
+        Returns:
+            Forecast recommendations, or None if missing or of another version
+        """
+        row = self._rows.get(key)
+        if row is None or (version is not None and row[0] != version):
+            return None
+        return row[2]
+
+    def suitable_locations(self, sport: str, start: datetime, end: datetime) -> List[Tuple]:
+        """
+        Find locations where a sport is suitable for every hour of a time range
+
+        Args:
+            sport: Name of the sport
+            start: Start of the range
+            end: End of the range (exclusive); hours are whole clock hours
+
+        Returns:
+            List of ((lat, lon), key, version), sorted by location; empty
+            if the range is empty
+        """
+        # Hours are visited one at a time, so a range reaching past the
+        # cached forecasts stops at their end however long it is
+        hour = _hour(start)
+        end_seconds = end.timestamp()
+        if end_seconds <= start.timestamp():
+            return []
+        with self._lock:
+            hours = self._suitable.get(sport, {})
+            keys = None
+            while hour < end_seconds:
+                suitable = hours.get(hour)
+                if not suitable:
+                    return []
+                keys = set(suitable) if keys is None else keys & suitable
+                if not keys:
+                    return []
+                hour += HOUR
+            return sorted((self._rows[key][1], key, self._rows[key][0]) for key in keys)
+
+    def clear(self) -> None:
+        """
+        Remove all rows
+        """
+        with self._lock:
+            self._rows.clear()
+            self._suitable.clear()
+
+    def __len__(self) -> int:
+        return len(self._rows)
@@ -0,0 +1,121 @@
+"""
+Background Weather Refresher
+Keeps the weather cache warm from a single thread per process
+"""
+
+import logging
+import threading
+from typing import Callable, Iterable, Optional
+
+from .weather_service import WeatherService
+
+logger = logging.getLogger(__name__)
+
+
+class WeatherRefresher:
+    """
+    Periodically refreshes the cached weather data in a daemon thread
+
+    The refresh goes through WeatherService, so the upstream API is only
+    called once the cached entries have expired, and cache update listeners
+    are notified exactly once per refresh regardless of how many clients are
+    connected. Besides Reinach BL, further locations can be kept warm, and
+    callbacks run after every refresh (e.g. to pre-render pages).
+    """
+
+    def __init__(self, interval: float = 60, locations: Iterable = (),
+                 after_refresh: Iterable[Callable[[], None]] = ()):
+        """
+        Initialize the refresher
+
+        Args:
+            interval: Seconds between refresh checks
+            locations: Further locations to refresh, as accepted by WeatherService
+            after_refresh: Callbacks run after each refresh
+        """
+        self.interval = interval
+        self.locations = tuple(locations)
+        self.after_refresh = list(after_refresh)
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def refresh(self) -> None:
+        """
+        Refresh current weather and forecast if their cache entries expired
+        """
+        weather_service = WeatherService()
+        for location in (None,) + self.locations:
+            weather_service.get_current_weather(location)
+            weather_service.get_forecast_24h(location)
+        for callback in self.after_refresh:
+            callback()
+
+    def start(self) -> None:
+        """
+        Start the refresh thread if it is not already running
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, name='weather-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the refresh thread
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def run(self) -> None:
+        """
+        Refresh until stopped, in the calling thread
+
+        Run by the background thread, or in the foreground by a dedicated
+        process.
+        """
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error("Background weather refresh failed: {}".format(str(e)))
+            self._stop_event.wait(self.interval)
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def start_background_refresh(interval: float = 60, locations: Iterable = (),
+                             after_refresh: Iterable[Callable[[], None]] = ()) -> WeatherRefresher:
+    """
+    Start the process-wide background refresher (idempotent)
+
+    Locations and callbacks only apply when the refresher is created.
+
+    Args:
+        interval: Seconds between refresh checks
+        locations: Further locations to refresh
+        after_refresh: Callbacks run after each refresh
+
+    Returns:
+        WeatherRefresher: The running refresher
+    """
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = WeatherRefresher(interval=interval, locations=locations, after_refresh=after_refresh)
+        _refresher.start()
+        return _refresher
+
+
+def get_background_refresher() -> Optional[WeatherRefresher]:
+    """
+    Get the process-wide background refresher if it was started
+
+    Returns:
+        WeatherRefresher or None
+    """
+    return _refresher
@@ -0,0 +1,228 @@
+"""
+Route Evaluation
+Sport suitability along a route, from the forecast at each arrival time
+"""
+
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .interpolation import forecast_at
+from .spatial import KM_PER_DEGREE_LAT, haversine_km
+from .sport_service import SportRecommendationService
+
+
+def decode_polyline(encoded: str, precision: int = 5) -> List[Tuple[float, float]]:
+    """
+    Decode an encoded polyline (Google polyline algorithm)
+
+    Args:
+        encoded: Encoded polyline
+        precision: Decimal places of the encoding (5, or 6 for polyline6)
+
+    Returns:
+        List of (lat, lon)
+
+    Raises:
+        ValueError: If the string is not a valid polyline
+    """
+    factor = 10 ** precision
+    points = []
+    index = lat = lon = 0
+    while index < len(encoded):
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                if index >= len(encoded):
+                    raise ValueError("Truncated polyline")
+                byte = ord(encoded[index]) - 63
+                index += 1
+                if not 0 <= byte < 64:
+                    raise ValueError("Invalid polyline character")
+                result |= (byte & 0x1f) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lon += deltas[1]
+        points.append((lat / factor, lon / factor))
+
+    for point_lat, point_lon in points:
+        if not (-90 <= point_lat <= 90 and -180 <= point_lon <= 180):
+            raise ValueError("Polyline coordinates out of range")
+    return points
+
+
+def route_length_km(points: List[Tuple[float, float]]) -> float:
+    """
+    Get the length of a route
+
+    Args:
+        points: Route as a list of (lat, lon)
+
+    Returns:
+        Length in kilometres
+    """
+    return sum(haversine_km(lat1, lon1, lat2, lon2) for (lat1, lon1), (lat2, lon2) in zip(points, points[1:]))
+
+
+def sample_route(points: List[Tuple[float, float]], interval_km: float) -> List[Tuple[float, float, float]]:
+    """
+    Sample points at regular distances along a route
+
+    The start and end of the route are always included.
+
+    Args:
+        points: Route as a list of (lat, lon)
+        interval_km: Distance between samples
+
+    Returns:
+        List of (distance from the start in km, lat, lon)
+    """
+    if not points:
+        return []
+
+    samples = [(0.0, points[0][0], points[0][1])]
+    travelled = 0.0
+    next_sample = interval_km
+    for (lat1, lon1), (lat2, lon2) in zip(points, points[1:]):
+        length = haversine_km(lat1, lon1, lat2, lon2)
+        while length > 0 and next_sample <= travelled + length:
+            fraction = (next_sample - travelled) / length
+            samples.append((next_sample, lat1 + (lat2 - lat1) * fraction, lon1 + (lon2 - lon1) * fraction))
+            next_sample += interval_km
+        travelled += length
+
+    if travelled > samples[-1][0]:
+        samples.append((travelled, points[-1][0], points[-1][1]))
+    return samples
+
+
+def tile_center(lat: float, lon: float, tile_km: float) -> Tuple[float, float]:
+    """
+    Get the centre of the forecast tile containing a point
+
+    Tiles are squares of `tile_km` along the meridian, the same size in
+    degrees of longitude, like the cells of GeoGridIndex.
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+        tile_km: Tile height in kilometres
+
+    Returns:
+        (lat, lon) of the tile centre, rounded to 4 decimals
+    """
+    degrees = tile_km / KM_PER_DEGREE_LAT
+    return (
+        round((math.floor(lat / degrees) + 0.5) * degrees, 4),
+        round((math.floor(lon / degrees) + 0.5) * degrees, 4),
+    )
+
+
+_tile_executor = None
+_tile_executor_lock = threading.Lock()
+
+
+def _get_tile_executor(max_workers: int) -> ThreadPoolExecutor:
+    global _tile_executor
+    with _tile_executor_lock:
+        if _tile_executor is None:
+            _tile_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='weather-route')
+        return _tile_executor
+
+
+def evaluate_route(points: List[Tuple[float, float]], start: datetime, fetch_hourly: Callable,
+                   sport: str = 'cycling', speed_kmh: float = 20.0, interval_km: float = 2.0,
+                   tile_km: float = 10.0, max_workers: int = 8, max_km: Optional[float] = None,
+                   max_tiles: Optional[int] = None,
+                   sport_service: Optional[SportRecommendationService] = None) -> Optional[Dict]:
+    """
+    Evaluate a sport along a route
+
+    The route is sampled every `interval_km` and each sample is assigned
+    the forecast tile it lies in. Every distinct tile's hourly forecast is
+    fetched once, concurrently; each sample is then evaluated with the
+    forecast of its tile at its estimated arrival time. Routes longer than
+    `max_km` or crossing more than `max_tiles` tiles are rejected before
+    anything is fetched.
+
+    Args:
+        points: Route as a list of (lat, lon)
+        start: Departure time
+        fetch_hourly: Callable taking (lat, lon) and returning an hourly forecast or None
+        sport: Name of the sport
+        speed_kmh: Average speed used to estimate arrival times
+        interval_km: Distance between samples
+        tile_km: Forecast tile size
+        max_workers: Maximum concurrent tile fetches
+        max_km: Maximum route length, None for no limit
+        max_tiles: Maximum number of distinct tiles, None for no limit
+        sport_service: Service with the thresholds to apply
+
+    Returns:
+        Dictionary with the overall 'recommended' (None if part of the
+        route is outside the forecast), 'distance_km', 'arrival', 'tiles'
+        and the evaluated 'samples', or None if a tile forecast is
+        unavailable
+
+    Raises:
+        ValueError: If the route exceeds max_km or max_tiles
+    """
+    if max_km is not None and route_length_km(points) > max_km:
+        raise ValueError("Route longer than {:g} km".format(max_km))
+    sport_service = sport_service or SportRecommendationService()
+    samples = sample_route(points, interval_km)
+    tiles = sorted(set(tile_center(lat, lon, tile_km) for _, lat, lon in samples))
+    if max_tiles is not None and len(tiles) > max_tiles:
+        raise ValueError("Route crosses more than {} forecast tiles".format(max_tiles))
+
+    executor = _get_tile_executor(max_workers)
+    futures = {tile: executor.submit(copy_context().run, fetch_hourly, tile) for tile in tiles}
+    forecasts = {tile: future.result() for tile, future in futures.items()}
+    if any(forecast is None for forecast in forecasts.values()):
+        return None
+
+    evaluated = []
+    recommended = True
+    for distance, lat, lon in samples:
+        tile = tile_center(lat, lon, tile_km)
+        arrival = start + timedelta(hours=distance / speed_kmh)
+        weather = forecast_at(forecasts[tile], arrival)
+        sample = {
+            'distance_km': round(distance, 2),
+            'lat': round(lat, 5),
+            'lon': round(lon, 5),
+            'arrival': arrival,
+            'tile': tile,
+            'weather': None,
+            'recommended': None,
+            'reasons': ["No forecast for the arrival time"],
+        }
+        if weather is None:
+            if recommended:
+                recommended = None
+        else:
+            suitable, reasons = sport_service.evaluate_sport(sport, dict(weather, rain=weather['precipitation']))
+            sample.update({
+                'weather': {field: weather[field] for field in ('temperature', 'wind_speed', 'precipitation')},
+                'recommended': suitable,
+                'reasons': reasons,
+            })
+            if not suitable:
+                recommended = False
+        evaluated.append(sample)
+
+    return {
+        'sport': sport,
+        'recommended': recommended,
+        'distance_km': round(samples[-1][0], 2) if samples else 0.0,
+        'arrival': start + timedelta(hours=samples[-1][0] / speed_kmh) if samples else start,
+        'tiles': len(tiles),
+        'samples': evaluated,
+    }
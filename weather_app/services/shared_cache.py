@@ -0,0 +1,345 @@
+"""
+Shared-Memory Cache
+Cache backend shared by all worker processes on a host through a memory-mapped file
+"""
+
+import hashlib
+import hmac
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# File header: magic, slot count, slot size
+_FILE_HEADER = struct.Struct('<8sII')
+_FILE_HEADER_SIZE = 64
+_MAGIC = b'WXSHM002'
+
+# Slot header: sequence, key hash, expiry (epoch seconds), payload length, payload MAC
+_SLOT_HEADER = struct.Struct('<Q8sdI16s4x')
+_EMPTY_HASH = b'\0' * 8
+
+# Readers retry this often when a slot is being written concurrently
+_READ_RETRIES = 16
+
+
+class SharedMemoryCache:
+    """
+    Fixed-size hash table of pickled entries in a memory-mapped file
+
+    A key may live in any of `probes` consecutive slots starting at its
+    hash modulo the slot count (linear probing). A new key takes a free or
+    expired slot there, and only when all are live evicts the one expiring
+    first, so a single collision does not evict an unrelated key.
+
+    Reads are lock-free: each slot carries a sequence number that writers
+    make odd while they write and even when done, and readers retry when the
+    number is odd or changed during the read (a seqlock). Writers of a key
+    are serialized with a byte-range lock on its probe group, and each slot
+    write with a byte-range lock on the slot, so writes to different keys
+    rarely block each other.
+
+    Every payload carries an HMAC keyed with `secret`; entries that fail
+    the check, e.g. written by another user of the same file, are never
+    unpickled. The file is created with mode 0600.
+    """
+
+    def __init__(self, path: str, secret: bytes, slots: int = 64, slot_size: int = 64 * 1024, probes: int = 4):
+        """
+        Open or create the shared cache file
+
+        A file with a different layout is replaced with a new empty file
+        rather than resized in place, so processes still mapping the old
+        one keep a valid mapping until they reopen it.
+
+        Args:
+            path: Path of the backing file (e.g. on /dev/shm)
+            secret: Key authenticating the entries, the same in all processes
+            slots: Number of slots
+            slot_size: Bytes per slot, including the slot header
+            probes: Slots a key may occupy, at most `slots`
+
+        Raises:
+            RuntimeError: If byte-range locks (fcntl) are not available
+        """
+        if fcntl is None:
+            raise RuntimeError("SharedMemoryCache requires POSIX file locks (fcntl)")
+
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.probes = max(1, min(probes, slots))
+        self._size = _FILE_HEADER_SIZE + slots * slot_size
+        self._mac_key = hashlib.sha256(b'weather_app.shared_cache:' + secret).digest()
+        self._slot_locks = [threading.Lock() for _ in range(slots)]
+        self._group_locks = [threading.Lock() for _ in range(slots)]
+        self._flight_locks = [threading.Lock() for _ in range(slots)]
+
+        # Opening, checking and replacing are serialized by a lock file that
+        # is never replaced itself
+        lock_fd = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.lockf(lock_fd, fcntl.LOCK_EX)
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            header = os.pread(self._fd, _FILE_HEADER.size, 0)
+            if (len(header) < _FILE_HEADER.size or _FILE_HEADER.unpack(header) != (_MAGIC, slots, slot_size)
+                    or os.fstat(self._fd).st_size != self._size):
+                os.close(self._fd)
+                self._fd = self._create_file()
+        finally:
+            os.close(lock_fd)
+        self._mmap = mmap.mmap(self._fd, self._size)
+
+    def _create_file(self) -> int:
+        """
+        Atomically replace the backing file with an empty one of this layout
+
+        Returns:
+            Descriptor of the new file
+        """
+        fd, temporary = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.', prefix='.cache-')
+        try:
+            os.ftruncate(fd, self._size)
+            os.pwrite(fd, _FILE_HEADER.pack(_MAGIC, self.slots, self.slot_size), 0)
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.close(fd)
+            os.unlink(temporary)
+            raise
+        return fd
+
+    def _key_hash(self, key: str) -> bytes:
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+
+    def _slot_offsets(self, key_hash: bytes):
+        home = int.from_bytes(key_hash, 'little') % self.slots
+        return [_FILE_HEADER_SIZE + (home + step) % self.slots * self.slot_size for step in range(self.probes)]
+
+    def _mac(self, key_hash: bytes, expires_at: float, payload: bytes) -> bytes:
+        message = struct.pack('<8sd', key_hash, expires_at) + payload
+        return hmac.new(self._mac_key, message, hashlib.sha256).digest()[:16]
+
+    @contextmanager
+    def _byte_lock(self, thread_locks, index: int, offset: int):
+        """
+        Hold an exclusive lock on one byte of the file, across threads and processes
+
+        Args:
+            thread_locks: Per-index locks excluding threads of this process
+            index: Index into thread_locks
+            offset: Byte offset to lock
+        """
+        with thread_locks[index]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, offset)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, offset)
+
+    def _locked_slot(self, offset: int):
+        """
+        Hold the write lock of a slot
+
+        Args:
+            offset: Byte offset of the slot
+        """
+        return self._byte_lock(self._slot_locks, (offset - _FILE_HEADER_SIZE) // self.slot_size, offset)
+
+    def _locked_group(self, key_hash: bytes):
+        """
+        Hold the write lock of the probe group of a key
+
+        Group locks sit on bytes past the slot area and the single-flight
+        locks, and are always taken before slot locks.
+
+        Args:
+            key_hash: Hash of the key
+        """
+        index = int.from_bytes(key_hash, 'little') % self.slots
+        return self._byte_lock(self._group_locks, index, self._size + self.slots + index)
+
+    def _write_slot(self, offset: int, key_hash: bytes, expires_at: float, payload: bytes) -> None:
+        """
+        Write a slot under the seqlock protocol (caller holds the slot lock)
+
+        Args:
+            offset: Byte offset of the slot
+            key_hash: Hash of the key
+            expires_at: Expiry as epoch seconds
+            payload: Pickled (key, value)
+        """
+        sequence = _SLOT_HEADER.unpack_from(self._mmap, offset)[0]
+        # Odd sequence marks the slot as being written
+        struct.pack_into('<Q', self._mmap, offset, sequence + 1)
+        start = offset + _SLOT_HEADER.size
+        self._mmap[start:start + len(payload)] = payload
+        mac = self._mac(key_hash, expires_at, payload)
+        _SLOT_HEADER.pack_into(self._mmap, offset, sequence + 1, key_hash, expires_at, len(payload), mac)
+        struct.pack_into('<Q', self._mmap, offset, sequence + 2)
+
+    def _read_slot(self, offset: int, key_hash: bytes):
+        """
+        Read a slot's payload if it holds a key hash, without taking any lock
+
+        Args:
+            offset: Byte offset of the slot
+            key_hash: Hash of the key
+
+        Returns:
+            (expires_at, authenticated payload), or None if the slot holds
+            another key or could not be read consistently
+        """
+        for _ in range(_READ_RETRIES):
+            sequence, slot_hash, expires_at, length, mac = _SLOT_HEADER.unpack_from(self._mmap, offset)
+            if sequence % 2:
+                time.sleep(0)
+                continue
+            if slot_hash != key_hash or length == 0 or length > self.slot_size - _SLOT_HEADER.size:
+                return None
+            start = offset + _SLOT_HEADER.size
+            payload = self._mmap[start:start + length]
+            if struct.unpack_from('<Q', self._mmap, offset)[0] != sequence:
+                continue
+            if not hmac.compare_digest(mac, self._mac(key_hash, expires_at, payload)):
+                return None
+            return expires_at, payload
+        return None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a value without taking any lock
+
+        Args:
+            key: Cache key
+            default: Value returned if the key is missing or expired
+
+        Returns:
+            Cached value or default
+        """
+        key_hash = self._key_hash(key)
+        for offset in self._slot_offsets(key_hash):
+            slot = self._read_slot(offset, key_hash)
+            if slot is None:
+                continue
+            expires_at, payload = slot
+            if time.time() >= expires_at:
+                return default
+            stored_key, value = pickle.loads(payload)
+            if stored_key == key:
+                return value
+        return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value
+
+        The value replaces the key's entry if there is one, otherwise it
+        takes a free or expired slot of the key's probe group, or evicts the
+        entry there expiring first. Values whose pickled form does not fit
+        in a slot are not stored.
+
+        Args:
+            key: Cache key
+            value: Picklable value
+            ttl: Seconds until the entry expires (None = no expiry)
+        """
+        payload = pickle.dumps((key, value), protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.slot_size - _SLOT_HEADER.size:
+            return
+        key_hash = self._key_hash(key)
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else float('inf')
+
+        with self._locked_group(key_hash):
+            target = None
+            target_expires_at = float('inf')
+            for offset in self._slot_offsets(key_hash):
+                _, slot_hash, slot_expires_at, length, _ = _SLOT_HEADER.unpack_from(self._mmap, offset)
+                if slot_hash == key_hash:
+                    target = offset
+                    break
+                if length == 0 or slot_expires_at <= now:
+                    slot_expires_at = float('-inf')
+                if target is None or slot_expires_at < target_expires_at:
+                    target, target_expires_at = offset, slot_expires_at
+            with self._locked_slot(target):
+                self._write_slot(target, key_hash, expires_at, payload)
+
+    def delete(self, key: str) -> None:
+        """
+        Remove an entry if present
+
+        Args:
+            key: Cache key
+        """
+        key_hash = self._key_hash(key)
+        with self._locked_group(key_hash):
+            for offset in self._slot_offsets(key_hash):
+                with self._locked_slot(offset):
+                    if _SLOT_HEADER.unpack_from(self._mmap, offset)[1] == key_hash:
+                        self._write_slot(offset, _EMPTY_HASH, 0.0, b'')
+
+    def clear(self) -> None:
+        """
+        Remove all entries
+        """
+        for index in range(self.slots):
+            offset = _FILE_HEADER_SIZE + index * self.slot_size
+            with self._locked_slot(offset):
+                self._write_slot(offset, _EMPTY_HASH, 0.0, b'')
+
+    @contextmanager
+    def lock(self, key: str):
+        """
+        Hold an exclusive lock for a key across all processes
+
+        Used for single-flight fetching: the first process to miss fetches
+        while the others wait and then find the fresh entry.
+
+        Args:
+            key: Cache key
+        """
+        index = int.from_bytes(self._key_hash(key), 'little') % self.slots
+        # Lock bytes past the end of the file so slot writes are not blocked
+        with self._byte_lock(self._flight_locks, index, self._size + index):
+            yield
+
+    def stats(self) -> Dict:
+        """
+        Get occupancy statistics
+
+        Returns:
+            Dictionary with live entries, payload bytes, slots and slot size
+        """
+        now = time.time()
+        entries = 0
+        payload_bytes = 0
+        for index in range(self.slots):
+            offset = _FILE_HEADER_SIZE + index * self.slot_size
+            _, _, expires_at, length, _ = _SLOT_HEADER.unpack_from(self._mmap, offset)
+            if length and now < expires_at:
+                entries += 1
+                payload_bytes += length
+        return {
+            'entries': entries,
+            'bytes': payload_bytes,
+            'slots': self.slots,
+            'slot_size': self.slot_size,
+        }
+
+    def close(self) -> None:
+        """
+        Unmap and close the backing file
+        """
+        self._mmap.close()
+        os.close(self._fd)
@@ -0,0 +1,218 @@
+"""
+Quantile Sketches
+Mergeable t-digest for streaming quantiles in constant memory
+"""
+
+import math
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional
+
+
+class TDigest:
+    """
+    Merging t-digest (Dunning & Ertl) of a stream of values
+
+    Values are buffered and periodically merged into at most about
+    `compression` * pi / 2 centroids, which are small at the tails and
+    large around the median, so extreme quantiles stay accurate. Memory
+    is bounded by the compression, whatever the number of values added.
+    Digests of disjoint parts of a stream (e.g. shards) merge into a
+    digest of the whole stream.
+    """
+
+    def __init__(self, compression: float = 100):
+        """
+        Initialize an empty digest
+
+        Args:
+            compression: Accuracy/size trade-off, roughly the number of centroids
+        """
+        self.compression = compression
+        self.min = math.inf
+        self.max = -math.inf
+        # (mean, weight) sorted by mean
+        self._centroids = []
+        self._buffer = []
+        self._count = 0.0
+
+    @property
+    def count(self) -> float:
+        """Total weight added"""
+        return self._count
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        """
+        Add a value
+
+        Args:
+            value: Value to add
+            weight: Its weight
+        """
+        if weight <= 0 or value is None or math.isnan(value):
+            return
+        self._buffer.append((value, weight))
+        self._count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def update(self, values: Iterable[float]) -> None:
+        """
+        Add several values of weight 1
+
+        Args:
+            values: Values to add
+        """
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        """
+        Merge another digest into this one
+
+        Args:
+            other: Digest to merge
+
+        Returns:
+            This digest
+        """
+        other._compress()
+        self._buffer.extend(other._centroids)
+        self._count += other._count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self) -> None:
+        """
+        Merge buffered values into the centroids
+        """
+        if not self._buffer:
+            return
+        items = sorted(self._centroids + self._buffer)
+        self._buffer = []
+        total = sum(weight for _, weight in items)
+
+        centroids = []
+        mean, weight = items[0]
+        merged = 0.0
+        limit = total * self._q_limit(0.0)
+        for item_mean, item_weight in items[1:]:
+            if merged + weight + item_weight <= limit:
+                weight += item_weight
+                mean += (item_mean - mean) * item_weight / weight
+            else:
+                merged += weight
+                centroids.append((mean, weight))
+                limit = total * self._q_limit(merged / total)
+                mean, weight = item_mean, item_weight
+        centroids.append((mean, weight))
+        self._centroids = centroids
+
+    def _q_limit(self, q: float) -> float:
+        """
+        Upper quantile a centroid starting at q may extend to (k1 scale)
+        """
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _points(self) -> List[tuple]:
+        """
+        (rank, value) points of the piecewise linear distribution function
+        """
+        self._compress()
+        points = [(0.0, self.min)]
+        cumulative = 0.0
+        for mean, weight in self._centroids:
+            points.append((cumulative + weight / 2, mean))
+            cumulative += weight
+        points.append((cumulative, self.max))
+        return points
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or None if the digest is empty
+        """
+        if not self._count:
+            return None
+        points = self._points()
+        rank = min(max(q, 0.0), 1.0) * self._count
+        ranks = [point[0] for point in points]
+        position = min(bisect_right(ranks, rank), len(points) - 1)
+        (rank1, value1), (rank2, value2) = points[position - 1], points[position]
+        if rank2 <= rank1:
+            return value2
+        return value1 + (value2 - value1) * (rank - rank1) / (rank2 - rank1)
+
+    def cdf(self, value: float) -> Optional[float]:
+        """
+        Estimate the share of values at or below a value
+
+        Args:
+            value: Value
+
+        Returns:
+            Share between 0 and 1, or None if the digest is empty
+        """
+        if not self._count:
+            return None
+        if value < self.min:
+            return 0.0
+        if value >= self.max:
+            return 1.0
+        points = self._points()
+        values = [point[1] for point in points]
+        position = bisect_right(values, value)
+        (rank1, value1), (rank2, value2) = points[position - 1], points[position]
+        if value2 <= value1:
+            return rank1 / self._count
+        return (rank1 + (rank2 - rank1) * (value - value1) / (value2 - value1)) / self._count
+
+    def to_dict(self) -> Dict:
+        """
+        Serialize the digest to JSON-compatible data
+
+        Returns:
+            Dictionary accepted by from_dict
+        """
+        self._compress()
+        return {
+            'compression': self.compression,
+            'min': self.min if self._count else None,
+            'max': self.max if self._count else None,
+            'centroids': [[mean, weight] for mean, weight in self._centroids],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TDigest':
+        """
+        Restore a digest serialized with to_dict
+
+        Args:
+            data: Serialized digest
+
+        Returns:
+            TDigest
+        """
+        digest = cls(data.get('compression', 100))
+        digest._centroids = [(mean, weight) for mean, weight in data.get('centroids', [])]
+        digest._count = sum(weight for _, weight in digest._centroids)
+        if digest._count:
+            digest.min = data['min']
+            digest.max = data['max']
+        return digest
+
+    def __len__(self) -> int:
+        """Number of centroids"""
+        self._compress()
+        return len(self._centroids)
@@ -0,0 +1,162 @@
+"""
+Weather Snapshots
+Last known weather data persisted to a local file for outages and fast startup
+"""
+
+import atexit
+import logging
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from django.conf import settings
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# File header: magic, format version, saved at (epoch seconds)
+_HEADER = struct.Struct('<8sBd')
+_MAGIC = b'WXSNAP\r\n'
+_FORMAT_VERSION = 1
+
+
+class SnapshotStore:
+    """
+    Last known cache entries of current weather and forecast
+
+    Entries are kept in memory as they are cached and written to disk at
+    most every `interval` seconds, as a small header followed by a
+    zlib-compressed pickle. Writes go to a temporary file that replaces the
+    snapshot atomically, so a crash never leaves a truncated file.
+
+    The snapshot holds pickled data and must only be writable by the app.
+    """
+
+    def __init__(self, path: str, interval: float = 300):
+        """
+        Initialize the store
+
+        Args:
+            path: Snapshot file path
+            interval: Minimum seconds between writes
+        """
+        self.path = path
+        self.interval = interval
+        self.saved_at = None
+        self._entries = {}
+        self._loaded = False
+        self._dirty = False
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Dict]:
+        """
+        Read the snapshot file once
+
+        A missing, foreign or corrupt file leaves the store empty.
+
+        Returns:
+            Dictionary of cache key -> entry
+        """
+        with self._lock:
+            if self._loaded:
+                return dict(self._entries)
+            self._loaded = True
+            try:
+                with open(self.path, 'rb') as snapshot_file:
+                    content = snapshot_file.read()
+                magic, version, saved_at = _HEADER.unpack_from(content)
+                if magic != _MAGIC or version != _FORMAT_VERSION:
+                    raise ValueError("unknown snapshot format")
+                entries = pickle.loads(zlib.decompress(content[_HEADER.size:]))
+            except FileNotFoundError:
+                return {}
+            except Exception as e:
+                logger.warning("Ignoring unreadable weather snapshot {}: {}".format(self.path, str(e)))
+                return {}
+            # Entries cached since startup are newer than the file
+            for key, entry in entries.items():
+                self._entries.setdefault(key, entry)
+            self.saved_at = saved_at
+            return dict(self._entries)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Get the last known entry
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Entry with 'data', 'timestamp', 'expires_at' and 'version', or None
+        """
+        return self.load().get(key)
+
+    def update(self, key: str, entry: Dict) -> None:
+        """
+        Record a freshly cached entry, writing the file if the interval passed
+
+        Args:
+            key: Cache key
+            entry: Cache entry
+        """
+        self.load()
+        with self._lock:
+            self._entries[key] = entry
+            self._dirty = True
+            due = time.monotonic() - self._last_write >= self.interval
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write pending entries to disk
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+            self._last_write = time.monotonic()
+
+        saved_at = time.time()
+        content = _HEADER.pack(_MAGIC, _FORMAT_VERSION, saved_at) + zlib.compress(
+            pickle.dumps(entries, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+            with os.fdopen(descriptor, 'wb') as snapshot_file:
+                snapshot_file.write(content)
+            os.replace(temporary_path, self.path)
+            self.saved_at = saved_at
+        except OSError as e:
+            logger.warning("Could not write weather snapshot {}: {}".format(self.path, str(e)))
+            with self._lock:
+                self._dirty = True
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    """
+    Get the process-wide snapshot store configured by WEATHER_SNAPSHOT_PATH
+
+    Returns:
+        SnapshotStore, or None if snapshots are disabled
+    """
+    global _store
+    path = getattr(settings, 'WEATHER_SNAPSHOT_PATH', '')
+    if not path:
+        return None
+    with _store_lock:
+        if _store is None or _store.path != path:
+            _store = SnapshotStore(path, interval=getattr(settings, 'WEATHER_SNAPSHOT_INTERVAL', 300))
+            # Keep data cached since the last write
+            atexit.register(_store.flush)
+        return _store
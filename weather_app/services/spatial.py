@@ -0,0 +1,146 @@
+"""
+Spatial Index
+Grid index of cached locations for nearest-neighbour lookups
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance between two points
+
+    Args:
+        lat1: Latitude of the first point
+        lon1: Longitude of the first point
+        lat2: Latitude of the second point
+        lon2: Longitude of the second point
+
+    Returns:
+        Distance in kilometres
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeoGridIndex:
+    """
+    Thread-safe uniform lat/lon grid of keyed points
+
+    Points are bucketed into square cells of `cell_km` along the meridian
+    (the same size in degrees of longitude), so a radius query only scans
+    the few cells overlapping its bounding box. Insertion, removal and
+    queries for radii around the cell size touch a handful of cells
+    regardless of how many points are indexed. When more than `max_points`
+    are indexed, the oldest insertions are dropped. Queries do not wrap
+    around the antimeridian.
+    """
+
+    def __init__(self, cell_km: float = 1.0, max_points: int = 100000):
+        """
+        Initialize the index
+
+        Args:
+            cell_km: Cell height in kilometres
+            max_points: Maximum number of indexed points
+        """
+        self.cell_degrees = cell_km / KM_PER_DEGREE_LAT
+        self.max_points = max_points
+        # key -> (lat, lon, cell)
+        self._points = OrderedDict()
+        # cell -> {key: (lat, lon)}
+        self._cells = {}
+        self._lock = threading.Lock()
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lon / self.cell_degrees))
+
+    def insert(self, key: str, lat: float, lon: float) -> None:
+        """
+        Add or move a point
+
+        Args:
+            key: Point key
+            lat: Latitude
+            lon: Longitude
+        """
+        cell = self._cell(lat, lon)
+        with self._lock:
+            self._discard(key)
+            self._points[key] = (lat, lon, cell)
+            self._cells.setdefault(cell, {})[key] = (lat, lon)
+            while len(self._points) > self.max_points:
+                self._discard(next(iter(self._points)))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._points
+
+    def remove(self, key: str) -> None:
+        """
+        Remove a point if present
+
+        Args:
+            key: Point key
+        """
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key: str) -> None:
+        point = self._points.pop(key, None)
+        if point is None:
+            return
+        cell_points = self._cells[point[2]]
+        del cell_points[key]
+        if not cell_points:
+            del self._cells[point[2]]
+
+    def within(self, lat: float, lon: float, radius_km: float) -> List[Tuple[float, str]]:
+        """
+        Find points within a radius, nearest first
+
+        Args:
+            lat: Latitude of the query point
+            lon: Longitude of the query point
+            radius_km: Search radius in kilometres
+
+        Returns:
+            List of (distance in km, key)
+        """
+        lat_span = radius_km / KM_PER_DEGREE_LAT
+        cos_lat = max(math.cos(math.radians(min(89.9, abs(lat) + lat_span))), 1e-6)
+        lon_span = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+        min_row, min_col = self._cell(lat - lat_span, lon - lon_span)
+        max_row, max_col = self._cell(lat + lat_span, lon + lon_span)
+
+        matches = []
+        with self._lock:
+            for row in range(min_row, max_row + 1):
+                for col in range(min_col, max_col + 1):
+                    for key, (point_lat, point_lon) in self._cells.get((row, col), {}).items():
+                        distance = haversine_km(lat, lon, point_lat, point_lon)
+                        if distance <= radius_km:
+                            matches.append((distance, key))
+        matches.sort()
+        return matches
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def stats(self) -> Dict:
+        """
+        Get index statistics
+
+        Returns:
+            Dictionary with points and occupied cells
+        """
+        with self._lock:
+            return {'points': len(self._points), 'cells': len(self._cells)}
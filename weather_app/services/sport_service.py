@@ -5,6 +5,8 @@ Evaluates weather conditions to recommend suitable outdoor sports
 
 from typing import Dict, List, Optional, Tuple
 
+from .timing import stage
+
 
 class SportRecommendationService:
     """Service for generating sport recommendations based on weather conditions"""
@@ -32,7 +34,8 @@ class SportRecommendationService:
         Args:
             custom_thresholds: Optional custom thresholds to override defaults
         """
-        self.thresholds = self.DEFAULT_THRESHOLDS.copy()
+        # Copy per sport, so custom values never leak into the defaults
+        self.thresholds = {sport: dict(values) for sport, values in self.DEFAULT_THRESHOLDS.items()}
         if custom_thresholds:
             for sport, values in custom_thresholds.items():
                 if sport in self.thresholds:
@@ -51,6 +54,35 @@ class SportRecommendationService:
         Returns:
             Tuple of (is_recommended: bool, reasons: List[str])
         """
+        with stage('sport_eval'):
+            return self._evaluate_sport(sport, weather_data)
+    
+    def is_suitable(self, sport: str, weather_data: Dict) -> bool:
+        """
+        Check if conditions are suitable for a sport, without reasons
+        
+        Gives the same verdict as evaluate_sport, but builds no reason texts
+        and records no timing, for bulk evaluation such as exports and
+        backtests.
+        
+        Args:
+            sport: Name of the sport
+            weather_data: Dictionary containing temperature, wind_speed, and rain
+            
+        Returns:
+            True if the sport is recommended
+        """
+        thresholds = self.thresholds.get(sport)
+        if thresholds is None:
+            return False
+        return (thresholds['temp_min'] <= weather_data.get('temperature', 0) <= thresholds['temp_max']
+                and weather_data.get('wind_speed', 0) <= thresholds['wind_max']
+                and weather_data.get('rain', 0) <= thresholds['rain_max'])
+    
+    def _evaluate_sport(self, sport: str, weather_data: Dict) -> Tuple[bool, List[str]]:
+        """
+        Evaluate a sport without timing instrumentation (see evaluate_sport)
+        """
         if sport not in self.thresholds:
             return False, [f"Unknown sport: {sport}"]
         
@@ -138,18 +170,26 @@ class SportRecommendationService:
         Generate sport recommendations for forecast periods
         
         Args:
-            forecast_data: List of weather dictionaries for each forecast period
+            forecast_data: List of weather dictionaries for each forecast period,
+                usually the hourly series with precipitation in mm/h
             
         Returns:
             List of recommendation dictionaries for each period
         """
+        with stage('sport_forecast'):
+            return self._get_recommendations_for_forecast(forecast_data)
+    
+    def _get_recommendations_for_forecast(self, forecast_data: List[Dict]) -> List[Dict]:
+        """
+        Generate forecast recommendations without timing instrumentation
+        """
         forecast_recommendations = []
         
         for period in forecast_data:
             weather = {
                 'temperature': period.get('temperature', 0),
                 'wind_speed': period.get('wind_speed', 0),
-                'rain': period.get('rain', 0)
+                'rain': period.get('rain', period.get('precipitation', 0))
             }
             
             recommendations = self.get_recommendations(weather)
@@ -0,0 +1,153 @@
+"""
+Stage Timing
+Lightweight per-stage latency instrumentation for the request pipeline
+"""
+
+import time
+from contextvars import ContextVar
+from typing import List, Tuple
+
+from .metrics import STAGE_DURATION
+
+_enabled = False
+
+# Per-request timings: stage name -> [total seconds, count]
+_request_timings = ContextVar('weather_stage_timings', default=None)
+
+
+class _Stage:
+    """Context manager timing one stage"""
+
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullStage:
+    """No-op context manager used while timing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def configure(enabled: bool) -> None:
+    """
+    Enable or disable stage timing
+
+    Args:
+        enabled: Whether stages are timed
+    """
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled() -> bool:
+    """
+    Check whether stage timing is enabled
+
+    Returns:
+        True if stages are timed
+    """
+    return _enabled
+
+
+def stage(name: str):
+    """
+    Time a pipeline stage
+
+    Usage:
+        with stage('render'):
+            ...
+
+    When timing is disabled this returns a shared no-op context manager.
+
+    Args:
+        name: Stage name (a Server-Timing token, e.g. 'upstream_current')
+
+    Returns:
+        Context manager timing the enclosed block
+    """
+    if not _enabled:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def record(name: str, seconds: float) -> None:
+    """
+    Record a stage duration in the stage histogram and the current request
+
+    Args:
+        name: Stage name
+        seconds: Duration in seconds
+    """
+    STAGE_DURATION.observe(seconds, stage=name)
+
+    timings = _request_timings.get()
+    if timings is not None:
+        entry = timings.get(name)
+        if entry is None:
+            timings[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+
+def start_request():
+    """
+    Start collecting stage timings for the current request
+
+    Returns:
+        Token to pass to finish_request()
+    """
+    return _request_timings.set({})
+
+
+def finish_request(token) -> List[Tuple[str, float, int]]:
+    """
+    Stop collecting stage timings for the current request
+
+    Args:
+        token: Token returned by start_request()
+
+    Returns:
+        List of (stage name, total seconds, count) in first-seen order
+    """
+    timings = _request_timings.get() or {}
+    _request_timings.reset(token)
+    return [(name, entry[0], entry[1]) for name, entry in timings.items()]
+
+
+def format_server_timing(timings: List[Tuple[str, float, int]]) -> str:
+    """
+    Format stage timings as a Server-Timing header value
+
+    Args:
+        timings: List of (stage name, total seconds, count)
+
+    Returns:
+        Header value, e.g. 'render;dur=1.234, sport_eval;dur=0.051;desc="2x"'
+    """
+    metrics = []
+    for name, seconds, count in timings:
+        metric = "{};dur={:.3f}".format(name, seconds * 1000)
+        if count > 1:
+            metric += ';desc="{}x"'.format(count)
+        metrics.append(metric)
+    return ', '.join(metrics)
@@ -3,10 +3,25 @@ Weather Service for OpenWeatherMap API Integration
 Handles API calls, data parsing, caching, and error handling
 """
 
+import hashlib
+import json
+import logging
 import requests
 from datetime import datetime, timedelta
 from django.conf import settings
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
+
+from .aggregates import summarize_forecast
+from .cache import LRUCache, TieredCache
+from .interpolation import interpolate_forecast
+from .metrics import CACHE_REQUESTS, STALE_SERVES
+from .providers import HedgedProvider, OpenMeteoProvider, OpenWeatherMapProvider, WeatherProvider
+from .shared_cache import SharedMemoryCache
+from .snapshot import get_snapshot_store
+from .spatial import GeoGridIndex
+from .timing import stage
+
+logger = logging.getLogger(__name__)
 
 
 class WeatherService:
@@ -17,142 +32,461 @@ class WeatherService:
     # Reinach BL, Switzerland coordinates
     REINACH_LAT = 47.4953
     REINACH_LON = 7.5965
+    LOCATION_NAME = "Reinach, CH"
+    
+    # Cache keys for the cached endpoints
+    CURRENT_CACHE_KEY = "current_weather"
+    FORECAST_CACHE_KEY = "forecast_24h"
+    CHART_CACHE_KEY = "forecast_chart"
+    HOURLY_CACHE_KEY = "forecast_hourly"
+    SUMMARY_CACHE_KEY = "forecast_summary"
+    
+    # Shortest data-derived cache lifetime, so an update expected any
+    # moment is not polled on every request
+    MIN_CACHE_DURATION = timedelta(minutes=1)
     
-    def __init__(self):
+    # In-memory cache shared by all instances in the process, so that
+    # per-request service instances still benefit from earlier fetches
+    # (created on first use, see _get_shared_cache)
+    _shared_cache = None
+    
+    # Callbacks notified when a cached entry changes: callback(key, data, version)
+    _update_listeners = []
+    
+    # Spatial index of cached locations per endpoint cache key. It is kept
+    # per process even when the cache is shared: entries other processes
+    # fetched join it on their first exact hit here, and keys whose entry
+    # is gone (expired, evicted or cleared elsewhere) are dropped on lookup
+    _location_indexes = {}
+    
+    def __init__(self, nearby_radius_km: Optional[float] = None):
+        """
+        Initialize the service
+        
+        Args:
+            nearby_radius_km: Radius of nearby cache reuse, defaults to WEATHER_NEARBY_RADIUS_KM
+        """
         self.api_key = settings.OPENWEATHER_API_KEY
-        self.base_url = "https://api.openweathermap.org/data/2.5"
+        self.base_url = getattr(settings, 'OPENWEATHER_BASE_URL', "https://api.openweathermap.org/data/2.5")
+        
+        # OpenWeatherMap, optionally hedged with a secondary provider
+        self._openweathermap = OpenWeatherMapProvider(self.api_key, self.base_url)
+        self.provider = self._build_provider()
+        
+        # Bounded in-memory cache
+        self._cache = self._get_shared_cache()
+        
+        # Fixed TTL override; by default TTLs follow the data timestamps
+        fixed_duration = getattr(settings, 'WEATHER_CACHE_DURATION', None)
+        self._cache_duration = timedelta(seconds=fixed_duration) if fixed_duration else None
+        
+        # Last known data for outages (WEATHER_SNAPSHOT_PATH)
+        self._snapshot = get_snapshot_store()
         
-        # Simple in-memory cache
-        self._cache = {}
-        self._cache_duration = timedelta(minutes=10)
+        # Reuse of data cached for nearby locations
+        if nearby_radius_km is None:
+            nearby_radius_km = getattr(settings, 'WEATHER_NEARBY_RADIUS_KM', 1.0)
+        self._nearby_radius_km = nearby_radius_km
+        self._nearby_max_age = timedelta(seconds=getattr(settings, 'WEATHER_NEARBY_MAX_AGE', 900))
+        
+        # Cache entry (key, distance) that served the last lookup per endpoint
+        self._sources = {}
     
-    def get_current_weather(self, location: str = None) -> Optional[Dict]:
+    def get_current_weather(self, location=None) -> Optional[Dict]:
         """
-        Get current weather data for Reinach BL
+        Get current weather data
         
         Args:
-            location: Not used, defaults to Reinach BL
+            location: (lat, lon) tuple or "lat,lon" string, defaults to Reinach BL
             
         Returns:
-            Dictionary with current weather data or None if error
+            Dictionary with current weather data or None if error. Data
+            reused from a nearby location carries 'source_distance_km'.
+            
+        Raises:
+            ValueError: If the location cannot be parsed
+        """
+        lat, lon = self._resolve_location(location)
+        cache_key = self._location_cache_key(self.CURRENT_CACHE_KEY, lat, lon)
+        
+        # Check cache first, then cached observations close by
+        with stage('cache_lookup'):
+            source_key, entry, distance = self._find_entry(self.CURRENT_CACHE_KEY, cache_key, lat, lon)
+        if entry is not None:
+            CACHE_REQUESTS.inc(key=self.CURRENT_CACHE_KEY, result='hit' if distance is None else 'nearby')
+            self._sources[self.CURRENT_CACHE_KEY] = (source_key, distance)
+            if distance is None:
+                return entry['data']
+            return dict(entry['data'], source_distance_km=round(distance, 3))
+        CACHE_REQUESTS.inc(key=self.CURRENT_CACHE_KEY, result='miss')
+        self._sources[self.CURRENT_CACHE_KEY] = (cache_key, None)
+        
+        # Single flight: one caller fetches, concurrent callers (in this and,
+        # with a shared backend, other processes) wait and reuse its result
+        with self._cache.lock(cache_key):
+            entry = self._get_valid_entry(cache_key)
+            if entry is not None:
+                return entry['data']
+            
+            try:
+                parsed_data = self.provider.fetch_current(lat, lon)
+                
+                # Cache the result until the next observation is expected
+                self._update_cache(cache_key, parsed_data, self._current_ttl(parsed_data))
+                self._index_location(self.CURRENT_CACHE_KEY, cache_key, lat, lon)
+                
+                return parsed_data
+                
+            except requests.exceptions.RequestException as e:
+                self._handle_api_error(e)
+                return self._serve_snapshot(cache_key)
+    
+    def get_forecast_24h(self, location=None) -> Optional[List[Dict]]:
         """
-        cache_key = "current_weather"
+        Get 24-hour forecast
         
-        # Check cache first
-        if self._is_cache_valid(cache_key):
-            return self._cache[cache_key]['data']
+        A forecast cached for a nearby location may be returned instead;
+        get_source() reports its distance.
         
-        try:
-            url = f"{self.base_url}/weather"
-            params = {
-                'lat': self.REINACH_LAT,
-                'lon': self.REINACH_LON,
-                'appid': self.api_key,
-                'units': 'metric'
-            }
+        Args:
+            location: (lat, lon) tuple or "lat,lon" string, defaults to Reinach BL
+            
+        Returns:
+            List of forecast data dictionaries or None if error
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
+        Raises:
+            ValueError: If the location cannot be parsed
+        """
+        lat, lon = self._resolve_location(location)
+        cache_key = self._location_cache_key(self.FORECAST_CACHE_KEY, lat, lon)
+        
+        # Check cache first, then cached forecasts close by
+        with stage('cache_lookup'):
+            source_key, entry, distance = self._find_entry(self.FORECAST_CACHE_KEY, cache_key, lat, lon)
+        if entry is not None:
+            CACHE_REQUESTS.inc(key=self.FORECAST_CACHE_KEY, result='hit' if distance is None else 'nearby')
+            self._sources[self.FORECAST_CACHE_KEY] = (source_key, distance)
+            return entry['data']
+        CACHE_REQUESTS.inc(key=self.FORECAST_CACHE_KEY, result='miss')
+        self._sources[self.FORECAST_CACHE_KEY] = (cache_key, None)
+        
+        # Single flight: one caller fetches, concurrent callers (in this and,
+        # with a shared backend, other processes) wait and reuse its result
+        with self._cache.lock(cache_key):
+            entry = self._get_valid_entry(cache_key)
+            if entry is not None:
+                return entry['data']
             
-            data = response.json()
-            parsed_data = self._parse_current_weather(data)
+            try:
+                # 8 x 3-hour intervals = 24 hours
+                parsed_data = self.provider.fetch_forecast(lat, lon, periods=8)
+                
+                # Cache the result together with its hourly series, chart
+                # payload and aggregates until the next model run is published
+                ttl = self._forecast_ttl(parsed_data)
+                self._update_cache(cache_key, parsed_data, ttl)
+                self._cache_forecast_derived(cache_key, parsed_data, ttl)
+                self._index_location(self.FORECAST_CACHE_KEY, cache_key, lat, lon)
+                
+                return parsed_data
+                
+            except requests.exceptions.RequestException as e:
+                self._handle_api_error(e)
+                return self._serve_snapshot(cache_key)
+    
+    def get_forecast_chart_json(self, location=None) -> Optional[str]:
+        """
+        Get the forecast as a serialized columnar chart payload
+        
+        The payload is built once when the forecast is cached and reused
+        for every request until the forecast expires.
+        
+        Args:
+            location: (lat, lon) tuple or "lat,lon" string, defaults to Reinach BL
             
-            # Cache the result
-            self._update_cache(cache_key, parsed_data)
+        Returns:
+            JSON string of the chart payload or None if error
+        """
+        return self._get_forecast_derived(self.CHART_CACHE_KEY, location)
+    
+    def get_forecast_hourly(self, location=None) -> Optional[List[Dict]]:
+        """
+        Get the 24-hour forecast interpolated to hourly steps
+        
+        The series is computed once when the forecast is cached (see
+        interpolate_forecast); 'precipitation' is in mm per hour.
+        
+        Args:
+            location: (lat, lon) tuple or "lat,lon" string, defaults to Reinach BL
             
-            return parsed_data
+        Returns:
+            List of hourly forecast dictionaries or None if error
+        """
+        return self._get_forecast_derived(self.HOURLY_CACHE_KEY, location)
+    
+    def get_forecast_summary(self, location=None) -> Optional[Dict]:
+        """
+        Get per-day and whole-forecast aggregates of the 24-hour forecast
+        
+        The aggregates are computed once when the forecast is cached (see
+        summarize_forecast).
+        
+        Args:
+            location: (lat, lon) tuple or "lat,lon" string, defaults to Reinach BL
             
-        except requests.exceptions.RequestException as e:
-            return self._handle_api_error(e)
+        Returns:
+            Dictionary with 'period' and 'days' aggregates or None if error
+        """
+        return self._get_forecast_derived(self.SUMMARY_CACHE_KEY, location)
     
-    def get_forecast_24h(self, location: str = None) -> Optional[List[Dict]]:
+    def _get_forecast_derived(self, key: str, location):
         """
-        Get 24-hour forecast for Reinach BL
+        Get data derived from the forecast, rebuilding it if missing
         
         Args:
-            location: Not used, defaults to Reinach BL
+            key: CHART_CACHE_KEY, HOURLY_CACHE_KEY or SUMMARY_CACHE_KEY
+            location: (lat, lon) tuple or "lat,lon" string, defaults to Reinach BL
             
         Returns:
-            List of forecast data dictionaries or None if error
+            Derived data or None if error
+        """
+        lat, lon = self._resolve_location(location)
+        derived_key = self._derived_key(self._location_cache_key(self.FORECAST_CACHE_KEY, lat, lon), key)
+        entry = self._get_valid_entry(derived_key)
+        if entry is not None:
+            CACHE_REQUESTS.inc(key=key, result='hit')
+            self._sources[key] = (derived_key, None)
+            return entry['data']
+        CACHE_REQUESTS.inc(key=key, result='miss')
+        
+        forecast = self.get_forecast_24h((lat, lon))
+        if forecast is None:
+            return None
+        
+        # Forecast was served from cache (possibly of a nearby location)
+        # but its derived entry is missing
+        forecast_key, distance = self._sources[self.FORECAST_CACHE_KEY]
+        self._sources[key] = (self._derived_key(forecast_key, key), distance)
+        entry = self._get_valid_entry(self._derived_key(forecast_key, key))
+        if entry is None:
+            forecast_entry = self._get_valid_entry(forecast_key) or {}
+            ttl = forecast_entry['expires_at'] - datetime.now() if forecast_entry else self.MIN_CACHE_DURATION
+            return self._cache_forecast_derived(forecast_key, forecast, ttl, forecast_entry.get('stale_since'))[key]
+        
+        return entry['data']
+    
+    def get_source(self, key: str):
+        """
+        Get the cache entry that served the last lookup of an endpoint
+        
+        Args:
+            key: CURRENT_CACHE_KEY, FORECAST_CACHE_KEY or a key derived from the forecast
+            
+        Returns:
+            Tuple (cache key, distance in km or None if it was the requested location)
+        """
+        return self._sources.get(key, (key, None))
+    
+    def get_stale_since(self, key: str) -> Optional[datetime]:
         """
-        cache_key = "forecast_24h"
+        Get when the data of the last lookup of an endpoint was fetched, if it is stale
         
-        # Check cache first
-        if self._is_cache_valid(cache_key):
-            return self._cache[cache_key]['data']
+        Args:
+            key: CURRENT_CACHE_KEY, FORECAST_CACHE_KEY or a key derived from the forecast
+            
+        Returns:
+            Fetch time of snapshot data served during an outage, or None
+            if the data is fresh
+        """
+        entry = self._cache.get(self.get_source(key)[0])
+        if entry is None or not entry.get('stale'):
+            return None
+        return entry.get('stale_since', entry['timestamp'])
+    
+    def _resolve_location(self, location) -> tuple:
+        """
+        Convert a location argument into coordinates
         
-        try:
-            url = f"{self.base_url}/forecast"
-            params = {
-                'lat': self.REINACH_LAT,
-                'lon': self.REINACH_LON,
-                'appid': self.api_key,
-                'units': 'metric',
-                'cnt': 8  # 8 x 3-hour intervals = 24 hours
-            }
+        Args:
+            location: None, (lat, lon) tuple or "lat,lon" string
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
+        Returns:
+            Tuple (lat, lon) rounded to 4 decimals (about 10 m)
             
-            data = response.json()
-            parsed_data = self._parse_forecast(data)
+        Raises:
+            ValueError: If the location cannot be parsed or is out of range
+        """
+        if location is None:
+            return self.REINACH_LAT, self.REINACH_LON
+        if isinstance(location, str):
+            location = location.split(',')
+        lat, lon = (round(float(value), 4) for value in location)
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError("Coordinates out of range: {}, {}".format(lat, lon))
+        return lat, lon
+    
+    def _location_cache_key(self, key: str, lat: float, lon: float) -> str:
+        """
+        Get the cache key of an endpoint for a location
+        
+        Reinach BL keeps the plain key, which the ETags, page cache and live
+        updates refer to.
+        
+        Args:
+            key: Endpoint cache key
+            lat: Latitude
+            lon: Longitude
+            
+        Returns:
+            Cache key
+        """
+        if (lat, lon) == (self.REINACH_LAT, self.REINACH_LON):
+            return key
+        return "{}@{:.4f},{:.4f}".format(key, lat, lon)
+    
+    @classmethod
+    def split_cache_key(cls, cache_key: str) -> tuple:
+        """
+        Split a cache key into its endpoint key and location
+        
+        Args:
+            cache_key: Cache key, e.g. "current_weather" or "forecast_24h@47.5596,7.5886"
+            
+        Returns:
+            Tuple (endpoint cache key, lat, lon)
+        """
+        key, _, coordinates = cache_key.partition('@')
+        if not coordinates:
+            return key, cls.REINACH_LAT, cls.REINACH_LON
+        lat, lon = (float(value) for value in coordinates.split(','))
+        return key, lat, lon
+    
+    def _derived_key(self, forecast_key: str, key: str) -> str:
+        """
+        Get the cache key of data derived from a forecast cache key
+        
+        Args:
+            forecast_key: Forecast cache key
+            key: CHART_CACHE_KEY, HOURLY_CACHE_KEY or SUMMARY_CACHE_KEY
             
-            # Cache the result
-            self._update_cache(cache_key, parsed_data)
+        Returns:
+            Cache key of the derived data for the same location
+        """
+        return forecast_key.replace(self.FORECAST_CACHE_KEY, key, 1)
+    
+    def _cache_forecast_derived(self, forecast_key: str, forecasts: List[Dict], ttl: timedelta,
+                                stale_since: Optional[datetime] = None, notify: bool = True) -> Dict:
+        """
+        Derive and cache the hourly series, chart payload and aggregates of a forecast
+        
+        Args:
+            forecast_key: Forecast cache key
+            forecasts: Parsed forecast data
+            ttl: Time to live of the forecast
+            stale_since: Fetch time of a stale forecast served from the snapshot
+            notify: Whether update listeners are told about the derived data
             
-            return parsed_data
+        Returns:
+            Dictionary of derived data by CHART_CACHE_KEY, HOURLY_CACHE_KEY
+            and SUMMARY_CACHE_KEY
+        """
+        with stage('interpolate'):
+            hourly = interpolate_forecast(forecasts)
+        with stage('chart_json'):
+            chart_json = self._build_chart_json(hourly)
+        with stage('aggregate'):
+            summary = summarize_forecast(forecasts)
+        
+        derived = {
+            self.HOURLY_CACHE_KEY: hourly,
+            self.CHART_CACHE_KEY: chart_json,
+            self.SUMMARY_CACHE_KEY: summary,
+        }
+        for key, data in derived.items():
+            self._update_cache(self._derived_key(forecast_key, key), data, ttl, stale_since, notify)
+        return derived
+    
+    def _build_chart_json(self, forecasts: List[Dict]) -> str:
+        """
+        Build the columnar chart payload for a forecast series
+        
+        Instead of one object per period, the payload holds one array per
+        series plus the first timestamp and the step between periods (in
+        epoch seconds). Explicit timestamps are only included when the
+        periods are not evenly spaced.
+        
+        Args:
+            forecasts: Forecast data, usually the hourly series
             
-        except requests.exceptions.RequestException as e:
-            return self._handle_api_error(e)
+        Returns:
+            Compact JSON string of the chart payload
+        """
+        timestamps = [int(item['timestamp'].timestamp()) for item in forecasts]
+        steps = set(b - a for a, b in zip(timestamps, timestamps[1:]))
+        
+        payload = {
+            't0': timestamps[0] if timestamps else None,
+            'step': steps.pop() if len(steps) == 1 else None,
+            'temperature': [round(item['temperature'], 2) for item in forecasts],
+            'wind_speed': [round(item['wind_speed'], 2) for item in forecasts],
+            'precipitation': [round(item['precipitation'], 2) for item in forecasts],
+            'humidity': [item['humidity'] for item in forecasts],
+        }
+        if payload['step'] is None and len(timestamps) > 1:
+            payload['timestamps'] = timestamps
+        
+        return json.dumps(payload, separators=(',', ':'))
+    
+    def _build_provider(self) -> WeatherProvider:
+        """
+        Create the weather provider from the settings
+        
+        With WEATHER_SECONDARY_PROVIDER set ('openmeteo'), OpenWeatherMap
+        calls slower than its recent p95 latency are hedged to the secondary
+        provider.
+        
+        Returns:
+            OpenWeatherMapProvider or HedgedProvider
+        """
+        secondary_name = getattr(settings, 'WEATHER_SECONDARY_PROVIDER', '')
+        if not secondary_name:
+            return self._openweathermap
+        
+        if secondary_name != 'openmeteo':
+            raise ValueError("Unknown secondary weather provider: {}".format(secondary_name))
+        secondary = OpenMeteoProvider(
+            base_url=getattr(settings, 'OPENMETEO_BASE_URL', "https://api.open-meteo.com/v1"),
+            location_name=self.LOCATION_NAME
+        )
+        return HedgedProvider(
+            self._openweathermap,
+            secondary,
+            default_delay=getattr(settings, 'WEATHER_HEDGE_DELAY', 0.5)
+        )
     
     def _parse_current_weather(self, data: Dict) -> Dict:
         """
         Parse current weather API response
         
         Args:
-            data: Raw API response
+            data: Raw OpenWeatherMap API response
             
         Returns:
             Parsed weather data
         """
-        return {
-            'temperature': data['main']['temp'],
-            'feels_like': data['main']['feels_like'],
-            'humidity': data['main']['humidity'],
-            'wind_speed': data['wind']['speed'] * 3.6,  # Convert m/s to km/h
-            'precipitation': data.get('rain', {}).get('1h', 0),  # mm in last hour
-            'description': data['weather'][0]['description'],
-            'icon': data['weather'][0]['icon'],
-            'timestamp': datetime.fromtimestamp(data['dt']),
-            'location': f"{data['name']}, {data['sys']['country']}"
-        }
+        return self._openweathermap.parse_current(data)
     
     def _parse_forecast(self, data: Dict) -> List[Dict]:
         """
         Parse forecast API response
         
         Args:
-            data: Raw API response
+            data: Raw OpenWeatherMap API response
             
         Returns:
             List of parsed forecast data
         """
-        forecasts = []
-        
-        for item in data['list']:
-            forecast = {
-                'timestamp': datetime.fromtimestamp(item['dt']),
-                'temperature': item['main']['temp'],
-                'feels_like': item['main']['feels_like'],
-                'humidity': item['main']['humidity'],
-                'wind_speed': item['wind']['speed'] * 3.6,  # Convert m/s to km/h
-                'precipitation': item.get('rain', {}).get('3h', 0),  # mm in 3 hours
-                'description': item['weather'][0]['description'],
-                'icon': item['weather'][0]['icon']
-            }
-            forecasts.append(forecast)
-        
-        return forecasts
+        return self._openweathermap.parse_forecast(data)
     
     def _handle_api_error(self, error: Exception) -> None:
         """
@@ -165,19 +499,122 @@ class WeatherService:
             None to indicate error
         """
         if isinstance(error, requests.exceptions.Timeout):
-            print(f"API timeout error: {error}")
+            logger.warning("API timeout error: {}".format(error))
         elif isinstance(error, requests.exceptions.HTTPError):
             if error.response.status_code == 401:
-                print("Invalid API key")
+                logger.error("Invalid API key")
             elif error.response.status_code == 429:
-                print("API rate limit exceeded")
+                logger.warning("API rate limit exceeded")
             else:
-                print(f"HTTP error: {error.response.status_code}")
+                logger.warning("HTTP error: {}".format(error.response.status_code))
         else:
-            print(f"API request failed: {error}")
+            logger.warning("API request failed: {}".format(error))
         
         return None
     
+    @classmethod
+    def _get_shared_cache(cls):
+        """
+        Get the process-wide cache, creating it on first use
+        
+        The in-process cache is bounded by WEATHER_CACHE_MAX_ENTRIES and
+        WEATHER_CACHE_MAX_BYTES. When WEATHER_SHARED_CACHE_PATH is set, it
+        becomes the L1 tier in front of a memory-mapped cache shared by all
+        worker processes on the host.
+        
+        Returns:
+            LRUCache, or TieredCache with a shared-memory backend
+        """
+        if WeatherService._shared_cache is None:
+            cache = LRUCache(
+                max_entries=getattr(settings, 'WEATHER_CACHE_MAX_ENTRIES', 256),
+                max_bytes=getattr(settings, 'WEATHER_CACHE_MAX_BYTES', 8 * 1024 * 1024),
+                name='weather'
+            )
+            shared_path = getattr(settings, 'WEATHER_SHARED_CACHE_PATH', None)
+            if shared_path:
+                cache = TieredCache(
+                    cache,
+                    SharedMemoryCache(shared_path, settings.SECRET_KEY.encode('utf-8')),
+                    l1_ttl=getattr(settings, 'WEATHER_SHARED_CACHE_L1_TTL', 5.0)
+                )
+            WeatherService._shared_cache = cache
+        return WeatherService._shared_cache
+    
+    def _find_entry(self, base_key: str, cache_key: str, lat: float, lon: float):
+        """
+        Find a valid cache entry for a location or a location close by
+        
+        Nearby entries must lie within WEATHER_NEARBY_RADIUS_KM and be
+        younger than WEATHER_NEARBY_MAX_AGE seconds; the nearest one wins.
+        Only locations in this process' index are considered nearby (see
+        _location_indexes).
+        
+        Args:
+            base_key: Endpoint cache key
+            cache_key: Cache key of the requested location
+            lat: Latitude
+            lon: Longitude
+            
+        Returns:
+            Tuple (cache key, entry, distance in km); the distance is None
+            for an exact hit and the entry None if nothing was found
+        """
+        entry = self._get_valid_entry(cache_key)
+        index = self._location_indexes.get(base_key)
+        if entry is not None:
+            if self._nearby_radius_km > 0 and (index is None or cache_key not in index):
+                # Fetched by another process sharing the cache
+                self._index_location(base_key, cache_key, lat, lon)
+            return cache_key, entry, None
+        if self._nearby_radius_km <= 0:
+            return cache_key, None, None
+        
+        if index is None:
+            return cache_key, None, None
+        
+        oldest = datetime.now() - self._nearby_max_age
+        for distance, key in index.within(lat, lon, self._nearby_radius_km):
+            entry = self._get_valid_entry(key)
+            if entry is None:
+                # Expired or evicted
+                index.remove(key)
+            elif entry['timestamp'] >= oldest and not entry.get('stale'):
+                return key, entry, distance
+        return cache_key, None, None
+    
+    def _index_location(self, base_key: str, cache_key: str, lat: float, lon: float) -> None:
+        """
+        Add a freshly cached location to the spatial index
+        
+        Args:
+            base_key: Endpoint cache key
+            cache_key: Cache key of the location
+            lat: Latitude
+            lon: Longitude
+        """
+        index = self._location_indexes.get(base_key)
+        if index is None:
+            index = WeatherService._location_indexes.setdefault(
+                base_key, GeoGridIndex(cell_km=max(self._nearby_radius_km, 0.1))
+            )
+        index.insert(cache_key, lat, lon)
+    
+    def _get_valid_entry(self, key: str) -> Optional[Dict]:
+        """
+        Get a cache entry if it is still valid
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Entry with 'data', 'timestamp', 'expires_at' and 'version', or None if missing or expired
+        """
+        entry = self._cache.get(key)
+        if entry is None or datetime.now() >= entry['expires_at']:
+            return None
+        return entry
+    
     def _is_cache_valid(self, key: str) -> bool:
         """
         Check if cached data is still valid
@@ -188,21 +625,244 @@ class WeatherService:
         Returns:
             True if cache is valid, False otherwise
         """
-        if key not in self._cache:
-            return False
+        return self._get_valid_entry(key) is not None
+    
+    def _current_ttl(self, current: Dict) -> timedelta:
+        """
+        Get how long current weather stays fresh
+        
+        Observations are cached until the next one is expected, based on
+        the observation time reported by the upstream and the provider's
+        observation interval. When that time has already passed, the
+        upstream is late (OpenWeatherMap observations are often older than
+        the interval), and the TTL backs off in proportion to how late it
+        is, up to the interval, instead of polling every minute.
         
-        cached_time = self._cache[key]['timestamp']
-        return datetime.now() - cached_time < self._cache_duration
+        Args:
+            current: Parsed current weather
+            
+        Returns:
+            Time to live
+        """
+        if self._cache_duration:
+            return self._cache_duration
+        interval = self.provider.observation_interval
+        now = datetime.now()
+        next_update = current['timestamp'] + interval
+        if next_update <= now:
+            return self._clamp_ttl(now - next_update, interval)
+        return self._clamp_ttl(next_update - now, interval)
     
-    def _update_cache(self, key: str, data: any) -> None:
+    def _forecast_ttl(self, forecasts: List[Dict]) -> timedelta:
+        """
+        Get how long a forecast stays fresh
+        
+        The forecast is cached until the provider's next model run is
+        expected to be published. The period timestamps say nothing about
+        that; the first period usually has already started.
+        
+        Args:
+            forecasts: Parsed forecast data
+            
+        Returns:
+            Time to live
+        """
+        if self._cache_duration:
+            return self._cache_duration
+        now = datetime.now()
+        return self._clamp_ttl(self.provider.next_model_run(now) - now, self.provider.model_run_interval)
+    
+    def _clamp_ttl(self, ttl: timedelta, maximum: timedelta) -> timedelta:
+        """
+        Limit a data-derived TTL to [MIN_CACHE_DURATION, maximum]
+        
+        Args:
+            ttl: Time until the next expected update
+            maximum: Upstream update interval
+            
+        Returns:
+            Clamped time to live
+        """
+        return max(self.MIN_CACHE_DURATION, min(ttl, maximum))
+    
+    def _update_cache(self, key: str, data: any, ttl: timedelta, stale_since: Optional[datetime] = None,
+                      notify: bool = True) -> None:
         """
         Update cache with new data
         
+        Data derived from a stale snapshot entry is cached with the same
+        staleness marker; it is neither written to the snapshot nor
+        announced to update listeners.
+        
         Args:
             key: Cache key
             data: Data to cache
+            ttl: How long the data stays fresh
+            stale_since: Fetch time of the stale data it was derived from, if any
+            notify: Whether update listeners are told about a changed version
         """
-        self._cache[key] = {
+        previous = self._cache.get(key)
+        version = self._compute_version(data)
+        now = datetime.now()
+        entry = {
             'data': data,
-            'timestamp': datetime.now()
+            'timestamp': now,
+            'expires_at': now + ttl,
+            'version': version
         }
+        if stale_since is not None:
+            entry.update(stale=True, stale_since=stale_since)
+        self._cache.set(key, entry, ttl=ttl.total_seconds())
+        if stale_since is not None:
+            return
+        
+        if self._snapshot is not None and key in (self.CURRENT_CACHE_KEY, self.FORECAST_CACHE_KEY):
+            self._snapshot.update(key, entry)
+        
+        if notify and (previous is None or previous['version'] != version):
+            self._notify_update(key, data, version)
+    
+    def _serve_snapshot(self, key: str) -> Optional[any]:
+        """
+        Serve the last known data while the upstream is unreachable
+        
+        Current weather is marked with 'stale': True and 'stale_since' (the
+        time the data was fetched); for any endpoint, get_stale_since()
+        reports it. The stale data is cached for MIN_CACHE_DURATION so the
+        upstream is retried periodically rather than on every request.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Last known data, or None if there is no snapshot
+        """
+        if self._snapshot is None:
+            return None
+        entry = self._snapshot.get(key)
+        if entry is None:
+            return None
+        
+        data = entry['data']
+        if isinstance(data, dict):
+            data = dict(data, stale=True, stale_since=entry['timestamp'])
+        STALE_SERVES.inc(key=key)
+        logger.warning("Serving {} from snapshot taken at {}".format(key, entry['timestamp']))
+        
+        now = datetime.now()
+        self._cache.set(key, {
+            'data': data,
+            'timestamp': entry['timestamp'],
+            'expires_at': now + self.MIN_CACHE_DURATION,
+            'version': self._compute_version(data),
+            'stale': True,
+            'stale_since': entry['timestamp']
+        }, ttl=self.MIN_CACHE_DURATION.total_seconds())
+        return data
+    
+    def prime_from_snapshot(self) -> int:
+        """
+        Fill the cache with snapshot entries that are still fresh
+        
+        Called at startup so the first requests do not wait for the
+        upstream. Update listeners are not notified: startup runs during
+        app registry setup, where listeners must not touch the database,
+        and primed data was already announced when it was fetched.
+        
+        Returns:
+            Number of primed entries
+        """
+        if self._snapshot is None:
+            return 0
+        
+        primed = 0
+        now = datetime.now()
+        for key, entry in self._snapshot.load().items():
+            remaining = entry['expires_at'] - now
+            if remaining.total_seconds() <= 0 or self._get_valid_entry(key) is not None:
+                continue
+            self._cache.set(key, entry, ttl=remaining.total_seconds())
+            primed += 1
+            if key == self.FORECAST_CACHE_KEY:
+                self._cache_forecast_derived(key, entry['data'], remaining, notify=False)
+        return primed
+    
+    @classmethod
+    def add_update_listener(cls, callback: Callable) -> None:
+        """
+        Register a callback notified whenever a cached entry changes
+        
+        Args:
+            callback: Callable taking (key, data, version)
+        """
+        if callback not in cls._update_listeners:
+            cls._update_listeners.append(callback)
+    
+    @classmethod
+    def remove_update_listener(cls, callback: Callable) -> None:
+        """
+        Unregister a cache update callback
+        
+        Args:
+            callback: Previously registered callable
+        """
+        if callback in cls._update_listeners:
+            cls._update_listeners.remove(callback)
+    
+    def _notify_update(self, key: str, data: any, version: str) -> None:
+        """
+        Notify update listeners about a changed cache entry
+        
+        Listener errors are logged and never interrupt the fetch.
+        
+        Args:
+            key: Cache key
+            data: New data
+            version: New version
+        """
+        for callback in list(self._update_listeners):
+            try:
+                callback(key, data, version)
+            except Exception as e:
+                logger.error("Cache update listener failed for {}: {}".format(key, str(e)))
+    
+    def _compute_version(self, data: any) -> str:
+        """
+        Compute a content-derived version for cached data
+        
+        The version only changes when the data itself changes, so refetching
+        identical upstream data keeps the same version (and ETag).
+        
+        Args:
+            data: Data to version
+            
+        Returns:
+            Short hexadecimal digest of the data
+        """
+        serialized = json.dumps(data, default=str, sort_keys=True)
+        return hashlib.sha1(serialized.encode('utf-8')).hexdigest()[:16]
+    
+    def get_cache_version(self, key: str) -> Optional[str]:
+        """
+        Get the version of a valid cache entry
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Version string, or None if the entry is missing or expired
+        """
+        entry = self._get_valid_entry(key)
+        if entry is None:
+            return None
+        return entry['version']
+    
+    def clear_cache(self) -> None:
+        """
+        Remove all cached entries
+        
+        With a shared cache, other processes lose the entries too; their
+        spatial indexes drop the keys on their next lookups.
+        """
+        self._cache.clear()
+        WeatherService._location_indexes.clear()
@@ -0,0 +1,88 @@
+"""
+Static File Serving
+Serves collected static files with precompressed variants and far-future caching
+"""
+
+import mimetypes
+import os
+import re
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+# Content hash inserted by ManifestStaticFilesStorage, e.g. styles.0123456789ab.css
+HASHED_NAME_PATTERN = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+
+# Preferred encodings with the suffix of their precompressed variant
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=300'
+
+
+def _accepted_encodings(request):
+    """
+    Parse the encodings accepted by the client.
+
+    Args:
+        request: Django HTTP request object
+
+    Returns:
+        set: Accepted content codings (without q=0 entries)
+    """
+    accepted = set()
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = part.strip().partition(';')
+        if coding and params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            accepted.add(coding.lower())
+    return accepted
+
+
+@require_safe
+def serve(request, path):
+    """
+    Serve a file from STATIC_ROOT.
+
+    Picks the brotli or gzip variant written at collectstatic time when the
+    client accepts it, and marks content-hashed files as immutable.
+
+    Args:
+        request: Django HTTP request object
+        path: Path relative to STATIC_ROOT
+
+    Returns:
+        FileResponse: The (possibly precompressed) file
+    """
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except ValueError:
+        raise Http404("Invalid static path")
+    if not os.path.isfile(full_path):
+        raise Http404("Static file not found")
+
+    content_type, _ = mimetypes.guess_type(full_path)
+    accepted = _accepted_encodings(request)
+    served_path, content_encoding = full_path, None
+    for coding, suffix in ENCODINGS:
+        if coding in accepted and os.path.isfile(full_path + suffix):
+            served_path, content_encoding = full_path + suffix, coding
+            break
+
+    stat = os.stat(served_path)
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    response = FileResponse(open(served_path, 'rb'), content_type=content_type or 'application/octet-stream')
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    if content_encoding:
+        response['Content-Encoding'] = content_encoding
+    if HASHED_NAME_PATTERN.search(path):
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    else:
+        response['Cache-Control'] = DEFAULT_CACHE_CONTROL
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
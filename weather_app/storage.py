@@ -0,0 +1,82 @@
+"""
+Static Files Storage
+Hashed static files with gzip and brotli variants built at collectstatic time
+"""
+
+import gzip
+import logging
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip variants are always built
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Manifest storage that also writes precompressed variants
+
+    After the hashed files are written, a ``.gz`` (and ``.br`` when the
+    brotli package is installed) copy of every compressible hashed file is
+    stored next to it, so the server never compresses static files per
+    request.
+    """
+
+    COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.json', '.map', '.svg', '.txt', '.html', '.xml')
+
+    # Files smaller than this are not worth compressing
+    MIN_SIZE = 256
+
+    def post_process(self, paths, dry_run=False, **options):
+        """
+        Hash files as usual, then build compressed variants of the results
+
+        Yields:
+            Tuples of (original name, processed name, processed flag)
+        """
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+        if dry_run:
+            return
+
+        for name in sorted(set(self.hashed_files.values())):
+            if name.endswith(self.COMPRESSIBLE_EXTENSIONS):
+                for compressed_name in self._compress(name):
+                    yield name, compressed_name, True
+
+    def _compress(self, name):
+        """
+        Write compressed variants of a stored file
+
+        Variants that do not save at least 5% are skipped.
+
+        Args:
+            name: Stored file name
+
+        Returns:
+            List of written variant names
+        """
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < self.MIN_SIZE:
+            return []
+
+        variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(content)))
+
+        written = []
+        for suffix, compressed in variants:
+            if len(compressed) > len(content) * 0.95:
+                continue
+            compressed_name = name + suffix
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            self._save(compressed_name, ContentFile(compressed))
+            written.append(compressed_name)
+
+        return written
@@ -0,0 +1,76 @@
+"""
+Tests for the forecast aggregates
+"""
+
+from datetime import date, datetime, timedelta
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from .services.aggregates import summarize_forecast
+from .services.weather_service import WeatherService
+from .testing import WeatherServiceTestCase
+
+
+class SummarizeForecastTests(SimpleTestCase):
+    """Tests for summarize_forecast"""
+
+    def setUp(self):
+        start = datetime(2025, 10, 9, 18, 0)
+        values = [(12.0, 10.0, 0.0), (9.5, 22.0, 1.2), (7.0, 15.0, 0.4), (8.5, 18.0, 0.0)]
+        self.periods = [
+            {'timestamp': start + timedelta(hours=3 * number), 'temperature': temperature,
+             'wind_speed': wind_speed, 'precipitation': precipitation}
+            for number, (temperature, wind_speed, precipitation) in enumerate(values)
+        ]
+
+    def test_whole_forecast(self):
+        """Test the aggregate over all periods"""
+        period = summarize_forecast(self.periods)['period']
+
+        self.assertEqual((period['temp_min'], period['temp_max']), (7.0, 12.0))
+        self.assertEqual(period['precipitation_total'], 1.6)
+        self.assertEqual(period['wind_peak'], 22.0)
+        self.assertEqual(period['periods'], 4)
+        self.assertEqual(period['end'], datetime(2025, 10, 10, 3, 0))
+
+    def test_split_by_day(self):
+        """Test that periods are aggregated per local date"""
+        days = summarize_forecast(self.periods)['days']
+
+        self.assertEqual([day['date'] for day in days], [date(2025, 10, 9), date(2025, 10, 10)])
+        self.assertEqual(days[0]['temp_min'], 9.5)
+        self.assertEqual(days[1]['precipitation_total'], 0.4)
+        self.assertEqual(days[1]['wind_peak'], 18.0)
+
+    def test_empty_forecast(self):
+        """Test that an empty forecast has no summary"""
+        self.assertIsNone(summarize_forecast([]))
+
+
+class ForecastSummaryTests(WeatherServiceTestCase):
+    """Tests for the cached forecast summary"""
+
+    def test_summary_cached_with_forecast(self):
+        """Test that the summary is computed once when the forecast is cached"""
+        self.service.get_forecast_24h()
+
+        summary = WeatherService().get_forecast_summary()
+
+        self.assertIs(summary, WeatherService().get_forecast_summary())
+        self.assertEqual(summary['period']['periods'], 8)
+        self.assertEqual(len(self.upstream.calls), 1)
+
+    def test_api_forecast_includes_summary(self):
+        """Test that the forecast API returns the aggregates"""
+        response = self.client.get(reverse('api_forecast'))
+
+        summary = response.json()['summary']
+        self.assertEqual(summary['period']['temp_min'], 13.0)
+        self.assertEqual(summary['period']['temp_max'], 20.0)
+
+    def test_index_shows_summary(self):
+        """Test that the index renders the forecast range"""
+        response = self.client.get(reverse('index'))
+
+        self.assertContains(response, 'forecast-summary')
+        self.assertContains(response, '13.0 – 20.0°C')
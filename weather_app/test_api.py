@@ -0,0 +1,67 @@
+"""
+Tests for the JSON API endpoints
+"""
+
+import requests
+from django.test import TestCase, Client
+from django.urls import reverse
+from unittest.mock import patch
+
+from .services.weather_service import WeatherService
+from .testing import FakeUpstreamMixin, make_current_payload
+
+
+class ApiEndpointTests(FakeUpstreamMixin, TestCase):
+    """Tests for the /api/ endpoints"""
+
+    def setUp(self):
+        """Set up test client, fake upstream and an empty weather cache"""
+        super().setUp()
+        self.client = Client()
+
+    def test_current_returns_json_with_etag(self):
+        """Test that current weather is returned with a strong ETag"""
+        response = self.client.get(reverse('api_current'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['current_weather']['temperature'], 18.5)
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_current_not_modified(self):
+        """Test that a matching If-None-Match yields 304 without refetching"""
+        etag_value = self.client.get(reverse('api_current'))['ETag']
+
+        response = self.client.get(reverse('api_current'), HTTP_IF_NONE_MATCH=etag_value)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(len(self.upstream.calls), 1)
+
+    def test_forecast_returns_all_periods(self):
+        """Test that the forecast endpoint serves every cached period"""
+        response = self.client.get(reverse('api_forecast'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['forecast']), 8)
+
+    def test_recommendations_etag_changes_with_data(self):
+        """Test that the recommendations ETag follows the underlying data"""
+        first_etag = self.client.get(reverse('api_recommendations'))['ETag']
+
+        WeatherService().clear_cache()
+        self.upstream.current = make_current_payload(temp=30.0)
+        response = self.client.get(reverse('api_recommendations'), HTTP_IF_NONE_MATCH=first_etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first_etag)
+        self.assertIn('cycling', response.json()['current'])
+
+    def test_unavailable_returns_503(self):
+        """Test that upstream failures are reported as 503"""
+        with patch('weather_app.services.weather_service.requests.get',
+                   side_effect=requests.exceptions.Timeout('timeout')):
+            response = self.client.get(reverse('api_current'))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('error', response.json())
@@ -0,0 +1,99 @@
+"""
+Tests for backtesting sport thresholds
+"""
+
+import csv
+import io
+import os
+from collections import Counter
+from datetime import timedelta
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from unittest.mock import patch
+
+from .backtest import plan_shards, run_backtest, run_shard
+from .models import Observation
+from .services.sport_service import SportRecommendationService
+from .testing import OBSERVATIONS_START as START, make_observation
+
+
+def count_shard(shard, thresholds=None, chunk_size=2000):
+    """Stand-in for run_shard reporting the worker process"""
+    return Counter({('running', shard[2].strftime('%Y-%m'), str(os.getpid()), 'hours'): 1})
+
+
+class BacktestTests(TestCase):
+    """Tests for planning and running backtest shards"""
+
+    @classmethod
+    def setUpTestData(cls):
+        observations = []
+        # Two observations per hour for three days, 8°C at night and 15°C by day
+        for hour in range(72):
+            temperature = 15.0 if 8 <= hour % 24 < 20 else 8.0
+            observations.append(make_observation(hour, temperature=temperature))
+            observations.append(make_observation(hour + 0.5, temperature=temperature))
+        # October and November at a second location
+        observations.append(make_observation(2, latitude=47.5596, longitude=7.5886))
+        observations.append(make_observation(24 * 35, latitude=47.5596, longitude=7.5886))
+        Observation.objects.bulk_create(observations)
+
+    def test_shards_split_by_location_and_time(self):
+        """Test that each location is split into ranges of shard_days"""
+        shards = plan_shards(shard_days=1)
+
+        reinach = sorted(shard for shard in shards if shard[0] == 47.4953)
+        self.assertEqual(len(reinach), 3)
+        self.assertEqual(reinach[0][2], START)
+        self.assertEqual(reinach[1][2], START + timedelta(days=1))
+        self.assertEqual(len(shards), 3 + 35)
+
+    def test_suitable_hours_per_sport_and_month(self):
+        """Test that each hour is counted once per sport"""
+        report = run_backtest(plan_shards(shard_days=1))
+
+        running = report[('running', '2025-10', '47.4953,7.5965')]
+        self.assertEqual(running, {'hours': 72, 'suitable': 36})
+        self.assertEqual(report[('cycling', '2025-10', '47.4953,7.5965')]['suitable'], 72)
+        self.assertEqual(report[('running', '2025-11', '47.5596,7.5886')]['hours'], 1)
+
+    def test_custom_thresholds(self):
+        """Test that candidate thresholds are applied without changing the defaults"""
+        shard = plan_shards(location=(47.4953, 7.5965))[0]
+
+        counts = run_shard(shard, thresholds={'running': {'temp_min': 5}})
+
+        self.assertEqual(counts[('running', '2025-10', '47.4953,7.5965', 'suitable')], 72)
+        self.assertEqual(SportRecommendationService.DEFAULT_THRESHOLDS['running']['temp_min'], 10)
+
+    def test_shards_run_in_process_pool(self):
+        """Test that shards are spread over worker processes and merged"""
+        shards = plan_shards(shard_days=1, location=(47.4953, 7.5965))
+
+        with patch('weather_app.backtest.run_shard', new=count_shard):
+            report = run_backtest(shards, workers=2)
+
+        self.assertEqual(sum(counts['hours'] for counts in report.values()), 3)
+        self.assertNotIn(str(os.getpid()), [location for _, _, location in report])
+
+    def test_command_reports_csv(self):
+        """Test the backtest_thresholds command output"""
+        output = io.StringIO()
+
+        call_command('backtest_thresholds', '--workers', '1', '--format', 'csv', '--since', '2025-10-01',
+                     '--until', '2025-10-31', '--thresholds', '{"running": {"temp_max": 10}}',
+                     stdout=output, stderr=io.StringIO())
+
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        self.assertEqual(rows[0], ['sport', 'month', 'location', 'hours', 'suitable_hours'])
+        self.assertIn(['running', '2025-10', '47.4953,7.5965', '72', '0'], rows)
+
+    def test_command_rejects_invalid_thresholds(self):
+        """Test that thresholds the backtest cannot apply are rejected"""
+        invalid = ['[5]', '{"rowing": {"temp_min": 5}}', '{"running": 5}',
+                   '{"running": {"temp_minimum": 5}}', '{"running": {"temp_min": "5"}}']
+
+        for thresholds in invalid:
+            with self.subTest(thresholds=thresholds), self.assertRaisesMessage(CommandError, 'Invalid thresholds'):
+                call_command('backtest_thresholds', '--workers', '1', '--thresholds', thresholds,
+                             stdout=io.StringIO(), stderr=io.StringIO())
@@ -0,0 +1,106 @@
+"""
+Tests for the in-process LRU/TTL cache
+"""
+
+from django.test import SimpleTestCase
+from unittest.mock import patch
+
+from .services.cache import LRUCache, TieredCache, estimate_size
+from .services.metrics import registry
+
+
+class LRUCacheTests(SimpleTestCase):
+    """Tests for eviction, expiry and accounting of LRUCache"""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = LRUCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_byte_budget(self):
+        """Test that entries are evicted to stay within the byte budget"""
+        value = 'x' * 1000
+        cache = LRUCache(max_entries=100, max_bytes=3 * estimate_size(value) + 500)
+        for key in 'abcde':
+            cache.set(key, value)
+
+        stats = cache.stats()
+        self.assertLessEqual(stats['bytes'], stats['max_bytes'])
+        self.assertEqual(stats['entries'], 3)
+        self.assertNotIn('a', cache)
+        self.assertIn('e', cache)
+
+    def test_oversized_value_not_stored(self):
+        """Test that a value larger than the whole budget is skipped"""
+        cache = LRUCache(max_bytes=100)
+        cache.set('big', 'x' * 1000)
+
+        self.assertIsNone(cache.get('big'))
+        self.assertEqual(cache.stats()['bytes'], 0)
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are dropped and counted"""
+        cache = LRUCache()
+        with patch('weather_app.services.cache.time.monotonic', return_value=100.0):
+            cache.set('a', 1, ttl=10)
+        with patch('weather_app.services.cache.time.monotonic', return_value=109.0):
+            self.assertEqual(cache.get('a'), 1)
+        with patch('weather_app.services.cache.time.monotonic', return_value=110.0):
+            self.assertIsNone(cache.get('a'))
+
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 0)
+        self.assertEqual(stats['bytes'], 0)
+        self.assertEqual(stats['expirations'], 1)
+
+    def test_overwrite_keeps_accounting(self):
+        """Test that replacing an entry does not double count its size"""
+        cache = LRUCache()
+        cache.set('a', 'x' * 100)
+        cache.set('a', 'x' * 100)
+        cache.delete('missing')
+
+        self.assertEqual(cache.stats()['bytes'], estimate_size('a') + estimate_size('x' * 100))
+
+    def test_occupancy_exposed(self):
+        """Test that named caches report occupancy and evictions as metrics"""
+        cache = LRUCache(max_entries=1, name='test_occupancy')
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        text = registry.expose()
+
+        self.assertIn('weather_cache_entries{cache="test_occupancy"} 1', text)
+        self.assertIn('weather_cache_evictions_total{cache="test_occupancy",reason="lru"} 1', text)
+
+
+class TieredCacheTests(SimpleTestCase):
+    """Tests for an LRUCache used as L1 in front of another backend"""
+
+    def test_l2_hits_promoted_to_l1(self):
+        """Test that backend hits are copied into L1"""
+        l2 = LRUCache()
+        cache = TieredCache(LRUCache(), l2)
+        l2.set('a', 1)
+
+        self.assertEqual(cache.get('a'), 1)
+        l2.clear()
+        self.assertEqual(cache.get('a'), 1)
+
+    def test_l1_ttl_bounds_staleness(self):
+        """Test that L1 copies expire after l1_ttl"""
+        l2 = LRUCache()
+        cache = TieredCache(LRUCache(), l2, l1_ttl=5)
+        with patch('weather_app.services.cache.time.monotonic', return_value=100.0):
+            cache.set('a', 1, ttl=60)
+            l2.set('a', 2, ttl=60)
+        with patch('weather_app.services.cache.time.monotonic', return_value=106.0):
+            self.assertEqual(cache.get('a'), 2)
@@ -0,0 +1,139 @@
+"""
+Tests for climate sketches and suggested thresholds
+"""
+
+import io
+import json
+import random
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from unittest.mock import patch
+
+from .backtest import plan_shards
+from .climate import build_sketches, load_sketches, record_climate, store_sketches, suggest_thresholds
+from .models import ClimateSketch, Observation
+from .services.sketch import TDigest
+from .services.weather_service import WeatherService
+from .testing import EmptyWeatherCacheMixin, FakeUpstream, make_current_payload, make_observation
+
+REINACH = (47.4953, 7.5965)
+
+
+class TDigestTests(SimpleTestCase):
+    """Tests for the t-digest quantile sketch"""
+
+    def setUp(self):
+        generator = random.Random(7)
+        self.values = [generator.gauss(10, 5) for _ in range(20000)]
+        self.sorted = sorted(self.values)
+
+    def test_quantiles_accurate(self):
+        """Test that quantiles are close to the exact ones"""
+        digest = TDigest()
+        digest.update(self.values)
+
+        for q in (0.01, 0.1, 0.5, 0.9, 0.99):
+            self.assertAlmostEqual(digest.quantile(q), self.sorted[int(q * len(self.sorted))], delta=0.2)
+        self.assertAlmostEqual(digest.cdf(10), 0.5, delta=0.01)
+        self.assertEqual(digest.quantile(0), self.sorted[0])
+        self.assertEqual(digest.quantile(1), self.sorted[-1])
+
+    def test_size_bounded(self):
+        """Test that the number of centroids does not grow with the stream"""
+        digest = TDigest()
+        digest.update(self.values[:1000])
+        small = len(digest)
+        digest.update(self.values[1000:])
+
+        self.assertLessEqual(len(digest), 100)
+        self.assertLessEqual(len(digest), small + 20)
+
+    def test_merged_shards_match_whole_stream(self):
+        """Test that merging digests of parts approximates the digest of the whole"""
+        parts = [TDigest() for _ in range(4)]
+        for number, value in enumerate(self.values):
+            parts[number % 4].add(value)
+
+        merged = TDigest()
+        for part in parts:
+            merged.merge(part)
+
+        self.assertEqual(merged.count, len(self.values))
+        self.assertAlmostEqual(merged.quantile(0.5), self.sorted[len(self.sorted) // 2], delta=0.2)
+
+    def test_serialization_round_trip(self):
+        """Test that a restored digest gives the same quantiles"""
+        digest = TDigest()
+        digest.update(self.values)
+
+        restored = TDigest.from_dict(json.loads(json.dumps(digest.to_dict())))
+
+        self.assertEqual(restored.quantile(0.3), digest.quantile(0.3))
+        self.assertIsNone(TDigest.from_dict(TDigest().to_dict()).quantile(0.5))
+
+
+class ClimateSketchTests(EmptyWeatherCacheMixin, TestCase):
+    """Tests for building, storing and using climate sketches"""
+
+    def add_observations(self):
+        # Three days in October, 5°C to 16.5°C over each day, rain one hour in four
+        Observation.objects.bulk_create([
+            make_observation(hour, temperature=5.0 + hour % 24 * 0.5,
+                             precipitation=1.0 if hour % 4 == 0 else 0.0)
+            for hour in range(72)
+        ])
+
+    def test_recorded_observations_sketched_once(self):
+        """Test that each upstream observation is added to its month once"""
+        upstream = FakeUpstream(current=make_current_payload(temp=12.0))
+        WeatherService.add_update_listener(record_climate)
+        self.addCleanup(WeatherService.remove_update_listener, record_climate)
+        with patch('weather_app.services.weather_service.requests.get', new=upstream):
+            WeatherService().get_current_weather()
+            WeatherService().clear_cache()
+            WeatherService().get_current_weather()
+            WeatherService().clear_cache()
+            upstream.current = make_current_payload(temp=14.0, dt=1760003600)
+            WeatherService().get_current_weather()
+
+        row = ClimateSketch.objects.get()
+        sketches = load_sketches(REINACH)
+        self.assertEqual(row.month, 10)
+        self.assertEqual(sketches['temperature'].count, 2)
+        self.assertEqual(sketches['temperature'].quantile(1), 14.0)
+
+    def test_rebuild_merges_shards(self):
+        """Test that sketches built from one-day shards cover every observation"""
+        self.add_observations()
+
+        built = build_sketches(plan_shards(shard_days=1))
+        store_sketches(built)
+
+        sketches = load_sketches(REINACH, months=[10])
+        self.assertEqual(sketches['temperature'].count, 72)
+        self.assertAlmostEqual(sketches['temperature'].quantile(0.5), 10.75, delta=0.5)
+        self.assertIsNone(load_sketches(REINACH, months=[11]))
+
+    def test_suggested_thresholds(self):
+        """Test that the suggestions keep the comfortable share of hours"""
+        self.add_observations()
+        store_sketches(build_sketches(plan_shards()))
+
+        suggested = suggest_thresholds(load_sketches(REINACH), share=0.4)
+
+        # Running is most comfortable at 15°C, so the warmest hours are kept
+        self.assertGreaterEqual(suggested['running']['temp_max'], 16.0)
+        self.assertAlmostEqual(suggested['running']['temp_min'], 8.2, delta=0.5)
+        self.assertEqual(suggested['cycling']['rain_max'], 0.0)
+        self.assertEqual(suggested['cycling']['wind_max'], 10.0)
+
+    def test_command_outputs_thresholds(self):
+        """Test that the command rebuilds and prints thresholds as JSON"""
+        self.add_observations()
+        output = io.StringIO()
+
+        call_command('climate_thresholds', '--rebuild', '--workers', '1', stdout=output, stderr=io.StringIO())
+
+        thresholds = json.loads(output.getvalue())
+        self.assertEqual(set(thresholds), {'cycling', 'running'})
+        self.assertEqual(set(thresholds['running']), {'temp_min', 'temp_max', 'wind_max', 'rain_max'})
@@ -0,0 +1,78 @@
+"""
+Tests for live weather events
+"""
+
+import asyncio
+import threading
+from django.test import SimpleTestCase, override_settings
+
+from .events import EventBroadcaster, broadcaster
+from .services.refresher import WeatherRefresher
+from .testing import WeatherServiceTestCase
+
+
+class EventBroadcasterTests(SimpleTestCase):
+    """Tests for the in-process event broadcaster"""
+
+    def test_publish_fans_out_to_all_subscribers(self):
+        """Test that one publish from another thread reaches every subscriber"""
+        hub = EventBroadcaster()
+
+        async def scenario():
+            queues = [hub.subscribe() for _ in range(3)]
+            thread = threading.Thread(target=hub.publish, args=('current', '{"a":1}'))
+            thread.start()
+            thread.join()
+            return [await asyncio.wait_for(queue.get(), timeout=1) for queue in queues]
+
+        messages = asyncio.run(scenario())
+
+        self.assertEqual(len(messages), 3)
+        self.assertEqual(messages[0], b'event: current\ndata: {"a":1}\n\n')
+        self.assertTrue(all(message is messages[0] for message in messages))
+
+    def test_slow_subscriber_drops_oldest(self):
+        """Test that a full subscriber queue keeps the newest messages"""
+        hub = EventBroadcaster(queue_size=1)
+
+        async def scenario():
+            queue = hub.subscribe()
+            hub.publish('current', '1')
+            hub.publish('current', '2')
+            await asyncio.sleep(0)
+            return queue.get_nowait()
+
+        self.assertEqual(asyncio.run(scenario()), b'event: current\ndata: 2\n\n')
+
+
+class LiveUpdatesViewTests(WeatherServiceTestCase):
+    """Tests for the Server-Sent Events endpoint"""
+
+    def test_events_disabled_by_default(self):
+        """Test that the stream is not served unless live updates are enabled"""
+        response = self.client.get('/events')
+
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(WEATHER_LIVE_UPDATES=True)
+    def test_refresh_pushes_events(self):
+        """Test that a background refresh pushes current, recommendation and forecast events"""
+
+        async def scenario():
+            response = await self.async_client.get('/events')
+            stream = response.streaming_content
+            await stream.__anext__()  # retry hint
+
+            await asyncio.to_thread(WeatherRefresher().refresh)
+
+            events = [await asyncio.wait_for(stream.__anext__(), timeout=1) for _ in range(3)]
+            await stream.aclose()
+            return response, events
+
+        response, events = asyncio.run(scenario())
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual([event.split(b'\n')[0] for event in events],
+                         [b'event: current', b'event: recommendations', b'event: forecast'])
+        self.assertFalse(broadcaster.has_subscribers())
+        self.assertEqual(len(self.upstream.calls), 2)
@@ -0,0 +1,120 @@
+"""
+Tests for retained observations and the history export
+"""
+
+import csv
+import io
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from unittest.mock import patch
+
+from .history import filter_observations, iter_export_rows, record_observation
+from .models import Observation
+from .services.weather_service import WeatherService
+from .testing import EmptyWeatherCacheMixin, FakeUpstream, make_current_payload, make_observation
+
+
+class RecordObservationTests(EmptyWeatherCacheMixin, TestCase):
+    """Tests for storing fetched current weather"""
+
+    def setUp(self):
+        super().setUp()
+        WeatherService.add_update_listener(record_observation)
+        self.addCleanup(WeatherService.remove_update_listener, record_observation)
+
+    def test_fetched_observations_recorded_once(self):
+        """Test that each upstream observation is stored once per location"""
+        upstream = FakeUpstream(current=make_current_payload(temp=12.0))
+        with patch('weather_app.services.weather_service.requests.get', new=upstream):
+            WeatherService().get_current_weather()
+            WeatherService().get_current_weather((47.5596, 7.5886))
+            WeatherService().clear_cache()
+            WeatherService().get_current_weather()
+
+        self.assertEqual(Observation.objects.count(), 2)
+        observation = Observation.objects.get(latitude=47.5596)
+        self.assertEqual(observation.temperature, 12.0)
+        self.assertEqual(observation.longitude, 7.5886)
+
+    def test_forecast_and_stale_data_ignored(self):
+        """Test that only fresh current weather is recorded"""
+        record_observation('forecast_24h', [], 'v')
+        record_observation('current_weather', {'stale': True}, 'v')
+
+        self.assertEqual(Observation.objects.count(), 0)
+
+
+class ExportHistoryTests(TestCase):
+    """Tests for the export_history management command"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Observation.objects.bulk_create(
+            [make_observation(hours, temperature=5.0 + hours) for hours in range(0, 72, 6)]
+            + [make_observation(1, latitude=47.5596, longitude=7.5886, precipitation=2.0)]
+        )
+
+    def export(self, *args):
+        output = io.StringIO()
+        call_command('export_history', *args, stdout=output, stderr=io.StringIO())
+        return output.getvalue()
+
+    def test_csv_with_sport_suitability(self):
+        """Test that CSV rows carry one suitability column per sport"""
+        rows = list(csv.DictReader(io.StringIO(self.export('--chunk-size', '5'))))
+
+        self.assertEqual(len(rows), 13)
+        self.assertEqual(rows[0]['observed_at'], '2025-10-01T00:00:00+00:00')
+        self.assertEqual(rows[1]['cycling'], 'False')
+        self.assertEqual(rows[2]['running'], 'True')
+
+    def test_location_and_date_filters(self):
+        """Test that --lat/--lon and inclusive --since/--until select rows"""
+        location = self.export('--lat', '47.5596', '--lon', '7.5886')
+        dates = self.export('--lat', '47.4953', '--lon', '7.5965', '--since', '2025-10-02', '--until', '2025-10-02')
+
+        self.assertEqual(len(location.splitlines()), 2)
+        times = [row['observed_at'] for row in csv.DictReader(io.StringIO(dates))]
+        self.assertEqual(times[0], '2025-10-02T00:00:00+00:00')
+        self.assertEqual(times[-1], '2025-10-02T18:00:00+00:00')
+
+    def test_columnar_chunks(self):
+        """Test that columnar output holds one object of column arrays per chunk"""
+        lines = self.export('--format', 'columnar', '--chunk-size', '5').splitlines()
+
+        chunks = [json.loads(line) for line in lines]
+        self.assertEqual([len(chunk['temperature']) for chunk in chunks], [5, 5, 3])
+        self.assertEqual(chunks[0]['temperature'][:3], [5.0, 15.0, 11.0])
+        self.assertEqual(chunks[0]['latitude'][1], 47.5596)
+        self.assertIn('cycling', chunks[2])
+
+    def test_output_file(self):
+        """Test that --output writes to a file"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'history.csv')
+
+        self.export('--output', path, '--since', '2025-10-03')
+
+        with open(path, newline='', encoding='utf-8') as export_file:
+            self.assertEqual(len(list(csv.reader(export_file))), 5)
+
+    def test_rows_read_lazily(self):
+        """Test that rows are produced from chunked reads without loading the result set"""
+        rows = iter_export_rows(filter_observations(), chunk_size=2)
+
+        with self.assertNumQueries(1):
+            first = next(rows)
+
+        self.assertEqual(first[0], '2025-10-01T00:00:00+00:00')
+
+    def test_invalid_arguments(self):
+        """Test that incomplete locations and bad dates are rejected"""
+        with self.assertRaises(CommandError):
+            self.export('--lat', '47.5')
+        with self.assertRaises(CommandError):
+            self.export('--since', '01.10.2025')
@@ -0,0 +1,126 @@
+"""
+Tests for the hourly forecast interpolation
+"""
+
+from datetime import datetime, timedelta
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from .services.interpolation import forecast_at, interpolate_forecast
+from .services.weather_service import WeatherService
+from .testing import WeatherServiceTestCase
+
+
+def make_period(start, hours, temperature, wind_speed, precipitation):
+    return {
+        'timestamp': start + timedelta(hours=hours),
+        'temperature': temperature,
+        'feels_like': temperature - 1,
+        'humidity': 60,
+        'wind_speed': wind_speed,
+        'precipitation': precipitation,
+        'description': 'period {}'.format(hours),
+        'icon': '02d',
+    }
+
+
+class InterpolateForecastTests(SimpleTestCase):
+    """Tests for interpolate_forecast"""
+
+    def setUp(self):
+        self.start = datetime(2025, 10, 9, 12, 0)
+        self.periods = [
+            make_period(self.start, 0, 10.0, 6.0, 0.0),
+            make_period(self.start, 3, 16.0, 12.0, 3.0),
+            make_period(self.start, 6, 13.0, 9.0, 0.6),
+        ]
+
+    def test_hourly_steps_cover_all_periods(self):
+        """Test that the series is hourly up to the end of the last period"""
+        series = interpolate_forecast(self.periods)
+
+        self.assertEqual(len(series), 9)
+        self.assertEqual(series[0]['timestamp'], self.start)
+        self.assertEqual(series[-1]['timestamp'], self.start + timedelta(hours=8))
+
+    def test_temperature_and_wind_interpolated(self):
+        """Test that values between periods are interpolated linearly"""
+        series = interpolate_forecast(self.periods)
+
+        self.assertAlmostEqual(series[1]['temperature'], 12.0)
+        self.assertAlmostEqual(series[2]['wind_speed'], 10.0)
+        self.assertAlmostEqual(series[4]['feels_like'], 14.0)
+        # Held after the last period
+        self.assertAlmostEqual(series[8]['temperature'], 13.0)
+
+    def test_precipitation_spread_over_interval(self):
+        """Test that period precipitation becomes an hourly rate keeping the total"""
+        series = interpolate_forecast(self.periods)
+
+        self.assertEqual([point['precipitation'] for point in series[3:6]], [1.0, 1.0, 1.0])
+        self.assertAlmostEqual(sum(point['precipitation'] for point in series), 3.6)
+        self.assertEqual(series[4]['description'], 'period 3')
+
+    def test_finer_step(self):
+        """Test that other step sizes are supported"""
+        series = interpolate_forecast(self.periods, step=timedelta(minutes=30))
+
+        self.assertEqual(len(series), 18)
+        self.assertAlmostEqual(series[1]['temperature'], 11.0)
+        self.assertAlmostEqual(series[6]['precipitation'], 0.5)
+
+    def test_empty_and_single_period(self):
+        """Test that short forecasts do not fail"""
+        self.assertEqual(interpolate_forecast([]), [])
+        self.assertEqual(len(interpolate_forecast(self.periods[:1])), 1)
+
+    def test_forecast_at_moment(self):
+        """Test that the forecast between two hours is interpolated"""
+        series = interpolate_forecast(self.periods)
+
+        point = forecast_at(series, self.start + timedelta(minutes=90))
+
+        self.assertAlmostEqual(point['temperature'], 13.0)
+        self.assertEqual(point['precipitation'], series[1]['precipitation'])
+        self.assertEqual(point['timestamp'], self.start + timedelta(minutes=90))
+
+    def test_forecast_at_outside_series(self):
+        """Test that moments after the series have no forecast"""
+        series = interpolate_forecast(self.periods)
+
+        self.assertIsNone(forecast_at(series, self.start + timedelta(hours=9)))
+        self.assertIsNone(forecast_at(series, self.start - timedelta(hours=4)))
+        self.assertEqual(forecast_at(series, self.start - timedelta(hours=1))['temperature'], 10.0)
+
+
+class HourlyForecastTests(WeatherServiceTestCase):
+    """Tests for the cached hourly series"""
+
+    def test_hourly_cached_with_forecast(self):
+        """Test that the series is computed when the forecast is cached"""
+        self.service.get_forecast_24h()
+
+        hourly = WeatherService().get_forecast_hourly()
+
+        self.assertEqual(len(hourly), 24)
+        self.assertIsNotNone(self.service.get_cache_version(WeatherService.HOURLY_CACHE_KEY))
+        self.assertIs(hourly, WeatherService().get_forecast_hourly())
+        self.assertEqual(len(self.upstream.calls), 1)
+
+    def test_hourly_rebuilt_when_missing(self):
+        """Test that a forecast cached without its series gets one"""
+        self.service.get_forecast_24h()
+        self.service._cache.delete(WeatherService.HOURLY_CACHE_KEY)
+
+        hourly = self.service.get_forecast_hourly()
+
+        self.assertEqual(len(hourly), 24)
+        self.assertEqual(len(self.upstream.calls), 1)
+
+    def test_recommendations_per_hour(self):
+        """Test that forecast recommendations are given for every hour"""
+        response = self.client.get(reverse('api_recommendations'))
+
+        forecast = response.json()['forecast']
+        self.assertEqual(len(forecast), 24)
+        self.assertIn('cycling', forecast[0]['recommendations'])
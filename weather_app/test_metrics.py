@@ -0,0 +1,114 @@
+"""
+Tests for the metrics registry and endpoint
+"""
+
+import threading
+import requests
+from django.test import SimpleTestCase
+from django.urls import reverse
+from unittest.mock import MagicMock, patch
+
+from .services.metrics import MetricsRegistry
+from .services.weather_service import WeatherService
+from .testing import EmptyWeatherCacheMixin, FakeUpstream
+
+
+class MetricsRegistryTests(SimpleTestCase):
+    """Tests for sharded counters and histograms"""
+
+    def test_counter_sums_threads(self):
+        """Test that increments from many threads are all counted"""
+        counter = MetricsRegistry().counter('hits_total', 'Hits.', ('key',))
+
+        def work():
+            for _ in range(1000):
+                counter.inc(key='a')
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc(key='b')
+
+        self.assertEqual(counter.collect(), {('a',): 8000, ('b',): 1})
+        # Shards of finished threads are retired without losing counts
+        self.assertEqual(len(counter._shards), 1)
+        self.assertEqual(counter.collect()[('a',)], 8000)
+
+    def test_histogram_exposition(self):
+        """Test the Prometheus text format of a histogram"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram('latency_seconds', 'Latency.', ('endpoint',), buckets=(0.1, 1))
+        histogram.observe(0.05, endpoint='weather')
+        histogram.observe(0.5, endpoint='weather')
+        histogram.observe(5, endpoint='weather')
+
+        text = registry.expose()
+
+        self.assertIn('# TYPE latency_seconds histogram', text)
+        self.assertIn('latency_seconds_bucket{endpoint="weather",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{endpoint="weather",le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{endpoint="weather",le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count{endpoint="weather"} 3', text)
+        self.assertIn('latency_seconds_sum{endpoint="weather"} 5.55', text)
+
+
+class MetricsEndpointTests(EmptyWeatherCacheMixin, SimpleTestCase):
+    """Tests for the /metrics endpoint fed by WeatherService"""
+
+    def _sample(self, text, prefix):
+        """Return the value of the first sample line starting with prefix"""
+        for line in text.splitlines():
+            if line.startswith(prefix + ' '):
+                return float(line.split()[-1])
+        return 0.0
+
+    def test_cache_and_upstream_metrics(self):
+        """Test that cache hits/misses and upstream calls are counted"""
+        before = self.client.get(reverse('metrics')).content.decode()
+
+        with patch('weather_app.services.weather_service.requests.get', new=FakeUpstream()):
+            WeatherService().get_current_weather()
+            WeatherService().get_current_weather()
+
+        response = self.client.get(reverse('metrics'))
+        text = response.content.decode()
+
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        for prefix, delta in (
+            ('weather_cache_requests_total{key="current_weather",result="hit"}', 1),
+            ('weather_cache_requests_total{key="current_weather",result="miss"}', 1),
+            ('weather_upstream_requests_total{endpoint="weather",status="200"}', 1),
+            ('weather_upstream_latency_seconds_count{endpoint="weather"}', 1),
+        ):
+            self.assertEqual(self._sample(text, prefix) - self._sample(before, prefix), delta, prefix)
+
+    def test_error_statuses_counted(self):
+        """Test that 429 responses and timeouts are counted per status"""
+        before = self.client.get(reverse('metrics')).content.decode()
+        rate_limited = MagicMock(status_code=429)
+        rate_limited.raise_for_status.side_effect = requests.exceptions.HTTPError(response=rate_limited)
+
+        with patch('weather_app.services.weather_service.requests.get', return_value=rate_limited):
+            self.assertIsNone(WeatherService().get_current_weather())
+        with patch('weather_app.services.weather_service.requests.get',
+                   side_effect=requests.exceptions.Timeout('timeout')):
+            self.assertIsNone(WeatherService().get_forecast_24h())
+
+        text = self.client.get(reverse('metrics')).content.decode()
+        for prefix in ('weather_upstream_requests_total{endpoint="weather",status="429"}',
+                       'weather_upstream_requests_total{endpoint="forecast",status="timeout"}'):
+            self.assertEqual(self._sample(text, prefix) - self._sample(before, prefix), 1, prefix)
+
+    def test_disabled_or_not_allowed(self):
+        """Test that metrics are hidden when disabled or for clients not allowed"""
+        with self.settings(WEATHER_METRICS=False):
+            disabled = self.client.get(reverse('metrics'))
+        with self.settings(WEATHER_METRICS_ALLOWED_IPS=['10.0.0.5']):
+            other_client = self.client.get(reverse('metrics'))
+            scraper = self.client.get(reverse('metrics'), REMOTE_ADDR='10.0.0.5')
+
+        self.assertEqual(disabled.status_code, 404)
+        self.assertEqual(other_client.status_code, 404)
+        self.assertEqual(scraper.status_code, 200)
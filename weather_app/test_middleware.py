@@ -0,0 +1,106 @@
+"""
+Tests for the lean production middleware stack
+"""
+
+import importlib
+import os
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from unittest.mock import patch
+
+from weather_project.middleware import AdminScopedMiddleware
+from .testing import FakeUpstreamMixin
+
+# The production settings require SECRET_KEY from the environment
+with patch.dict(os.environ, {'SECRET_KEY': 'test'}):
+    settings_production = importlib.import_module('weather_project.settings_production')
+LEAN_MIDDLEWARE = settings_production.MIDDLEWARE
+ADMIN_MIDDLEWARE = settings_production.ADMIN_MIDDLEWARE
+
+
+class TaggingMiddleware:
+    """Marks every response passing through it"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        response['X-Tagged'] = 'yes'
+        return response
+
+    def process_template_response(self, request, response):
+        response['X-Template'] = 'yes'
+        return response
+
+    def process_exception(self, request, exception):
+        return HttpResponse(status=418)
+
+
+class NotFoundMiddleware:
+    """Raises Http404 for every request"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        raise Http404("Not here")
+
+
+@override_settings(MIDDLEWARE=LEAN_MIDDLEWARE, ADMIN_MIDDLEWARE=ADMIN_MIDDLEWARE, ADMIN_URL='admin/')
+class AdminScopedMiddlewareTests(FakeUpstreamMixin, TestCase):
+    """Tests for AdminScopedMiddleware"""
+
+    def test_public_page_skips_admin_middleware(self):
+        """Test that the public page runs without sessions or CSRF"""
+        with patch('django.contrib.sessions.middleware.SessionMiddleware.process_request') as mock_session:
+            response = self.client.get('/')
+
+        self.assertEqual(response.status_code, 200)
+        mock_session.assert_not_called()
+        self.assertFalse(hasattr(response.wsgi_request, 'user'))
+        self.assertNotIn('csrftoken', response.cookies)
+
+    def test_admin_keeps_full_middleware(self):
+        """Test that the admin still gets sessions, auth and CSRF"""
+        response = self.client.get('/admin/login/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(hasattr(response.wsgi_request, 'user'))
+        self.assertIn('csrftoken', response.cookies)
+
+    def test_admin_login_enforces_csrf(self):
+        """Test that CSRF checks still apply to admin POSTs"""
+        self.client.handler.enforce_csrf_checks = True
+
+        response = self.client.post('/admin/login/', {'username': 'x', 'password': 'y'})
+
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(ADMIN_URL='admin/', ADMIN_MIDDLEWARE=[
+    'weather_app.test_middleware.TaggingMiddleware',
+    'weather_app.test_middleware.NotFoundMiddleware',
+])
+class AdminScopedChainTests(SimpleTestCase):
+    """Tests for how AdminScopedMiddleware builds and hooks its chain"""
+
+    def setUp(self):
+        self.middleware = AdminScopedMiddleware(lambda request: HttpResponse())
+        self.factory = RequestFactory()
+
+    def test_exceptions_converted_inside_chain(self):
+        """Test that an exception in one layer becomes a response the outer layers see"""
+        response = self.middleware(self.factory.get('/admin/'))
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response['X-Tagged'], 'yes')
+
+    def test_hooks_forwarded_for_admin_only(self):
+        """Test that process_exception and process_template_response reach the chain"""
+        admin, public = self.factory.get('/admin/'), self.factory.get('/')
+
+        self.assertEqual(self.middleware.process_exception(admin, ValueError()).status_code, 418)
+        self.assertIsNone(self.middleware.process_exception(public, ValueError()))
+        self.assertEqual(self.middleware.process_template_response(admin, HttpResponse())['X-Template'], 'yes')
+        self.assertNotIn('X-Template', self.middleware.process_template_response(public, HttpResponse()))
@@ -0,0 +1,110 @@
+"""
+Tests for the pre-rendered index pages
+"""
+
+import gzip
+import io
+import os
+import tempfile
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+from unittest.mock import patch
+
+from .prerender import PagePrerenderer, page_name
+from .services.refresher import WeatherRefresher
+from .services.weather_service import WeatherService
+from .testing import WeatherServiceTestCase, make_current_payload
+
+BASEL = '47.5596,7.5886'
+
+
+class PageNameTests(SimpleTestCase):
+    """Tests for page_name"""
+
+    def test_page_names(self):
+        """Test that pages are named after the rounded location"""
+        self.assertEqual(page_name(), 'index.html')
+        self.assertEqual(page_name((47.55961, 7.5886)), '47.5596,7.5886.html')
+        self.assertEqual(page_name(' 47.5596, 7.5886'), '47.5596,7.5886.html')
+
+
+class PagePrerendererTests(WeatherServiceTestCase):
+    """Tests for PagePrerenderer"""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.prerenderer = PagePrerenderer(self.directory, [BASEL])
+
+    def read(self, name):
+        with open(os.path.join(self.directory, name), 'rb') as page_file:
+            return page_file.read()
+
+    def test_pages_written_for_all_locations(self):
+        """Test that every location gets a page and a matching gzip variant"""
+        written = self.prerenderer.render_all()
+
+        self.assertEqual(written, 2)
+        self.assertIn(b'Reinach BL', self.read('index.html'))
+        self.assertIn(b'47.5596, 7.5886', self.read('47.5596,7.5886.html'))
+        self.assertEqual(gzip.decompress(self.read('index.html.gz')), self.read('index.html'))
+        self.assertFalse([name for name in os.listdir(self.directory) if name.startswith('.page-')])
+
+    def test_unchanged_data_not_rerendered(self):
+        """Test that pages are only rewritten when their data changes"""
+        self.prerenderer.render_all()
+
+        unchanged = self.prerenderer.render_all()
+        WeatherService().clear_cache()
+        self.upstream.current = make_current_payload(temp=-3.0)
+        refreshed = self.prerenderer.render_all()
+
+        self.assertEqual(unchanged, 0)
+        self.assertEqual(refreshed, 2)
+        self.assertIn(b'-3.0', self.read('index.html'))
+
+    def test_error_page_not_written(self):
+        """Test that a failing render keeps the previous page"""
+        self.prerenderer.render()
+        WeatherService().clear_cache()
+        self.upstream.current = make_current_payload(temp=-3.0)
+
+        with patch('weather_app.prerender.build_index_context', return_value={'error': 'failed'}):
+            written = self.prerenderer.render()
+
+        self.assertFalse(written)
+        self.assertNotIn(b'-3.0', self.read('index.html'))
+
+    def test_refresher_renders_after_refresh(self):
+        """Test that the refresher keeps locations warm and then renders"""
+        refresher = WeatherRefresher(locations=[BASEL], after_refresh=[self.prerenderer.render_all])
+
+        refresher.refresh()
+
+        self.assertEqual(len(self.upstream.calls), 4)
+        self.assertTrue(os.path.exists(os.path.join(self.directory, '47.5596,7.5886.html')))
+
+    def test_command_renders_once(self):
+        """Test that prerender_pages --once refreshes and writes every page"""
+        stderr = io.StringIO()
+        with self.settings(WEATHER_PRERENDER_DIR=self.directory, WEATHER_PRERENDER_LOCATIONS=[BASEL]):
+            call_command('prerender_pages', '--once', stderr=stderr)
+
+        self.assertIn('Pre-rendered 2 pages', stderr.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(self.directory, '47.5596,7.5886.html.gz')))
+
+    def test_command_requires_directory(self):
+        """Test that the command refuses to run without WEATHER_PRERENDER_DIR"""
+        with self.settings(WEATHER_PRERENDER_DIR=''), self.assertRaises(CommandError):
+            call_command('prerender_pages', '--once')
+
+    def test_index_fallback_for_location(self):
+        """Test that the index view renders locations without a pre-rendered page"""
+        response = self.client.get(reverse('index'), {'lat': '46.9480', 'lon': '7.4474'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['location'], '46.9480, 7.4474')
+        self.assertFalse(response.context['live_updates'])
@@ -0,0 +1,185 @@
+"""
+Tests for weather providers and hedged requests
+"""
+
+import threading
+import time
+import requests
+from django.test import SimpleTestCase
+
+from .services.providers import HedgedProvider, LatencyTracker, OpenMeteoProvider, WeatherProvider
+from .services.weather_service import WeatherService
+
+
+class FakeProvider(WeatherProvider):
+    """Local provider answering after a delay, or failing"""
+
+    def __init__(self, name, delay=0.0, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.finished = threading.Event()
+
+    def fetch_current(self, lat, lon):
+        self.calls += 1
+        time.sleep(self.delay)
+        self.finished.set()
+        if self.fail:
+            raise requests.exceptions.ConnectionError("{} unreachable".format(self.name))
+        return {'temperature': 20.0, 'source': self.name}
+
+
+class HedgedProviderTests(SimpleTestCase):
+    """Tests for HedgedProvider with two local fake providers"""
+
+    def hedged(self, primary, secondary, **kwargs):
+        kwargs.setdefault('default_delay', 0.05)
+        kwargs.setdefault('min_delay', 0.01)
+        return HedgedProvider(primary, secondary, tracker=LatencyTracker(min_samples=5), **kwargs)
+
+    def test_fast_primary_not_hedged(self):
+        """Test that the secondary is not asked when the primary answers in time"""
+        primary, secondary = FakeProvider('primary'), FakeProvider('secondary')
+
+        result = self.hedged(primary, secondary).fetch_current(0, 0)
+
+        self.assertEqual(result['source'], 'primary')
+        self.assertEqual(secondary.calls, 0)
+
+    def test_slow_primary_hedged(self):
+        """Test that the secondary answers when the primary exceeds the hedge delay"""
+        primary, secondary = FakeProvider('primary', delay=0.5), FakeProvider('secondary')
+
+        start = time.perf_counter()
+        result = self.hedged(primary, secondary).fetch_current(0, 0)
+
+        self.assertEqual(result['source'], 'secondary')
+        self.assertLess(time.perf_counter() - start, 0.4)
+
+    def test_slow_primary_still_wins_if_first(self):
+        """Test that a hedged primary answering before the secondary wins"""
+        primary, secondary = FakeProvider('primary', delay=0.1), FakeProvider('secondary', delay=0.5)
+
+        result = self.hedged(primary, secondary).fetch_current(0, 0)
+
+        self.assertEqual(result['source'], 'primary')
+        self.assertEqual(secondary.calls, 1)
+
+    def test_failing_primary_hedged_immediately(self):
+        """Test that a primary error goes to the secondary without waiting"""
+        primary, secondary = FakeProvider('primary', fail=True), FakeProvider('secondary')
+
+        start = time.perf_counter()
+        result = self.hedged(primary, secondary, default_delay=1.0).fetch_current(0, 0)
+
+        self.assertEqual(result['source'], 'secondary')
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_both_failing_raises(self):
+        """Test that the error is raised when both providers fail"""
+        provider = self.hedged(FakeProvider('primary', fail=True), FakeProvider('secondary', fail=True))
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            provider.fetch_current(0, 0)
+
+    def test_busy_primary_pool_goes_to_secondary(self):
+        """Test that calls do not queue behind primary calls hanging in its pool"""
+        primary, secondary = FakeProvider('hanging', delay=0.5), FakeProvider('standby')
+        provider = self.hedged(primary, secondary, default_delay=1.0, pool_size=1)
+        waiting = threading.Thread(target=provider.fetch_current, args=(0, 0))
+        waiting.start()
+        self.addCleanup(waiting.join)
+        time.sleep(0.05)
+
+        start = time.perf_counter()
+        result = provider.fetch_current(0, 0)
+
+        self.assertEqual(result['source'], 'standby')
+        self.assertEqual(primary.calls, 1)
+        self.assertLess(time.perf_counter() - start, 0.2)
+
+    def test_slow_providers_bounded_by_timeout(self):
+        """Test that a call fails after the timeout even if no provider answers"""
+        provider = self.hedged(FakeProvider('stalled', delay=0.5), FakeProvider('stalled-too', delay=0.5),
+                               timeout=0.1)
+
+        start = time.perf_counter()
+        with self.assertRaises(requests.exceptions.Timeout):
+            provider.fetch_current(0, 0)
+
+        self.assertLess(time.perf_counter() - start, 0.3)
+
+    def test_delay_follows_primary_p95(self):
+        """Test that the hedge delay is the primary's observed p95 latency"""
+        primary = FakeProvider('primary', delay=0.02)
+        provider = self.hedged(primary, FakeProvider('secondary'), default_delay=1.0, max_delay=2.0)
+        self.assertEqual(provider.hedge_delay(), 1.0)
+
+        for _ in range(5):
+            primary.finished.clear()
+            provider.fetch_current(0, 0)
+            primary.finished.wait(1)
+        time.sleep(0.05)
+
+        self.assertGreaterEqual(provider.hedge_delay(), 0.02)
+        self.assertLess(provider.hedge_delay(), 0.2)
+
+
+class OpenMeteoProviderTests(SimpleTestCase):
+    """Tests for normalizing Open-Meteo responses"""
+
+    def test_parse_current(self):
+        """Test that current weather is mapped to the normalized schema"""
+        data = {
+            'location': 'Reinach, CH',
+            'current': {
+                'time': 1760000000, 'temperature_2m': 12.5, 'apparent_temperature': 11.0,
+                'relative_humidity_2m': 80, 'wind_speed_10m': 14.4, 'precipitation': 0.2,
+                'weather_code': 61, 'is_day': 0,
+            },
+        }
+
+        current = OpenMeteoProvider().parse_current(data)
+
+        self.assertEqual(current['wind_speed'], 14.4)
+        self.assertEqual(current['description'], 'light rain')
+        self.assertEqual(current['icon'], '10n')
+        self.assertEqual(current['location'], 'Reinach, CH')
+
+    def test_parse_forecast_in_three_hour_periods(self):
+        """Test that hourly values are combined into 3-hour periods"""
+        hours = 6
+        data = {'hourly': {
+            'time': [1760000000 + 3600 * hour for hour in range(hours)],
+            'temperature_2m': [10.0 + hour for hour in range(hours)],
+            'apparent_temperature': [9.0] * hours,
+            'relative_humidity_2m': [70] * hours,
+            'wind_speed_10m': [10.0] * hours,
+            'precipitation': [0.5, None, 1.0, 0, 0, 0.25],
+            'weather_code': [3] * hours,
+        }}
+
+        forecast = OpenMeteoProvider().parse_forecast(data)
+
+        self.assertEqual(len(forecast), 2)
+        self.assertEqual(forecast[1]['temperature'], 13.0)
+        self.assertEqual(forecast[0]['precipitation'], 1.5)
+        self.assertEqual(forecast[1]['precipitation'], 0.25)
+
+
+class ProviderSettingsTests(SimpleTestCase):
+    """Tests for building the provider from the settings"""
+
+    def test_default_is_openweathermap(self):
+        """Test that no hedging is configured by default"""
+        self.assertEqual(WeatherService().provider.name, 'openweathermap')
+
+    def test_secondary_provider_enables_hedging(self):
+        """Test that WEATHER_SECONDARY_PROVIDER wraps OpenWeatherMap in a HedgedProvider"""
+        with self.settings(WEATHER_SECONDARY_PROVIDER='openmeteo', WEATHER_HEDGE_DELAY=0.3):
+            provider = WeatherService().provider
+
+        self.assertIsInstance(provider, HedgedProvider)
+        self.assertEqual(provider.secondary.name, 'openmeteo')
+        self.assertEqual(provider.default_delay, 0.3)
@@ -0,0 +1,165 @@
+"""
+Tests for the materialized recommendation table
+"""
+
+from datetime import datetime, timedelta, timezone
+from django.test import TestCase
+from django.urls import reverse
+from unittest.mock import patch
+
+from . import recommendations
+from .models import MaterializedRecommendation
+from .services import recommendations as recommendations_module
+from .services.cache import LRUCache
+from .services.recommendations import RecommendationTable
+from .services.weather_service import WeatherService
+from .testing import WeatherServiceTestCase, make_forecast_payload
+
+BASEL = (47.5596, 7.5886)
+ZURICH = (47.3769, 8.5417)
+# First hour of the fake forecast (1760000000 is 08:53:20 UTC)
+FIRST_HOUR = datetime(2025, 10, 9, 8, 0, tzinfo=timezone.utc)
+
+
+def make_recommendations(suitable):
+    return [
+        {'timestamp': FIRST_HOUR + timedelta(hours=hour), 'recommendations': {
+            'running': {'recommended': recommended}, 'cycling': {'recommended': False},
+        }}
+        for hour, recommended in enumerate(suitable)
+    ]
+
+
+class RecommendationTableTests(TestCase):
+    """Tests for RecommendationTable"""
+
+    def setUp(self):
+        self.table = RecommendationTable()
+        self.table.refresh('a', BASEL, 'v1', make_recommendations([True, True, True]))
+        self.table.refresh('b', ZURICH, 'v1', make_recommendations([False, True, True]))
+
+    def test_all_hours_must_be_suitable(self):
+        """Test that only locations suitable for every hour of the range match"""
+        matches = self.table.suitable_locations('running', FIRST_HOUR, FIRST_HOUR + timedelta(hours=2))
+        later = self.table.suitable_locations(
+            'running', FIRST_HOUR + timedelta(hours=1), FIRST_HOUR + timedelta(hours=3)
+        )
+
+        self.assertEqual([location for location, _, _ in matches], [BASEL])
+        self.assertEqual([location for location, _, _ in later], [ZURICH, BASEL])
+        self.assertEqual(self.table.suitable_locations('cycling', FIRST_HOUR, FIRST_HOUR + timedelta(hours=1)), [])
+
+    def test_refresh_replaces_index_entries(self):
+        """Test that refreshed recommendations no longer match their old hours"""
+        self.table.refresh('a', BASEL, 'v2', make_recommendations([False, False, True]))
+
+        matches = self.table.suitable_locations('running', FIRST_HOUR, FIRST_HOUR + timedelta(minutes=30))
+
+        self.assertEqual(matches, [])
+        self.assertIsNone(self.table.get('a', 'v1'))
+        self.assertEqual(len(self.table.get('a', 'v2')), 3)
+
+    def test_unbounded_range_stops_at_forecast_end(self):
+        """Test that ranges past the cached hours are answered without visiting every hour"""
+        far_future = datetime(9999, 1, 1, tzinfo=timezone.utc)
+
+        with patch('weather_app.services.recommendations._hour', wraps=recommendations_module._hour) as hour:
+            matches = self.table.suitable_locations('running', FIRST_HOUR, far_future)
+
+        self.assertEqual(matches, [])
+        self.assertEqual(hour.call_count, 1)
+
+    def test_oldest_rows_dropped_beyond_max_rows(self):
+        """Test that a full table drops the rows refreshed longest ago"""
+        table = RecommendationTable(max_rows=2)
+        for key in ('a', 'b', 'a', 'c'):
+            table.refresh(key, BASEL, 'v1', make_recommendations([True]))
+
+        self.assertEqual(len(table), 2)
+        self.assertIsNone(table.get('b'))
+        self.assertEqual(
+            [key for _, key, _ in table.suitable_locations('running', FIRST_HOUR, FIRST_HOUR + timedelta(hours=1))],
+            ['a', 'c']
+        )
+
+    def test_empty_range(self):
+        """Test that a range ending at its start matches nothing"""
+        self.assertEqual(self.table.suitable_locations('running', FIRST_HOUR, FIRST_HOUR), [])
+
+
+class MaterializedRecommendationTests(WeatherServiceTestCase, TestCase):
+    """Tests for recommendations materialized when forecasts are cached"""
+
+    def setUp(self):
+        super().setUp()
+        recommendations.table.clear()
+        self.addCleanup(recommendations.table.clear)
+
+    def fetch(self, location, base_temp):
+        self.upstream.forecast = make_forecast_payload(base_temp=base_temp)
+        WeatherService().get_forecast_hourly(location)
+
+    def test_query_answered_from_table(self):
+        """Test that locations are found without evaluating any forecast"""
+        self.fetch(BASEL, 15.0)
+        self.fetch(ZURICH, 0.0)
+
+        with patch('weather_app.services.sport_service.SportRecommendationService._evaluate_sport') as evaluate:
+            response = self.client.get(reverse('api_suitable_locations'), {
+                'sport': 'running', 'start': '2025-10-09T10:00:00Z', 'end': '2025-10-09T12:00:00Z',
+            })
+
+        self.assertEqual(response.json()['locations'], [{'lat': BASEL[0], 'lon': BASEL[1]}])
+        evaluate.assert_not_called()
+
+    def test_api_serves_materialized_rows(self):
+        """Test that the recommendations API reuses the materialized forecast"""
+        self.client.get(reverse('api_recommendations'))
+
+        with patch.object(recommendations.SportRecommendationService, 'get_recommendations_for_forecast') as evaluate:
+            response = self.client.get(reverse('api_recommendations'))
+
+        self.assertEqual(len(response.json()['forecast']), 24)
+        evaluate.assert_not_called()
+
+    def test_expired_forecasts_dropped(self):
+        """Test that rows of forecasts no longer cached are not returned"""
+        self.fetch(BASEL, 15.0)
+        WeatherService().clear_cache()
+
+        self.assertEqual(recommendations.suitable_locations('running', FIRST_HOUR, FIRST_HOUR + timedelta(hours=1)), [])
+        self.assertEqual(len(recommendations.table), 0)
+
+    def test_evicted_forecast_row_removed(self):
+        """Test that the row of a forecast evicted from the cache does not stay in memory"""
+        cache = LRUCache(max_entries=4)
+        table = RecommendationTable(max_rows=cache.max_entries)
+        with patch.object(WeatherService, '_shared_cache', cache), patch.object(recommendations, 'table', table):
+            for number in range(5):
+                self.fetch((BASEL[0] + number, BASEL[1]), 15.0)
+        basel_key = WeatherService.HOURLY_CACHE_KEY + '@{:.4f},{:.4f}'.format(*BASEL)
+
+        self.assertNotIn(basel_key, cache)
+        self.assertIsNone(table.get(basel_key))
+        self.assertEqual(len(table), 4)
+
+    def test_persisted_rows_replaced(self):
+        """Test that persisted hours are replaced on refresh, not duplicated"""
+        with self.settings(WEATHER_RECOMMENDATIONS_PERSIST=True):
+            self.fetch(BASEL, 15.0)
+            WeatherService().clear_cache()
+            self.fetch(BASEL, 0.0)
+
+        rows = MaterializedRecommendation.objects.filter(sport='running')
+        self.assertEqual(rows.count(), 24)
+        self.assertFalse(rows.filter(recommended=True).exists())
+
+    def test_invalid_query(self):
+        """Test that unknown sports and missing times are rejected"""
+        response = self.client.get(reverse('api_suitable_locations'), {'sport': 'rowing', 'start': 'x'})
+        reversed_range = self.client.get(reverse('api_suitable_locations'), {
+            'sport': 'running', 'start': '2025-10-09T12:00:00Z', 'end': '2025-10-09T12:00:00',
+        })
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(reversed_range.status_code, 400)
@@ -0,0 +1,99 @@
+"""
+Tests for the forecast revision store
+"""
+
+from datetime import datetime, timedelta, timezone
+from django.test import TestCase
+from unittest.mock import patch
+
+from .models import ForecastFetch, ForecastRevision
+from .revisions import forecast_as_issued, record_forecast, revision_history
+from .services.weather_service import WeatherService
+from .testing import WeatherServiceTestCase
+
+ISSUED = datetime(2025, 10, 9, 9, 0, tzinfo=timezone.utc)
+TARGET = datetime(2025, 10, 9, 12, 0, tzinfo=timezone.utc)
+BASEL_KEY = 'forecast_24h@47.5596,7.5886'
+
+
+def make_periods(first, temperatures):
+    return [
+        {'timestamp': TARGET + timedelta(hours=3 * (first + number)), 'temperature': temperature,
+         'feels_like': temperature - 1, 'humidity': 70, 'wind_speed': 12.0, 'precipitation': 0.0,
+         'description': 'few clouds', 'icon': '02d'}
+        for number, temperature in enumerate(temperatures)
+    ]
+
+
+class RevisionStoreTests(TestCase):
+    """Tests for recording and reconstructing forecast revisions"""
+
+    def record(self, hours, periods, key=BASEL_KEY):
+        with patch('weather_app.revisions.timezone.now', return_value=ISSUED + timedelta(hours=hours)):
+            record_forecast(key, periods, 'v')
+
+    def setUp(self):
+        self.record(0, make_periods(0, [14.0, 16.0, 15.0]))
+        # Three hours later: the first period dropped, one revised, one new
+        self.record(3, make_periods(1, [16.0, 13.5, 11.0]))
+
+    def test_only_changes_written(self):
+        """Test that unchanged values and periods get no new rows"""
+        revisions = ForecastRevision.objects.filter(issued_at=ISSUED + timedelta(hours=3))
+
+        self.assertEqual(revisions.count(), 2)
+        revised = revisions.get(target_time=TARGET + timedelta(hours=6))
+        self.assertEqual(revised.temperature, 13.5)
+        self.assertEqual(revised.feels_like, 12.5)
+        self.assertIsNone(revised.wind_speed)
+        self.assertIsNone(revised.description)
+
+    def test_identical_fetch_writes_no_revisions(self):
+        """Test that refetching the same forecast only logs the fetch"""
+        self.record(4, make_periods(1, [16.0, 13.5, 11.0]))
+
+        self.assertEqual(ForecastRevision.objects.count(), 5)
+        self.assertEqual(ForecastFetch.objects.count(), 3)
+
+    def test_forecast_as_issued(self):
+        """Test that any past fetch is reconstructed in full"""
+        first = forecast_as_issued((47.5596, 7.5886), ISSUED + timedelta(hours=1))
+        second = forecast_as_issued((47.5596, 7.5886))
+
+        self.assertEqual([period['temperature'] for period in first['forecast']], [14.0, 16.0, 15.0])
+        self.assertEqual([period['temperature'] for period in second['forecast']], [16.0, 13.5, 11.0])
+        self.assertEqual(second['forecast'][0]['timestamp'], TARGET + timedelta(hours=3))
+        self.assertEqual(second['forecast'][0]['description'], 'few clouds')
+        self.assertIsNone(forecast_as_issued((47.5596, 7.5886), ISSUED - timedelta(hours=1)))
+
+    def test_revision_history(self):
+        """Test the delta history of one target time"""
+        history = revision_history((47.5596, 7.5886), TARGET + timedelta(hours=6))
+
+        self.assertEqual([revision['issued_at'] for revision in history],
+                         [ISSUED, ISSUED + timedelta(hours=3)])
+        self.assertEqual(history[1]['changes'], {'temperature': 13.5, 'feels_like': 12.5})
+        self.assertEqual(history[1]['values']['wind_speed'], 12.0)
+        self.assertEqual(history[0]['values']['temperature'], 15.0)
+
+    def test_locations_kept_apart(self):
+        """Test that revisions of the default location are stored separately"""
+        self.record(3, make_periods(1, [16.0, 13.5, 11.0]), key=WeatherService.FORECAST_CACHE_KEY)
+
+        reinach = forecast_as_issued((WeatherService.REINACH_LAT, WeatherService.REINACH_LON))
+        self.assertEqual(len(reinach['forecast']), 3)
+        self.assertEqual(ForecastRevision.objects.filter(latitude=WeatherService.REINACH_LAT).count(), 3)
+
+
+class RevisionListenerTests(WeatherServiceTestCase, TestCase):
+    """Tests for recording revisions of fetched forecasts"""
+
+    def test_fetched_forecast_recorded(self):
+        """Test that the update listener records each forecast fetch"""
+        WeatherService.add_update_listener(record_forecast)
+        self.addCleanup(WeatherService.remove_update_listener, record_forecast)
+
+        self.service.get_forecast_24h()
+
+        self.assertEqual(ForecastFetch.objects.count(), 1)
+        self.assertEqual(ForecastRevision.objects.count(), 8)
@@ -0,0 +1,159 @@
+"""
+Tests for route evaluation
+"""
+
+from datetime import datetime, timedelta, timezone
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from .services.route import decode_polyline, evaluate_route, sample_route, tile_center
+from .services.spatial import haversine_km
+from .services.weather_service import WeatherService
+from .testing import WeatherServiceTestCase
+
+# First hour of the fake forecast (1760000000 is 08:53:20 UTC)
+DEPARTURE = datetime(2025, 10, 9, 9, 0, tzinfo=timezone.utc)
+
+
+def encode_polyline(points):
+    encoded = []
+    previous = (0, 0)
+    for point in points:
+        current = (int(round(point[0] * 1e5)), int(round(point[1] * 1e5)))
+        for value in (current[0] - previous[0], current[1] - previous[1]):
+            value = ~(value << 1) if value < 0 else value << 1
+            while value >= 0x20:
+                encoded.append(chr((0x20 | (value & 0x1f)) + 63))
+                value >>= 5
+            encoded.append(chr(value + 63))
+        previous = current
+    return ''.join(encoded)
+
+
+def straight_route(count, start=(47.50, 7.55), end=(47.60, 7.65)):
+    return [
+        (start[0] + (end[0] - start[0]) * number / (count - 1),
+         start[1] + (end[1] - start[1]) * number / (count - 1))
+        for number in range(count)
+    ]
+
+
+class RouteGeometryTests(SimpleTestCase):
+    """Tests for polyline decoding, sampling and tiles"""
+
+    def test_decode_polyline(self):
+        """Test decoding the reference polyline of the encoding's documentation"""
+        points = decode_polyline('_p~iF~ps|U_ulLnnqC_mqNvxq`@')
+
+        self.assertEqual(points, [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)])
+
+    def test_decode_invalid_polyline(self):
+        """Test that truncated polylines are rejected"""
+        with self.assertRaises(ValueError):
+            decode_polyline('_p~iF~ps|U_')
+
+    def test_samples_cover_start_and_end(self):
+        """Test that samples are evenly spaced and include both ends"""
+        points = straight_route(50)
+        length = sum(haversine_km(*a, *b) for a, b in zip(points, points[1:]))
+
+        samples = sample_route(points, 2.0)
+
+        self.assertEqual(samples[0], (0.0, 47.50, 7.55))
+        self.assertAlmostEqual(samples[-1][0], length)
+        self.assertEqual(samples[-1][1:], points[-1])
+        self.assertEqual([distance for distance, _, _ in samples[1:-1]], [2.0 * n for n in range(1, len(samples) - 1)])
+
+    def test_nearby_points_share_a_tile(self):
+        """Test that points close together map to the same tile centre"""
+        self.assertEqual(tile_center(47.501, 7.551, 10.0), tile_center(47.502, 7.553, 10.0))
+        self.assertNotEqual(tile_center(47.501, 7.551, 10.0), tile_center(47.7, 7.551, 10.0))
+
+
+class EvaluateRouteTests(WeatherServiceTestCase):
+    """Tests for evaluate_route and the route API"""
+
+    def fetch(self, tile):
+        self.fetched.append(tile)
+        return self.forecasts.get(tile, [])
+
+    def test_each_tile_fetched_once(self):
+        """Test that a route of hundreds of points needs only a few upstream calls"""
+        response = self.client.get(reverse('api_route'), {
+            'polyline': encode_polyline(straight_route(400)), 'start': DEPARTURE.isoformat(),
+        })
+        route = response.json()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(len(route['samples']), 5)
+        self.assertLessEqual(route['tiles'], 4)
+        self.assertEqual(len(self.upstream.calls), route['tiles'])
+        self.assertTrue(route['recommended'])
+
+    def test_samples_use_forecast_at_arrival(self):
+        """Test that each sample is evaluated with the forecast at its arrival time"""
+        self.fetched = []
+        self.forecasts = {}
+        points = straight_route(10)
+        tile = tile_center(*points[0], 10.0)
+        self.forecasts[tile_center(*points[-1], 10.0)] = self.forecasts[tile] = [
+            {'timestamp': DEPARTURE + timedelta(hours=hour), 'temperature': 20.0 + 10 * hour,
+             'feels_like': 20.0, 'humidity': 60, 'wind_speed': 10.0, 'precipitation': 0.0,
+             'description': '', 'icon': ''}
+            for hour in range(3)
+        ]
+
+        route = evaluate_route(points, DEPARTURE, self.fetch, speed_kmh=13.4)
+
+        self.assertTrue(route['samples'][0]['recommended'])
+        # About an hour later it is 30 °C, too hot for cycling
+        self.assertFalse(route['samples'][-1]['recommended'])
+        self.assertFalse(route['recommended'])
+        self.assertEqual(len(self.fetched), route['tiles'])
+
+    def test_outside_forecast_unknown(self):
+        """Test that arrivals after the forecast make the overall result unknown"""
+        response = self.client.get(reverse('api_route'), {
+            'polyline': encode_polyline(straight_route(20)), 'start': '2025-10-10T08:30:00Z',
+        })
+        route = response.json()
+
+        self.assertIsNone(route['recommended'])
+        self.assertIsNone(route['samples'][-1]['weather'])
+
+    def test_long_route_rejected_before_fetching(self):
+        """Test that routes over the length or tile limits cost no upstream calls"""
+        long_route = self.client.get(reverse('api_route'), {
+            'polyline': encode_polyline([(47.5, 7.6), (51.0, 9.0)]), 'start': DEPARTURE.isoformat(),
+        })
+        with self.settings(WEATHER_ROUTE_MAX_TILES=2):
+            many_tiles = self.client.get(reverse('api_route'), {
+                'polyline': encode_polyline(straight_route(50)), 'start': DEPARTURE.isoformat(),
+            })
+
+        self.assertEqual(long_route.status_code, 400)
+        self.assertIn('longer than', long_route.json()['error'])
+        self.assertEqual(many_tiles.status_code, 400)
+        self.assertEqual(self.upstream.calls, [])
+
+    def test_tile_reuses_forecast_cached_nearby(self):
+        """Test that a forecast cached inside a tile serves the whole tile"""
+        points = [(47.501, 7.551), (47.503, 7.553)]
+        WeatherService().get_forecast_24h(points[0])
+
+        response = self.client.get(reverse('api_route'), {
+            'polyline': encode_polyline(points), 'start': DEPARTURE.isoformat(),
+        })
+
+        self.assertEqual(response.json()['tiles'], 1)
+        self.assertEqual(len(self.upstream.calls), 1)
+
+    def test_invalid_route(self):
+        """Test that invalid polylines and speeds are rejected"""
+        invalid = self.client.get(reverse('api_route'), {'polyline': '_p~iF~ps|U_'})
+        too_slow = self.client.get(reverse('api_route'), {
+            'polyline': encode_polyline(straight_route(2)), 'speed': '0',
+        })
+
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(too_slow.status_code, 400)
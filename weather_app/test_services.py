@@ -0,0 +1,98 @@
+"""
+Tests for the weather service
+"""
+
+import json
+import time
+from datetime import datetime
+
+from .services.providers import OpenMeteoProvider, OpenWeatherMapProvider
+from .services.weather_service import WeatherService
+from .testing import WeatherServiceTestCase, make_current_payload, make_forecast_payload
+
+
+class ChartPayloadTests(WeatherServiceTestCase):
+    """Tests for the columnar forecast chart payload"""
+
+    def test_payload_is_columnar(self):
+        """Test that the payload holds one array per series plus t0 and step"""
+        payload = json.loads(self.service.get_forecast_chart_json())
+
+        self.assertEqual(payload['t0'], 1760000000)
+        self.assertEqual(payload['step'], 3600)
+        self.assertNotIn('timestamps', payload)
+        self.assertEqual(len(payload['temperature']), 24)
+        self.assertEqual(len(payload['wind_speed']), 24)
+        self.assertEqual(payload['wind_speed'][0], 7.2)
+
+    def test_payload_serialized_once(self):
+        """Test that the serialized payload is reused from the cache"""
+        first = self.service.get_forecast_chart_json()
+        second = WeatherService().get_forecast_chart_json()
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self.upstream.calls), 1)
+
+    def test_uneven_periods_include_timestamps(self):
+        """Test that explicit timestamps are sent when periods are uneven"""
+        forecast = make_forecast_payload(periods=3)
+        forecast['list'][2]['dt'] += 600
+
+        payload = json.loads(self.service._build_chart_json(self.service._parse_forecast(forecast)))
+
+        self.assertIsNone(payload['step'])
+        self.assertEqual(payload['timestamps'][2], 1760000000 + 2 * 10800 + 600)
+
+
+class FreshnessTTLTests(WeatherServiceTestCase):
+    """Tests for cache lifetimes derived from the data timestamps"""
+
+    def ttl(self, key):
+        entry = self.service._cache.get(key)
+        return (entry['expires_at'] - entry['timestamp']).total_seconds()
+
+    def test_current_cached_until_next_observation(self):
+        """Test that observations are cached until the next one is expected"""
+        self.upstream.current = make_current_payload(dt=int(time.time()) - 240)
+
+        self.service.get_current_weather()
+
+        self.assertAlmostEqual(self.ttl(WeatherService.CURRENT_CACHE_KEY), 360, delta=5)
+
+    def test_forecast_cached_until_next_model_run(self):
+        """Test that the forecast and chart are cached until the next model run is published"""
+        self.upstream.forecast = make_forecast_payload(start_dt=int(time.time()) - 3600)
+
+        self.service.get_forecast_chart_json()
+
+        expected = max(60, 10800 - time.time() % 10800)
+        self.assertAlmostEqual(self.ttl(WeatherService.FORECAST_CACHE_KEY), expected, delta=5)
+        self.assertAlmostEqual(self.ttl(WeatherService.CHART_CACHE_KEY), expected, delta=5)
+
+    def test_next_model_run_follows_provider_schedule(self):
+        """Test that model runs are aligned to the provider's interval"""
+        now = datetime(2025, 10, 9, 8, 53)
+
+        self.assertEqual(OpenWeatherMapProvider('key').next_model_run(now), datetime(2025, 10, 9, 9, 0))
+        self.assertEqual(OpenMeteoProvider().next_model_run(now), datetime(2025, 10, 9, 9, 0))
+        self.assertEqual(OpenMeteoProvider().next_model_run(datetime(2025, 10, 9, 9, 0)), datetime(2025, 10, 9, 10, 0))
+
+    def test_late_observation_backs_off(self):
+        """Test that late observations are cached as long as they are late, up to the interval"""
+        self.upstream.current = make_current_payload(dt=int(time.time()) - 720)
+        self.service.get_current_weather()
+        slightly_late = self.ttl(WeatherService.CURRENT_CACHE_KEY)
+
+        self.service.clear_cache()
+        self.upstream.current = make_current_payload(dt=int(time.time()) - 3600)
+        self.service.get_current_weather()
+
+        self.assertAlmostEqual(slightly_late, 120, delta=5)
+        self.assertAlmostEqual(self.ttl(WeatherService.CURRENT_CACHE_KEY), 600, delta=1)
+
+    def test_fixed_duration_setting(self):
+        """Test that WEATHER_CACHE_DURATION overrides the data-derived TTL"""
+        with self.settings(WEATHER_CACHE_DURATION=5):
+            WeatherService().get_current_weather()
+
+        self.assertAlmostEqual(self.ttl(WeatherService.CURRENT_CACHE_KEY), 5, delta=1)
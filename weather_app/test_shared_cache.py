@@ -0,0 +1,166 @@
+"""
+Tests for the cross-process shared-memory cache
+"""
+
+import multiprocessing
+import os
+import tempfile
+import unittest
+from django.test import SimpleTestCase
+from unittest.mock import patch
+
+from .services.cache import LRUCache, TieredCache
+from .services.shared_cache import SharedMemoryCache, fcntl
+from .services.weather_service import WeatherService
+from .testing import FakeUpstream
+
+
+@unittest.skipIf(fcntl is None, "POSIX file locks not available")
+class SharedMemoryCacheTests(SimpleTestCase):
+    """Tests for SharedMemoryCache"""
+
+    def setUp(self):
+        """Create a temporary cache file"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'cache')
+
+    def open_cache(self, **kwargs):
+        kwargs.setdefault('secret', b'test')
+        cache = SharedMemoryCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_entries_visible_to_other_instances(self):
+        """Test that a second mapping of the file sees the same entries"""
+        writer = self.open_cache()
+        reader = self.open_cache()
+        writer.set('current_weather', {'data': [1, 2, 3]}, ttl=60)
+
+        self.assertEqual(reader.get('current_weather'), {'data': [1, 2, 3]})
+        reader.delete('current_weather')
+        self.assertIsNone(writer.get('current_weather'))
+
+    def test_expiry(self):
+        """Test that entries expire after their TTL"""
+        cache = self.open_cache()
+        with patch('weather_app.services.shared_cache.time.time', return_value=1000.0):
+            cache.set('key', 'value', ttl=10)
+        with patch('weather_app.services.shared_cache.time.time', return_value=1010.0):
+            self.assertIsNone(cache.get('key'))
+
+    def test_colliding_keys_do_not_mix(self):
+        """Test that a key sharing a slot with another is never returned for it"""
+        cache = self.open_cache(slots=1)
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 2)
+
+    def test_colliding_keys_probe_next_slot(self):
+        """Test that colliding keys both stay cached while their probe group has room"""
+        cache = self.open_cache(slots=4, probes=2)
+        keys = ['key{}'.format(number) for number in range(100)]
+        home = {key: cache._slot_offsets(cache._key_hash(key))[0] for key in keys}
+        first = keys[0]
+        second = next(key for key in keys[1:] if home[key] == home[first])
+        cache.set(first, 1)
+        cache.set(second, 2)
+        cache.set(first, 3)
+
+        self.assertEqual(cache.get(first), 3)
+        self.assertEqual(cache.get(second), 2)
+        self.assertEqual(cache.stats()['entries'], 2)
+
+    def test_unauthenticated_entries_ignored(self):
+        """Test that entries written with another secret are never unpickled"""
+        self.open_cache(secret=b'other').set('key', 'value')
+
+        with patch('weather_app.services.shared_cache.pickle.loads') as loads:
+            self.assertIsNone(self.open_cache().get('key'))
+        loads.assert_not_called()
+
+    def test_oversized_value_skipped(self):
+        """Test that values larger than a slot are not stored"""
+        cache = self.open_cache(slot_size=256)
+        cache.set('key', 'x' * 1000)
+
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_layout_change_resets_file(self):
+        """Test that reopening with a different layout starts empty"""
+        self.open_cache().set('key', 'value')
+
+        self.assertIsNone(self.open_cache(slots=32).get('key'))
+
+    def test_layout_change_keeps_old_mapping_valid(self):
+        """Test that a new layout replaces the file instead of truncating a mapped one"""
+        old = self.open_cache()
+        old.set('key', 'value')
+
+        new = self.open_cache(slots=32)
+        new.set('key', 'new value')
+
+        self.assertEqual(old.get('key'), 'value')
+        self.assertEqual(old.stats()['slots'], 64)
+        self.assertEqual(new.get('key'), 'new value')
+
+
+def _fetch_in_worker(barrier):
+    """Child process: fetch current weather and forecast once the barrier opens"""
+    WeatherService._shared_cache = None
+    barrier.wait()
+    service = WeatherService()
+    ok = service.get_current_weather() is not None and service.get_forecast_24h() is not None
+    os._exit(0 if ok else 1)
+
+
+@unittest.skipIf(fcntl is None or 'fork' not in multiprocessing.get_all_start_methods(),
+                 "fork and POSIX file locks required")
+class CrossProcessFetchTests(SimpleTestCase):
+    """Tests for WeatherService sharing fetches between worker processes"""
+
+    def test_one_upstream_fetch_per_ttl(self):
+        """Test that concurrent workers fetch each endpoint only once"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        context = multiprocessing.get_context('fork')
+        calls = context.Value('i', 0)
+        upstream = FakeUpstream()
+
+        def counting_get(url, params=None, timeout=None):
+            with calls.get_lock():
+                calls.value += 1
+            return upstream(url, params=params, timeout=timeout)
+
+        workers = 4
+        barrier = context.Barrier(workers)
+        with self.settings(WEATHER_SHARED_CACHE_PATH=os.path.join(directory.name, 'cache')), \
+                patch('weather_app.services.weather_service.requests.get', new=counting_get):
+            processes = [context.Process(target=_fetch_in_worker, args=(barrier,)) for _ in range(workers)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join(30)
+
+        self.assertEqual([process.exitcode for process in processes], [0] * workers)
+        # One current weather and one forecast fetch for all workers together
+        self.assertEqual(calls.value, 2)
+
+    def test_tiered_cache_configured_from_settings(self):
+        """Test that WEATHER_SHARED_CACHE_PATH puts the shared cache behind the LRU"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        previous = WeatherService._shared_cache
+        self.addCleanup(setattr, WeatherService, '_shared_cache', previous)
+        WeatherService._shared_cache = None
+
+        with self.settings(WEATHER_SHARED_CACHE_PATH=os.path.join(directory.name, 'cache')):
+            cache = WeatherService()._cache
+
+        self.assertIsInstance(cache, TieredCache)
+        self.assertIsInstance(cache.l1, LRUCache)
+        self.assertIsInstance(cache.l2, SharedMemoryCache)
+        cache.l2.close()
@@ -0,0 +1,173 @@
+"""
+Tests for offline weather snapshots
+"""
+
+import os
+import tempfile
+import time
+import requests
+from django.test import TestCase
+from django.urls import reverse
+from unittest.mock import patch
+
+from .services import snapshot
+from .services.snapshot import SnapshotStore
+from .services.weather_service import WeatherService
+from .testing import EmptyWeatherCacheMixin, FakeUpstream, make_current_payload, make_forecast_payload
+
+
+def unreachable(url, params=None, timeout=None):
+    raise requests.exceptions.ConnectionError("network unreachable")
+
+
+class SnapshotStoreTests(TestCase):
+    """Tests for reading and writing snapshot files"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'weather.snapshot')
+
+    def test_round_trip(self):
+        """Test that flushed entries are loaded by a new store"""
+        store = SnapshotStore(self.path, interval=0)
+        store.update('current_weather', {'data': {'temperature': 12.0}, 'version': 'abc'})
+
+        loaded = SnapshotStore(self.path).get('current_weather')
+
+        self.assertEqual(loaded['data'], {'temperature': 12.0})
+
+    def test_writes_throttled(self):
+        """Test that updates within the interval are only kept in memory"""
+        store = SnapshotStore(self.path, interval=3600)
+        store.update('a', {'data': 1})
+        store.update('b', {'data': 2})
+
+        self.assertIsNone(SnapshotStore(self.path).get('b'))
+        self.assertEqual(store.get('b'), {'data': 2})
+        store.flush()
+        self.assertEqual(SnapshotStore(self.path).get('b'), {'data': 2})
+
+    def test_corrupt_file_ignored(self):
+        """Test that an unreadable file leaves the store empty"""
+        with open(self.path, 'wb') as snapshot_file:
+            snapshot_file.write(b'not a snapshot')
+
+        self.assertEqual(SnapshotStore(self.path).load(), {})
+
+
+class OfflineModeTests(EmptyWeatherCacheMixin, TestCase):
+    """Tests for serving snapshot data when the upstream is unreachable"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = self.settings(
+            WEATHER_SNAPSHOT_PATH=os.path.join(directory.name, 'weather.snapshot'),
+            WEATHER_SNAPSHOT_INTERVAL=0
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(setattr, snapshot, '_store', None)
+        super().setUp()
+
+        # Take a snapshot from a successful fetch
+        upstream = FakeUpstream(
+            current=make_current_payload(temp=21.0, dt=int(time.time())),
+            forecast=make_forecast_payload(start_dt=int(time.time()) + 3600)
+        )
+        with patch('weather_app.services.weather_service.requests.get', new=upstream):
+            service = WeatherService()
+            service.get_current_weather()
+            service.get_forecast_24h()
+        WeatherService().clear_cache()
+        # Start over as a new process would
+        snapshot._store = None
+
+    def test_outage_serves_stale_snapshot(self):
+        """Test that the last known data is served with a staleness marker"""
+        with patch('weather_app.services.weather_service.requests.get', new=unreachable):
+            service = WeatherService()
+            current = service.get_current_weather()
+            forecast = service.get_forecast_24h()
+
+        self.assertEqual(current['temperature'], 21.0)
+        self.assertTrue(current['stale'])
+        self.assertIn('stale_since', current)
+        self.assertEqual(len(forecast), 8)
+
+    def test_outage_api_responses_marked_stale(self):
+        """Test that every API response built from snapshot data is marked"""
+        with patch('weather_app.services.weather_service.requests.get', new=unreachable):
+            responses = [
+                self.client.get(reverse(name)) for name in ('api_current', 'api_forecast', 'api_recommendations')
+            ]
+
+        for response in responses:
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Warning'], '110 - "Response is Stale"')
+            self.assertGreaterEqual(int(response['Age']), 0)
+        self.assertIn('stale_since', responses[1].json())
+        self.assertIn('stale_since', responses[2].json())
+
+    def test_stale_derived_data_not_announced(self):
+        """Test that data derived from a stale forecast does not reach update listeners"""
+        updates = []
+
+        def listener(key, data, version):
+            updates.append(key)
+
+        WeatherService.add_update_listener(listener)
+        self.addCleanup(WeatherService.remove_update_listener, listener)
+        with patch('weather_app.services.weather_service.requests.get', new=unreachable):
+            service = WeatherService()
+            hourly = service.get_forecast_hourly()
+
+        self.assertIsNotNone(hourly)
+        self.assertIsNotNone(service.get_stale_since(WeatherService.HOURLY_CACHE_KEY))
+        self.assertEqual(updates, [])
+
+    def test_outage_index_shows_notice(self):
+        """Test that the index renders snapshot data with an offline notice"""
+        with patch('weather_app.services.weather_service.requests.get', new=unreachable):
+            response = self.client.get(reverse('index'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'stale-notice')
+        self.assertNotContains(response, 'Unable to fetch weather data')
+
+    def test_stale_data_not_refetched_every_request(self):
+        """Test that the upstream is retried only after the stale data expires"""
+        calls = []
+
+        def counting_unreachable(url, params=None, timeout=None):
+            calls.append(url)
+            return unreachable(url)
+
+        with patch('weather_app.services.weather_service.requests.get', new=counting_unreachable):
+            WeatherService().get_current_weather()
+            WeatherService().get_current_weather()
+
+        self.assertEqual(len(calls), 1)
+
+    def test_startup_primes_fresh_entries(self):
+        """Test that fresh snapshot entries are served without any upstream call"""
+        updates = []
+
+        def listener(key, data, version):
+            updates.append(key)
+
+        WeatherService.add_update_listener(listener)
+        self.addCleanup(WeatherService.remove_update_listener, listener)
+        primed = WeatherService().prime_from_snapshot()
+
+        with patch('weather_app.services.weather_service.requests.get', new=unreachable):
+            service = WeatherService()
+            current = service.get_current_weather()
+            chart_json = service.get_forecast_chart_json()
+
+        self.assertEqual(primed, 2)
+        self.assertEqual(updates, [])
+        self.assertEqual(current['temperature'], 21.0)
+        self.assertNotIn('stale', current)
+        self.assertIsNotNone(chart_json)
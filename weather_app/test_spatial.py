@@ -0,0 +1,179 @@
+"""
+Tests for the spatial index and nearby cache reuse
+"""
+
+import random
+import time
+from datetime import timedelta
+from django.test import SimpleTestCase
+from django.urls import reverse
+from unittest.mock import patch
+
+from .services.spatial import GeoGridIndex, haversine_km
+from .services.weather_service import WeatherService
+from .testing import WeatherServiceTestCase
+
+# Basel and points about 300 m and 5 km away
+BASEL = (47.5596, 7.5886)
+NEAR_BASEL = (47.5623, 7.5886)
+FAR_FROM_BASEL = (47.6046, 7.5886)
+
+
+class GeoGridIndexTests(SimpleTestCase):
+    """Tests for GeoGridIndex"""
+
+    def test_within_sorted_by_distance(self):
+        """Test that points within the radius are returned nearest first"""
+        index = GeoGridIndex(cell_km=1.0)
+        index.insert('basel', *BASEL)
+        index.insert('near', *NEAR_BASEL)
+        index.insert('far', *FAR_FROM_BASEL)
+
+        matches = index.within(47.5610, 7.5886, 1.0)
+
+        self.assertEqual([key for _, key in matches], ['near', 'basel'])
+        self.assertAlmostEqual(matches[0][0], haversine_km(47.5610, 7.5886, *NEAR_BASEL))
+
+    def test_radius_larger_than_cell(self):
+        """Test that queries scan every cell overlapping the radius"""
+        index = GeoGridIndex(cell_km=0.5)
+        index.insert('far', *FAR_FROM_BASEL)
+
+        self.assertEqual(index.within(*BASEL, radius_km=5.1)[0][1], 'far')
+        self.assertEqual(index.within(*BASEL, radius_km=4.9), [])
+
+    def test_move_and_remove(self):
+        """Test that reinserting moves a point and removal empties its cell"""
+        index = GeoGridIndex()
+        index.insert('a', *BASEL)
+        index.insert('a', *FAR_FROM_BASEL)
+
+        self.assertEqual(index.within(*BASEL, radius_km=1.0), [])
+        index.remove('a')
+        self.assertEqual(index.stats(), {'points': 0, 'cells': 0})
+
+    def test_max_points_drops_oldest(self):
+        """Test that the oldest insertions are dropped beyond max_points"""
+        index = GeoGridIndex(max_points=2)
+        index.insert('a', *BASEL)
+        index.insert('b', *NEAR_BASEL)
+        index.insert('c', *FAR_FROM_BASEL)
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual([key for _, key in index.within(*BASEL, radius_km=1.0)], ['b'])
+
+    def test_lookup_fast_with_many_points(self):
+        """Test that insertion and lookup stay sub-millisecond with 50k points"""
+        generator = random.Random(42)
+        points = [(generator.uniform(45.8, 47.8), generator.uniform(5.9, 10.5)) for _ in range(50000)]
+        index = GeoGridIndex(cell_km=1.0)
+
+        start = time.perf_counter()
+        for number, (lat, lon) in enumerate(points):
+            index.insert(str(number), lat, lon)
+        insert_seconds = (time.perf_counter() - start) / len(points)
+
+        start = time.perf_counter()
+        for lat, lon in points[:1000]:
+            index.within(lat + 0.001, lon, 1.0)
+        lookup_seconds = (time.perf_counter() - start) / 1000
+
+        self.assertLess(insert_seconds, 0.001)
+        self.assertLess(lookup_seconds, 0.001)
+
+
+class NearbyReuseTests(WeatherServiceTestCase):
+    """Tests for WeatherService answering from data cached nearby"""
+
+    def test_nearby_location_reuses_cached_observation(self):
+        """Test that a location within the radius is served without a fetch"""
+        self.service.get_current_weather(BASEL)
+
+        current = WeatherService().get_current_weather(NEAR_BASEL)
+
+        self.assertEqual(len(self.upstream.calls), 1)
+        self.assertAlmostEqual(current['source_distance_km'], 0.3, delta=0.02)
+
+    def test_exact_location_has_no_distance(self):
+        """Test that exact hits carry no source distance"""
+        self.service.get_current_weather(BASEL)
+        service = WeatherService()
+
+        current = service.get_current_weather("47.5596,7.5886")
+
+        self.assertNotIn('source_distance_km', current)
+        self.assertIsNone(service.get_source(WeatherService.CURRENT_CACHE_KEY)[1])
+
+    def test_entries_of_other_processes_indexed_on_exact_hit(self):
+        """Test that an entry this process did not fetch serves nearby locations once seen"""
+        self.service.get_current_weather(BASEL)
+        # As in a process sharing the cache without having fetched BASEL
+        WeatherService._location_indexes.clear()
+
+        WeatherService().get_current_weather(BASEL)
+        current = WeatherService().get_current_weather(NEAR_BASEL)
+
+        self.assertEqual(len(self.upstream.calls), 1)
+        self.assertIn('source_distance_km', current)
+
+    def test_distant_location_fetched(self):
+        """Test that locations outside the radius get their own fetch"""
+        self.service.get_forecast_24h(BASEL)
+        self.service.get_forecast_24h(FAR_FROM_BASEL)
+
+        self.assertEqual(len(self.upstream.calls), 2)
+        self.assertEqual(self.upstream.calls[1][1]['lat'], FAR_FROM_BASEL[0])
+
+    def test_old_entries_not_reused(self):
+        """Test that entries older than WEATHER_NEARBY_MAX_AGE are not reused"""
+        self.service.get_current_weather(BASEL)
+        entry = self.service._cache.get('current_weather@47.5596,7.5886')
+        entry['timestamp'] -= timedelta(hours=1)
+
+        WeatherService().get_current_weather(NEAR_BASEL)
+
+        self.assertEqual(len(self.upstream.calls), 2)
+
+    def test_default_location_keeps_plain_keys(self):
+        """Test that Reinach BL is cached under the plain cache keys"""
+        self.service.get_forecast_chart_json()
+
+        self.assertIsNotNone(self.service.get_cache_version(WeatherService.FORECAST_CACHE_KEY))
+        self.assertIsNotNone(self.service.get_cache_version(WeatherService.CHART_CACHE_KEY))
+
+    def test_invalid_location_rejected(self):
+        """Test that unparseable or out-of-range locations raise ValueError"""
+        with self.assertRaises(ValueError):
+            self.service.get_current_weather("basel")
+        with self.assertRaises(ValueError):
+            self.service.get_current_weather((95, 7))
+
+
+class LocationAPITests(WeatherServiceTestCase):
+    """Tests for the lat/lon query parameters of the API"""
+
+    def test_api_current_for_location(self):
+        """Test that the API fetches and reports the requested location"""
+        self.client.get(reverse('api_current'), {'lat': BASEL[0], 'lon': BASEL[1]})
+        response = self.client.get(reverse('api_current'), {'lat': NEAR_BASEL[0], 'lon': NEAR_BASEL[1]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('source_distance_km', response.json()['current_weather'])
+        self.assertEqual(len(self.upstream.calls), 1)
+
+    def test_api_forecast_reports_distance(self):
+        """Test that forecasts reused from nearby report their distance"""
+        self.client.get(reverse('api_forecast'), {'lat': BASEL[0], 'lon': BASEL[1]})
+        response = self.client.get(reverse('api_forecast'), {'lat': NEAR_BASEL[0], 'lon': NEAR_BASEL[1]})
+
+        self.assertAlmostEqual(response.json()['source_distance_km'], 0.3, delta=0.02)
+
+    def test_invalid_location_is_bad_request(self):
+        """Test that invalid coordinates return 400"""
+        with patch('weather_app.services.weather_service.WeatherService._find_entry') as find_entry:
+            response = self.client.get(reverse('api_current'), {'lat': 'x', 'lon': '7'})
+            missing_lon = self.client.get(reverse('api_recommendations'), {'lat': '47.5'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(missing_lon.status_code, 400)
+        find_entry.assert_not_called()
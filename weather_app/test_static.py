@@ -0,0 +1,75 @@
+"""
+Tests for fingerprinted, precompressed static files
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from . import static_serve
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'weather_app.storage.CompressedManifestStaticFilesStorage'},
+}
+
+
+class CompressedStaticFilesTests(SimpleTestCase):
+    """Tests for collectstatic output and the static file view"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Collect static files once into a temporary STATIC_ROOT"""
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.settings_override = override_settings(STATIC_ROOT=cls.static_root, STORAGES=STORAGES)
+        cls.settings_override.enable()
+        call_command('collectstatic', interactive=False, verbosity=0)
+        with open(os.path.join(cls.static_root, 'staticfiles.json')) as manifest:
+            cls.paths = json.load(manifest)['paths']
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary STATIC_ROOT"""
+        cls.settings_override.disable()
+        shutil.rmtree(cls.static_root)
+        super().tearDownClass()
+
+    def test_chartjs_vendored_and_hashed(self):
+        """Test that Chart.js is collected under a content-hashed name"""
+        hashed_name = self.paths['vendor/chartjs/chart.umd.min.js']
+
+        self.assertRegex(hashed_name, static_serve.HASHED_NAME_PATTERN)
+        self.assertTrue(os.path.isfile(os.path.join(self.static_root, hashed_name)))
+
+    def test_gzip_variants_written(self):
+        """Test that compressible hashed files get a smaller .gz variant"""
+        hashed_path = os.path.join(self.static_root, self.paths['css/styles.css'])
+
+        self.assertTrue(os.path.isfile(hashed_path + '.gz'))
+        self.assertLess(os.path.getsize(hashed_path + '.gz'), os.path.getsize(hashed_path))
+
+    def test_serve_precompressed_immutable(self):
+        """Test that hashed files are served precompressed with immutable caching"""
+        request = RequestFactory().get('/static/x', HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        response = static_serve.serve(request, self.paths['js/charts.js'])
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/javascript')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        response.close()
+
+    def test_serve_identity_for_unhashed(self):
+        """Test that clients without gzip get the plain file and short caching"""
+        request = RequestFactory().get('/static/x')
+
+        response = static_serve.serve(request, 'js/charts.js')
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertNotIn('immutable', response['Cache-Control'])
+        response.close()
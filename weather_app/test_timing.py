@@ -0,0 +1,61 @@
+"""
+Tests for per-stage timing instrumentation
+"""
+
+from django.test import TestCase
+from django.urls import reverse
+
+from .services import timing
+from .services.metrics import STAGE_DURATION, registry
+from .testing import FakeUpstreamMixin
+
+
+def stage_counts():
+    return {key[0]: sum(counts) for key, (counts, _) in STAGE_DURATION.collect().items()}
+
+
+class StageTimingTests(FakeUpstreamMixin, TestCase):
+    """Tests for stage timing and the Server-Timing header"""
+
+    def setUp(self):
+        """Set up a fake upstream and empty caches"""
+        super().setUp()
+        self.addCleanup(timing.configure, timing.is_enabled())
+
+    def test_disabled_by_default(self):
+        """Test that no header or histogram is produced while disabled"""
+        timing.configure(False)
+        before = stage_counts()
+
+        response = self.client.get(reverse('index'))
+
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertEqual(stage_counts(), before)
+        self.assertIs(timing.stage('a'), timing.stage('b'))
+
+    def test_server_timing_header(self):
+        """Test that each pipeline stage is reported in Server-Timing"""
+        timing.configure(True)
+
+        response = self.client.get(reverse('index'))
+
+        header = response['Server-Timing']
+        for name in ('fetch', 'upstream_current', 'upstream_forecast', 'parse_forecast',
+                     'chart_json', 'render', 'total'):
+            self.assertIn("{};dur=".format(name), header)
+        self.assertIn('sport_eval;dur=', header)
+        self.assertIn('desc="2x"', header)
+
+    def test_histograms_aggregate_requests(self):
+        """Test that stage durations are aggregated across requests"""
+        timing.configure(True)
+        before = stage_counts()
+
+        self.client.get(reverse('index'))
+        self.client.get(reverse('index'))
+
+        counts = stage_counts()
+        self.assertEqual(counts['render'] - before.get('render', 0), 2)
+        self.assertEqual(counts['upstream_current'] - before.get('upstream_current', 0), 1)
+        self.assertEqual(counts['cache_lookup'] - before.get('cache_lookup', 0), 4)
+        self.assertIn('weather_stage_duration_seconds_bucket{stage="render",le="0.0001"}', registry.expose())
@@ -2,10 +2,14 @@
 Tests for Django views
 """
 
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from unittest.mock import patch, MagicMock
 
+from . import views
+from .services.weather_service import WeatherService
+from .testing import FakeUpstreamMixin, make_current_payload
+
 
 class IndexViewTests(TestCase):
     """Tests for the main index view"""
@@ -15,8 +19,8 @@ class IndexViewTests(TestCase):
         self.client = Client()
         self.url = reverse('index')
     
-    @patch('weather_app.views.WeatherService')
-    @patch('weather_app.views.SportRecommendationService')
+    @patch('weather_app.services.page_context.WeatherService')
+    @patch('weather_app.services.page_context.SportRecommendationService')
     def test_index_view_success(self, mock_sport_service, mock_weather_service):
         """Test successful rendering of index view with weather data"""
         # Mock weather service
@@ -48,7 +52,7 @@ class IndexViewTests(TestCase):
         self.assertIn('cycling_recommendation', response.context)
         self.assertIn('running_recommendation', response.context)
     
-    @patch('weather_app.views.WeatherService')
+    @patch('weather_app.services.page_context.WeatherService')
     def test_index_view_error_handling(self, mock_weather_service):
         """Test error handling when weather service fails"""
         # Mock weather service to raise exception
@@ -68,3 +72,61 @@ class IndexViewTests(TestCase):
         """Test that index view is accessible at root URL"""
         response = self.client.get('/')
         self.assertEqual(response.status_code, 200)
+
+
+@override_settings(WEATHER_PAGE_CACHE=True)
+class PageCacheTests(FakeUpstreamMixin, TestCase):
+    """Tests for the rendered page cache of the index view"""
+    
+    def setUp(self):
+        """Set up test client, fake upstream and empty caches"""
+        super().setUp()
+        self.client = Client()
+        self.url = reverse('index')
+        views.page_cache.clear()
+        self.addCleanup(views.page_cache.clear)
+    
+    def test_cached_page_not_rerendered(self):
+        """Test that repeated requests reuse the rendered page"""
+        with patch('weather_app.views.render', wraps=views.render) as mock_render:
+            first = self.client.get(self.url)
+            second = self.client.get(self.url)
+        
+        self.assertEqual(mock_render.call_count, 1)
+        self.assertEqual(first.content, second.content)
+        self.assertIn('Accept-Encoding', second['Vary'])
+    
+    def test_cached_page_revalidated_with_etag(self):
+        """Test that cached pages must be revalidated and unchanged ones yield 304"""
+        first = self.client.get(self.url)
+        
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        
+        self.assertIn('max-age=0', first['Cache-Control'])
+        self.assertIn('must-revalidate', first['Cache-Control'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], first['ETag'])
+    
+    def test_page_invalidated_on_data_refresh(self):
+        """Test that new data versions produce a freshly rendered page"""
+        views.page_cache.burst_seconds = 0
+        self.addCleanup(setattr, views.page_cache, 'burst_seconds', 1.0)
+        first = self.client.get(self.url)
+        
+        WeatherService().clear_cache()
+        self.upstream.current = make_current_payload(temp=-3.0)
+        second = self.client.get(self.url)
+        
+        self.assertNotEqual(first.content, second.content)
+        self.assertNotEqual(first['ETag'], second['ETag'])
+        self.assertIn(b'-3.0', second.content)
+    
+    def test_burst_window_skips_version_checks(self):
+        """Test that pages inside the burst window are served without data lookups"""
+        self.client.get(self.url)
+        
+        with patch('weather_app.views.WeatherService') as mock_weather_service:
+            response = self.client.get(self.url)
+        
+        self.assertEqual(response.status_code, 200)
+        mock_weather_service.assert_not_called()
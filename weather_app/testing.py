@@ -0,0 +1,160 @@
+"""
+Test helpers providing a fake OpenWeatherMap upstream, base test cases
+running the weather service against it, and model factories
+"""
+
+from datetime import datetime, timedelta, timezone
+from django.test import SimpleTestCase
+from unittest.mock import MagicMock, patch
+
+from .models import Observation
+from .services.weather_service import WeatherService
+
+# Time of the first observation built by make_observation
+OBSERVATIONS_START = datetime(2025, 10, 1, tzinfo=timezone.utc)
+
+
+def make_current_payload(temp=18.5, wind_speed=4.0, rain_1h=None, dt=1760000000):
+    """
+    Build a realistic OpenWeatherMap current weather payload.
+    
+    Args:
+        temp: Temperature in °C
+        wind_speed: Wind speed in m/s
+        rain_1h: Rain volume of the last hour in mm, omitted if None
+        dt: Observation time in epoch seconds
+        
+    Returns:
+        dict: Raw API payload
+    """
+    payload = {
+        'coord': {'lon': 7.5965, 'lat': 47.4953},
+        'weather': [{'id': 800, 'main': 'Clear', 'description': 'clear sky', 'icon': '01d'}],
+        'main': {'temp': temp, 'feels_like': temp - 0.6, 'temp_min': temp - 1, 'temp_max': temp + 1,
+                 'pressure': 1018, 'humidity': 65},
+        'visibility': 10000,
+        'wind': {'speed': wind_speed, 'deg': 240},
+        'clouds': {'all': 0},
+        'dt': dt,
+        'sys': {'country': 'CH', 'sunrise': dt - 20000, 'sunset': dt + 20000},
+        'timezone': 7200,
+        'name': 'Reinach',
+    }
+    if rain_1h is not None:
+        payload['rain'] = {'1h': rain_1h}
+    return payload
+
+
+def make_forecast_payload(periods=8, start_dt=1760000000, step=10800, base_temp=15.0):
+    """
+    Build a realistic OpenWeatherMap 3-hour forecast payload.
+    
+    Args:
+        periods: Number of forecast periods
+        start_dt: Time of the first period in epoch seconds
+        step: Seconds between periods
+        base_temp: Temperature of the first period in °C
+        
+    Returns:
+        dict: Raw API payload
+    """
+    items = []
+    for i in range(periods):
+        item = {
+            'dt': start_dt + i * step,
+            'main': {'temp': base_temp + (i % 8) - 2, 'feels_like': base_temp + (i % 8) - 3,
+                     'pressure': 1015, 'humidity': 60 + (i % 5)},
+            'weather': [{'id': 801, 'main': 'Clouds', 'description': 'few clouds', 'icon': '02d'}],
+            'clouds': {'all': 20},
+            'wind': {'speed': 2.0 + (i % 4), 'deg': 200},
+            'visibility': 10000,
+            'pop': 0.2,
+        }
+        if i % 3 == 2:
+            item['rain'] = {'3h': 0.4 * (i % 4)}
+        items.append(item)
+    
+    return {
+        'cod': '200',
+        'cnt': periods,
+        'list': items,
+        'city': {'name': 'Reinach', 'country': 'CH', 'coord': {'lat': 47.4953, 'lon': 7.5965}},
+    }
+
+
+class FakeUpstream:
+    """
+    Drop-in replacement for ``requests.get`` serving fake OpenWeatherMap data
+    
+    Usage:
+        with patch('weather_app.services.weather_service.requests.get', new=FakeUpstream()):
+            ...
+    """
+    
+    def __init__(self, current=None, forecast=None):
+        self.current = current if current is not None else make_current_payload()
+        self.forecast = forecast if forecast is not None else make_forecast_payload()
+        self.calls = []
+    
+    def __call__(self, url, params=None, timeout=None):
+        self.calls.append((url, params))
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = self.forecast if url.endswith('/forecast') else self.current
+        return response
+
+
+class EmptyWeatherCacheMixin:
+    """
+    Test case mixin starting and ending every test with an empty weather cache
+    
+    Mix into SimpleTestCase or TestCase, before the test case class.
+    """
+    
+    def setUp(self):
+        super().setUp()
+        WeatherService().clear_cache()
+        self.addCleanup(WeatherService().clear_cache)
+
+
+class FakeUpstreamMixin(EmptyWeatherCacheMixin):
+    """
+    Test case mixin running the weather service against a FakeUpstream
+    
+    Every test gets its own upstream (self.upstream), patched in for
+    requests.get, a WeatherService (self.service) and an empty cache.
+    """
+    
+    def setUp(self):
+        super().setUp()
+        self.upstream = FakeUpstream()
+        patcher = patch('weather_app.services.weather_service.requests.get', new=self.upstream)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = WeatherService()
+
+
+class WeatherServiceTestCase(FakeUpstreamMixin, SimpleTestCase):
+    """Base test case running the weather service against a fake upstream"""
+
+
+def make_observation(hours, temperature=15.0, latitude=47.4953, longitude=7.5965, precipitation=0.0):
+    """
+    Build an unsaved observation.
+    
+    Args:
+        hours: Hours after OBSERVATIONS_START
+        temperature: Temperature in °C
+        latitude: Latitude
+        longitude: Longitude
+        precipitation: Precipitation in mm
+        
+    Returns:
+        Observation: Unsaved model instance
+    """
+    return Observation(
+        latitude=latitude, longitude=longitude, location='Reinach, CH',
+        observed_at=OBSERVATIONS_START + timedelta(hours=hours), temperature=temperature,
+        feels_like=temperature - 1, humidity=70, wind_speed=10.0,
+        precipitation=precipitation, description='clear sky', icon='01d',
+    )
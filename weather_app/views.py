@@ -1,20 +1,48 @@
+from django.conf import settings
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag, require_safe
 from .services.weather_service import WeatherService
+from .services.page_context import build_index_context
 from .services.sport_service import SportRecommendationService
+from .services.route import decode_polyline, evaluate_route
+from .services.metrics import PAGE_CACHE_REQUESTS, registry
+from .services.timing import stage
+from .page_cache import PageCache
+from .events import broadcaster
+from .recommendations import get_forecast_recommendations, suitable_locations
+import asyncio
 import logging
-import json
+from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Seconds between keep-alive comments on idle event streams
+EVENTS_KEEPALIVE_SECONDS = 15
+
+# Location key of the page served by the index view
+DEFAULT_LOCATION = "{},{}".format(WeatherService.REINACH_LAT, WeatherService.REINACH_LON)
+
+# Rendered index pages, only used when WEATHER_PAGE_CACHE is enabled
+page_cache = PageCache(burst_seconds=getattr(settings, 'WEATHER_PAGE_CACHE_BURST', 1.0))
+
 
 def index(request):
     """
     Main view for the weather sport planner application.
     
-    Fetches current weather data and 24-hour forecast for Reinach BL,
-    generates sport recommendations based on weather conditions,
-    and renders the main template with all necessary data.
+    Fetches current weather data and 24-hour forecast for Reinach BL (or
+    the lat and lon query parameters), generates sport recommendations
+    based on weather conditions, and renders the main template with all
+    necessary data.
+    
+    When WEATHER_PAGE_CACHE is enabled, GET and HEAD requests for Reinach
+    BL are served from the rendered page cache instead.
     
     Args:
         request: Django HTTP request object
@@ -22,67 +50,511 @@ def index(request):
     Returns:
         HttpResponse: Rendered template with weather and sport data
     """
-    context = {
-        'error': None,
-        'current_weather': None,
-        'forecast_24h': None,
-        'cycling_recommendation': None,
-        'running_recommendation': None,
-    }
+    location = _request_location(request)
+    if (getattr(settings, 'WEATHER_PAGE_CACHE', False) and request.method in ('GET', 'HEAD')
+            and location is None):
+        return _cached_index(request)
+    return _render_index(request, location)
+
+
+def _cached_index(request):
+    """
+    Serve the index page from the rendered page cache.
     
-    try:
-        # Initialize weather service
+    Pages are keyed on location plus the versions of the cached current
+    weather and forecast, so they are re-rendered as soon as the data
+    refreshes. Error pages are never cached.
+    
+    The same versions make up the ETag. Clients and proxies must revalidate
+    on every request (max-age=0), so a refresh is visible immediately while
+    unchanged pages only cost a 304.
+    
+    Args:
+        request: Django HTTP request object
+        
+    Returns:
+        HttpResponse: Cached or freshly rendered page
+    """
+    location = DEFAULT_LOCATION
+    
+    page = page_cache.get_burst(location)
+    if page is None:
         weather_service = WeatherService()
+        with stage('fetch'):
+            weather_service.get_current_weather()
+            weather_service.get_forecast_24h()
+        versions = (
+            weather_service.get_cache_version(WeatherService.CURRENT_CACHE_KEY),
+            weather_service.get_cache_version(WeatherService.FORECAST_CACHE_KEY),
+        )
+        if None in versions:
+            return _render_index(request)
         
-        # Fetch current weather
-        current_weather = weather_service.get_current_weather()
-        context['current_weather'] = current_weather
-        
-        # Fetch 24-hour forecast
-        forecast_24h = weather_service.get_forecast_24h()
-        context['forecast_24h'] = forecast_24h
-        
-        # Convert forecast data to JSON-serializable format
-        if forecast_24h:
-            forecast_json_data = []
-            for item in forecast_24h:
-                forecast_json_data.append({
-                    'timestamp': item['timestamp'].isoformat() if hasattr(item['timestamp'], 'isoformat') else str(item['timestamp']),
-                    'temperature': item['temperature'],
-                    'wind_speed': item['wind_speed'],
-                    'precipitation': item['precipitation'],
-                    'humidity': item['humidity'],
-                    'description': item['description']
-                })
-            context['forecast_json'] = json.dumps(forecast_json_data)
+        content = page_cache.get(location, versions)
+        if content is None:
+            PAGE_CACHE_REQUESTS.inc(result='miss')
+            context = build_index_context()
+            with stage('render'):
+                response = render(request, 'weather_app/index.html', context)
+            if context['error']:
+                return response
+            content = response.content
+            page_cache.set(location, versions, content)
         else:
-            context['forecast_json'] = '[]'
+            PAGE_CACHE_REQUESTS.inc(result='hit')
+    else:
+        PAGE_CACHE_REQUESTS.inc(result='burst')
+        versions, content = page
+    
+    etag_value = quote_etag('{}-{}'.format(*versions))
+    response = HttpResponse(content)
+    response['ETag'] = etag_value
+    patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return get_conditional_response(request, etag=etag_value, response=response)
+
+
+def _render_index(request, location=None):
+    """
+    Build the index context and render the main template.
+    
+    Args:
+        request: Django HTTP request object
+        location: (lat, lon) to render, defaults to Reinach BL
+        
+    Returns:
+        HttpResponse: Rendered template with weather and sport data
+    """
+    context = build_index_context(location)
+    with stage('render'):
+        return render(request, 'weather_app/index.html', context)
+
+
+@require_safe
+def metrics(request):
+    """
+    Prometheus metrics endpoint.
+    
+    Exposes cache, upstream, page cache and stage timing metrics of this
+    process in the Prometheus text format. The endpoint only exists when
+    WEATHER_METRICS is enabled and, if WEATHER_METRICS_ALLOWED_IPS is set,
+    for the listed client addresses.
+    
+    Args:
+        request: Django HTTP request object
+        
+    Returns:
+        HttpResponse: Metrics in text exposition format
+        
+    Raises:
+        Http404: If metrics are disabled or the client is not allowed
+    """
+    allowed_ips = getattr(settings, 'WEATHER_METRICS_ALLOWED_IPS', [])
+    if not getattr(settings, 'WEATHER_METRICS', True) or (
+            allowed_ips and request.META.get('REMOTE_ADDR') not in allowed_ips):
+        raise Http404("Metrics are not available")
+    return HttpResponse(registry.expose(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def _request_location(request):
+    """
+    Get the location requested with the lat and lon query parameters.
+    
+    Args:
+        request: Django HTTP request object
+        
+    Returns:
+        tuple: (lat, lon) strings, or None for the default location
+    """
+    lat = request.GET.get('lat')
+    lon = request.GET.get('lon')
+    if lat is None and lon is None:
+        return None
+    return lat, lon
+
+
+def _source_etag(weather_service, key):
+    """
+    Derive an ETag from the cache entry that served the last lookup.
+    
+    Data reused from a nearby location also depends on the distance, which
+    is therefore part of the ETag.
+    
+    Args:
+        weather_service: WeatherService that performed the lookup
+        key: Endpoint cache key
+        
+    Returns:
+        str: ETag value, or None if the entry is gone
+    """
+    source_key, distance = weather_service.get_source(key)
+    version = weather_service.get_cache_version(source_key)
+    if version is None or distance is None:
+        return version
+    return "{}-{:.3f}".format(version, distance)
+
+
+def _current_weather_etag(request):
+    """
+    Compute the ETag for the current weather endpoint.
+    
+    Warms the weather cache if needed and derives the ETag from the
+    version of the cached entry.
+    
+    Args:
+        request: Django HTTP request object
+        
+    Returns:
+        str: Cache entry version, or None if no data is available
+    """
+    weather_service = WeatherService()
+    try:
+        if weather_service.get_current_weather(_request_location(request)) is None:
+            return None
+    except (TypeError, ValueError):
+        return None
+    return _source_etag(weather_service, WeatherService.CURRENT_CACHE_KEY)
+
+
+def _forecast_etag(request):
+    """
+    Compute the ETag for the forecast endpoint.
+    
+    Args:
+        request: Django HTTP request object
+        
+    Returns:
+        str: Cache entry version, or None if no data is available
+    """
+    weather_service = WeatherService()
+    try:
+        if weather_service.get_forecast_24h(_request_location(request)) is None:
+            return None
+    except (TypeError, ValueError):
+        return None
+    return _source_etag(weather_service, WeatherService.FORECAST_CACHE_KEY)
+
+
+def _recommendations_etag(request):
+    """
+    Compute the ETag for the recommendations endpoint.
+    
+    Recommendations are derived from both current weather and forecast,
+    so the ETag combines the versions of both cache entries.
+    
+    Args:
+        request: Django HTTP request object
+        
+    Returns:
+        str: Combined cache entry versions, or None if no data is available
+    """
+    current_version = _current_weather_etag(request)
+    forecast_version = _forecast_etag(request)
+    if current_version is None or forecast_version is None:
+        return None
+    return "{}-{}".format(current_version, forecast_version)
+
+
+def _invalid_location_response():
+    """
+    Build the JSON error response used for unparseable lat/lon parameters.
+    
+    Returns:
+        JsonResponse: 400 response with an error message
+    """
+    return JsonResponse(
+        {'error': "Invalid location: pass numeric 'lat' and 'lon' query parameters."},
+        status=400
+    )
+
+
+def _unavailable_response():
+    """
+    Build the JSON error response used when weather data is unavailable.
+    
+    Returns:
+        JsonResponse: 503 response with an error message
+    """
+    return JsonResponse(
+        {'error': "Unable to fetch weather data. Please try again later."},
+        status=503
+    )
+
+
+def _mark_stale(response, stale_since):
+    """
+    Mark a response built from snapshot data served during an outage.
+    
+    Adds a Warning 110 header and an Age header with the seconds since the
+    data was fetched.
+    
+    Args:
+        response: HttpResponse to mark
+        stale_since: Fetch time of the stale data, or None if it is fresh
+        
+    Returns:
+        HttpResponse: The response
+    """
+    if stale_since is not None:
+        age = (datetime.now() - stale_since).total_seconds()
+        response['Age'] = str(max(0, int(age)))
+        response['Warning'] = '110 - "Response is Stale"'
+    return response
+
+
+@require_safe
+@cache_control(no_cache=True)
+@etag(_current_weather_etag)
+def api_current(request):
+    """
+    JSON endpoint returning the cached current weather.
+    
+    Defaults to Reinach BL; other locations are requested with the lat and
+    lon query parameters.
+    
+    Args:
+        request: Django HTTP request object
+        
+    Returns:
+        JsonResponse: Current weather data, 304 if unchanged, 400 for an
+        invalid location, or 503 on error
+    """
+    weather_service = WeatherService()
+    try:
+        current_weather = weather_service.get_current_weather(_request_location(request))
+    except (TypeError, ValueError):
+        return _invalid_location_response()
+    if current_weather is None:
+        return _unavailable_response()
+    
+    return _mark_stale(
+        JsonResponse({'current_weather': current_weather}),
+        weather_service.get_stale_since(WeatherService.CURRENT_CACHE_KEY)
+    )
+
+
+@require_safe
+@cache_control(no_cache=True)
+@etag(_forecast_etag)
+def api_forecast(request):
+    """
+    JSON endpoint returning the cached 24-hour forecast.
+    
+    Defaults to Reinach BL; other locations are requested with the lat and
+    lon query parameters.
+    
+    Args:
+        request: Django HTTP request object
+        
+    Returns:
+        JsonResponse: Forecast periods with their aggregates, 304 if
+        unchanged, 400 for an invalid location, or 503 on error
+    """
+    weather_service = WeatherService()
+    try:
+        forecast_24h = weather_service.get_forecast_24h(_request_location(request))
+    except (TypeError, ValueError):
+        return _invalid_location_response()
+    if forecast_24h is None:
+        return _unavailable_response()
+    
+    data = {
+        'forecast': forecast_24h,
+        'summary': weather_service.get_forecast_summary(_request_location(request)),
+    }
+    distance = weather_service.get_source(WeatherService.FORECAST_CACHE_KEY)[1]
+    if distance is not None:
+        data['source_distance_km'] = round(distance, 3)
+    stale_since = weather_service.get_stale_since(WeatherService.FORECAST_CACHE_KEY)
+    if stale_since is not None:
+        data['stale_since'] = stale_since
+    return _mark_stale(JsonResponse(data), stale_since)
+
+
+@require_safe
+@cache_control(no_cache=True)
+@etag(_recommendations_etag)
+def api_recommendations(request):
+    """
+    JSON endpoint returning sport recommendations for now and each hour of
+    the forecast.
+    
+    Args:
+        request: Django HTTP request object
+        
+    Returns:
+        JsonResponse: Recommendations, 304 if unchanged, or 503 on error
+    """
+    weather_service = WeatherService()
+    location = _request_location(request)
+    try:
+        current_weather = weather_service.get_current_weather(location)
+        forecast_hourly = weather_service.get_forecast_hourly(location)
+    except (TypeError, ValueError):
+        return _invalid_location_response()
+    if current_weather is None or forecast_hourly is None:
+        return _unavailable_response()
+    
+    data = {
+        'current': SportRecommendationService().get_recommendations(current_weather),
+        'forecast': get_forecast_recommendations(weather_service, forecast_hourly),
+    }
+    stale = [
+        stale_since for stale_since in (
+            weather_service.get_stale_since(WeatherService.CURRENT_CACHE_KEY),
+            weather_service.get_stale_since(WeatherService.HOURLY_CACHE_KEY),
+        ) if stale_since is not None
+    ]
+    if stale:
+        data['stale_since'] = min(stale)
+    return _mark_stale(JsonResponse(data), data.get('stale_since'))
+
+
+@require_safe
+@cache_control(no_cache=True)
+def api_suitable_locations(request):
+    """
+    JSON endpoint listing the cached locations where a sport is suitable
+    for every hour of a time range.
+    
+    Answered from the recommendations materialized when each forecast
+    was cached. Query parameters: sport, start and end (ISO 8601, end
+    exclusive).
+    
+    Args:
+        request: Django HTTP request object
+        
+    Returns:
+        JsonResponse: Matching locations, or 400 for invalid parameters
+    """
+    sport = request.GET.get('sport')
+    try:
+        start = parse_datetime(request.GET.get('start', ''))
+        end = parse_datetime(request.GET.get('end', ''))
+    except ValueError:
+        start = end = None
+    if start is not None and end is not None:
+        start, end = (timezone.make_aware(value) if timezone.is_naive(value) else value for value in (start, end))
+    if (sport not in SportRecommendationService.DEFAULT_THRESHOLDS or start is None or end is None
+            or end <= start):
+        return JsonResponse(
+            {'error': "Pass a known 'sport' and ISO 8601 'start' and 'end' query parameters, "
+                      "with 'end' after 'start'."},
+            status=400
+        )
+    
+    locations = suitable_locations(sport, start, end)
+    return JsonResponse({
+        'sport': sport,
+        'start': start,
+        'end': end,
+        'locations': [{'lat': lat, 'lon': lon} for lat, lon in locations],
+    })
+
+
+def _fetch_route_tile(tile):
+    """
+    Get the hourly forecast of a route tile with a service of its own.
+    
+    A forecast cached within half a tile of the centre serves the tile,
+    unless nearby reuse is disabled.
+    
+    Args:
+        tile: (lat, lon) of the tile centre
         
-        # Initialize sport service with default thresholds
-        sport_service = SportRecommendationService()
+    Returns:
+        list: Hourly forecast, or None if unavailable
+    """
+    radius = settings.WEATHER_NEARBY_RADIUS_KM
+    if radius > 0:
+        radius = max(radius, settings.WEATHER_ROUTE_TILE_KM / 2)
+    return WeatherService(nearby_radius_km=radius).get_forecast_hourly(tile)
+
+
+@require_safe
+@cache_control(no_cache=True)
+def api_route(request):
+    """
+    JSON endpoint evaluating a sport along a route.
+    
+    Query parameters: polyline (encoded polyline), start (ISO 8601
+    departure time, default now), speed (km/h, default
+    WEATHER_ROUTE_SPEED_KMH) and sport (default cycling). The route is
+    sampled every WEATHER_ROUTE_SAMPLE_KM and each sample is evaluated with
+    the forecast at its arrival time; samples in the same forecast tile
+    share one forecast lookup. Routes longer than WEATHER_ROUTE_MAX_KM or
+    crossing more than WEATHER_ROUTE_MAX_TILES tiles are rejected.
+    
+    Args:
+        request: Django HTTP request object
         
-        # Get cycling recommendation
-        cycling_recommended, cycling_reasons = sport_service.evaluate_sport(
-            sport='cycling',
-            weather_data=current_weather
+    Returns:
+        JsonResponse: Evaluated route, 400 for invalid parameters or too
+        large routes, or 503 on error
+    """
+    sport = request.GET.get('sport', 'cycling')
+    try:
+        points = decode_polyline(request.GET.get('polyline', ''))
+        start = parse_datetime(request.GET['start']) if 'start' in request.GET else timezone.now()
+        speed = float(request.GET.get('speed', settings.WEATHER_ROUTE_SPEED_KMH))
+    except (TypeError, ValueError):
+        points = start = speed = None
+    if (not points or len(points) > settings.WEATHER_ROUTE_MAX_POINTS or start is None
+            or not 0 < speed < 1000 or sport not in SportRecommendationService.DEFAULT_THRESHOLDS):
+        return JsonResponse(
+            {'error': "Pass an encoded 'polyline' of at most {} points, an ISO 8601 'start', "
+                      "a positive 'speed' and a known 'sport'.".format(settings.WEATHER_ROUTE_MAX_POINTS)},
+            status=400
         )
-        context['cycling_recommendation'] = {
-            'recommended': cycling_recommended,
-            'reason': ' '.join(cycling_reasons)
-        }
-        
-        # Get running recommendation
-        running_recommended, running_reasons = sport_service.evaluate_sport(
-            sport='running',
-            weather_data=current_weather
+    if timezone.is_naive(start):
+        start = timezone.make_aware(start)
+    
+    try:
+        route = evaluate_route(
+            points, start, _fetch_route_tile, sport=sport, speed_kmh=speed,
+            interval_km=settings.WEATHER_ROUTE_SAMPLE_KM, tile_km=settings.WEATHER_ROUTE_TILE_KM,
+            max_workers=settings.WEATHER_ROUTE_CONCURRENCY, max_km=settings.WEATHER_ROUTE_MAX_KM,
+            max_tiles=settings.WEATHER_ROUTE_MAX_TILES
         )
-        context['running_recommendation'] = {
-            'recommended': running_recommended,
-            'reason': ' '.join(running_reasons)
-        }
+    except ValueError as e:
+        return JsonResponse({'error': "{}.".format(e)}, status=400)
+    if route is None:
+        return _unavailable_response()
+    
+    return JsonResponse(dict(route, start=start))
+
+
+async def events(request):
+    """
+    Server-Sent Events stream of live weather updates.
+    
+    Pushes 'current', 'forecast' and 'recommendations' events whenever the
+    background refresh updates the weather cache. Requires running under
+    ASGI with WEATHER_LIVE_UPDATES enabled.
+    
+    Args:
+        request: Django HTTP request object
         
-    except Exception as e:
-        logger.error("Error fetching weather data or generating recommendations: {}".format(str(e)))
-        context['error'] = "Unable to fetch weather data. Please try again later."
+    Returns:
+        StreamingHttpResponse: Never-ending text/event-stream response
+    """
+    if not getattr(settings, 'WEATHER_LIVE_UPDATES', False):
+        raise Http404("Live updates are disabled")
+    
+    queue = broadcaster.subscribe()
+    
+    async def stream():
+        try:
+            yield "retry: {}\n\n".format(EVENTS_KEEPALIVE_SECONDS * 1000).encode('utf-8')
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b': keepalive\n\n'
+        finally:
+            broadcaster.unsubscribe(queue)
     
-    return render(request, 'weather_app/index.html', context)
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'weather_project.settings')
 
 application = get_asgi_application()
+
+# Live updates: one background refresh per process feeds all SSE clients
+if settings.WEATHER_LIVE_UPDATES:
+    from weather_app.services.refresher import start_background_refresh
+
+    start_background_refresh(interval=settings.WEATHER_REFRESH_INTERVAL)
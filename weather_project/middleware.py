@@ -0,0 +1,88 @@
+"""
+Middleware for the weather_project project.
+"""
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+
+
+class AdminScopedMiddleware:
+    """
+    Run a middleware chain only for requests under the admin prefix.
+
+    The public pages are anonymous and read-only, so sessions, CSRF,
+    authentication and messages are only needed by the admin. This
+    middleware wraps the ADMIN_MIDDLEWARE chain around the admin URLs and
+    sends every other request straight to the view.
+
+    The chain is built like Django's own (BaseHandler.load_middleware):
+    every layer is wrapped in convert_exception_to_response, and the
+    process_view, process_template_response and process_exception hooks
+    of the chain, which Django only calls for MIDDLEWARE entries, are
+    forwarded from here for admin requests.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = '/' + settings.ADMIN_URL.lstrip('/')
+
+        self.view_middleware = []
+        self.template_response_middleware = []
+        self.exception_middleware = []
+        handler = convert_exception_to_response(get_response)
+        for middleware_path in reversed(settings.ADMIN_MIDDLEWARE):
+            try:
+                instance = import_string(middleware_path)(handler)
+            except MiddlewareNotUsed:
+                continue
+            if instance is None:
+                raise ImproperlyConfigured("Middleware factory {} returned None.".format(middleware_path))
+
+            if hasattr(instance, 'process_view'):
+                self.view_middleware.insert(0, instance.process_view)
+            if hasattr(instance, 'process_template_response'):
+                self.template_response_middleware.append(instance.process_template_response)
+            if hasattr(instance, 'process_exception'):
+                self.exception_middleware.append(instance.process_exception)
+            handler = convert_exception_to_response(instance)
+        self.admin_handler = handler
+
+    def is_admin(self, request):
+        return request.path_info.startswith(self.prefix)
+
+    def __call__(self, request):
+        if self.is_admin(request):
+            return self.admin_handler(request)
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.is_admin(request):
+            return None
+        for process_view in self.view_middleware:
+            response = process_view(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        if not self.is_admin(request):
+            return response
+        for process_template_response in self.template_response_middleware:
+            response = process_template_response(request, response)
+            if response is None:
+                raise ValueError(
+                    "{}.process_template_response didn't return an HttpResponse object. "
+                    "It returned None instead.".format(process_template_response.__self__.__class__.__name__)
+                )
+        return response
+
+    def process_exception(self, request, exception):
+        if not self.is_admin(request):
+            return None
+        for process_exception in self.exception_middleware:
+            response = process_exception(request, exception)
+            if response is not None:
+                return response
+        return None
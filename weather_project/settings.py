@@ -11,7 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -29,8 +29,100 @@ DEBUG = True
 # OpenWeatherMap API Key
 OPENWEATHER_API_KEY = config('OPENWEATHER_API_KEY')
 
+# OpenWeatherMap API base URL (override to point at a local fake upstream)
+OPENWEATHER_BASE_URL = config('OPENWEATHER_BASE_URL', default='https://api.openweathermap.org/data/2.5')
+
+# Secondary weather provider queried when OpenWeatherMap is slower than its
+# recent p95 latency or fails ('openmeteo', empty = no hedging)
+WEATHER_SECONDARY_PROVIDER = config('WEATHER_SECONDARY_PROVIDER', default='')
+OPENMETEO_BASE_URL = config('OPENMETEO_BASE_URL', default='https://api.open-meteo.com/v1')
+# Seconds to wait for OpenWeatherMap before hedging, until enough latencies are known
+WEATHER_HEDGE_DELAY = config('WEATHER_HEDGE_DELAY', default=0.5, cast=float)
+
+# File holding the last known weather data, served when the upstream is
+# unreachable and loaded at startup (empty = no snapshots)
+WEATHER_SNAPSHOT_PATH = config('WEATHER_SNAPSHOT_PATH', default='')
+# Minimum seconds between snapshot writes
+WEATHER_SNAPSHOT_INTERVAL = config('WEATHER_SNAPSHOT_INTERVAL', default=300, cast=float)
+
+# Store every fetched observation and forecast revision in the database
+# for history exports (python manage.py export_history) and backtests, and
+# keep per-month climate sketches (python manage.py climate_thresholds)
+WEATHER_HISTORY = config('WEATHER_HISTORY', default=False, cast=bool)
+
+# Also write the recommendations materialized at forecast refresh time to
+# the database, for other processes and analysts
+WEATHER_RECOMMENDATIONS_PERSIST = config('WEATHER_RECOMMENDATIONS_PERSIST', default=False, cast=bool)
+
+# Requests for a location without cached data reuse data cached for another
+# location within this radius (km, 0 = off) and age (seconds)
+WEATHER_NEARBY_RADIUS_KM = config('WEATHER_NEARBY_RADIUS_KM', default=1.0, cast=float)
+WEATHER_NEARBY_MAX_AGE = config('WEATHER_NEARBY_MAX_AGE', default=900, cast=int)
+
+# Route evaluation: routes are sampled every WEATHER_ROUTE_SAMPLE_KM, each
+# sample uses the forecast of its WEATHER_ROUTE_TILE_KM tile, and arrival
+# times assume WEATHER_ROUTE_SPEED_KMH unless the request passes a speed.
+# Tiles reuse forecasts cached within half a tile of their centre (unless
+# nearby reuse is off, WEATHER_NEARBY_RADIUS_KM = 0). Every distinct tile
+# may cost an upstream call, so routes are limited in vertices, length
+# and tiles
+WEATHER_ROUTE_SAMPLE_KM = config('WEATHER_ROUTE_SAMPLE_KM', default=2.0, cast=float)
+WEATHER_ROUTE_TILE_KM = config('WEATHER_ROUTE_TILE_KM', default=10.0, cast=float)
+WEATHER_ROUTE_SPEED_KMH = config('WEATHER_ROUTE_SPEED_KMH', default=20.0, cast=float)
+WEATHER_ROUTE_MAX_POINTS = config('WEATHER_ROUTE_MAX_POINTS', default=2000, cast=int)
+WEATHER_ROUTE_MAX_KM = config('WEATHER_ROUTE_MAX_KM', default=200.0, cast=float)
+WEATHER_ROUTE_MAX_TILES = config('WEATHER_ROUTE_MAX_TILES', default=32, cast=int)
+WEATHER_ROUTE_CONCURRENCY = config('WEATHER_ROUTE_CONCURRENCY', default=8, cast=int)
+
+# Fixed number of seconds weather data is cached. By default (empty) cache
+# lifetimes follow the provider's publication schedule: observations until
+# the next one is expected and the forecast until the next model run is
+# published
+WEATHER_CACHE_DURATION = config(
+    'WEATHER_CACHE_DURATION', default='', cast=lambda value: int(value) if value else None
+)
+
+# Bounds of the in-process weather cache (least recently used entries are evicted first)
+WEATHER_CACHE_MAX_ENTRIES = config('WEATHER_CACHE_MAX_ENTRIES', default=256, cast=int)
+WEATHER_CACHE_MAX_BYTES = config('WEATHER_CACHE_MAX_BYTES', default=8 * 1024 * 1024, cast=int)
+
+# Memory-mapped cache file shared by all worker processes on the host, e.g.
+# /dev/shm/weather-cache (empty = each process caches on its own)
+WEATHER_SHARED_CACHE_PATH = config('WEATHER_SHARED_CACHE_PATH', default='')
+# Seconds a worker serves shared entries from its own memory before rereading
+WEATHER_SHARED_CACHE_L1_TTL = config('WEATHER_SHARED_CACHE_L1_TTL', default=5.0, cast=float)
+
 ALLOWED_HOSTS = []
 
+# Rendered page cache for the index view (opt-in)
+WEATHER_PAGE_CACHE = config('WEATHER_PAGE_CACHE', default=False, cast=bool)
+# Seconds a rendered page is served without checking data versions
+WEATHER_PAGE_CACHE_BURST = config('WEATHER_PAGE_CACHE_BURST', default=1.0, cast=float)
+
+# Pre-rendered index pages: the prerender_pages command (one per host)
+# writes the page of Reinach BL (index.html) and of each
+# WEATHER_PRERENDER_LOCATIONS entry ("lat,lon" pairs separated by ";",
+# written as e.g. 47.5596,7.5886.html) to this directory after every
+# refresh, for a front proxy to serve (empty = off)
+WEATHER_PRERENDER_DIR = config('WEATHER_PRERENDER_DIR', default='')
+WEATHER_PRERENDER_LOCATIONS = config(
+    'WEATHER_PRERENDER_LOCATIONS', default='',
+    cast=lambda value: [item.strip() for item in value.split(';') if item.strip()]
+)
+
+# Live updates over Server-Sent Events (requires ASGI)
+WEATHER_LIVE_UPDATES = config('WEATHER_LIVE_UPDATES', default=False, cast=bool)
+# Seconds between background refresh checks of the weather cache
+WEATHER_REFRESH_INTERVAL = config('WEATHER_REFRESH_INTERVAL', default=60, cast=float)
+
+# Per-stage latency instrumentation (Server-Timing header and histograms)
+WEATHER_TIMING = config('WEATHER_TIMING', default=False, cast=bool)
+
+# Prometheus metrics at /metrics, optionally only for the listed client
+# addresses (empty: any client)
+WEATHER_METRICS = config('WEATHER_METRICS', default=True, cast=bool)
+WEATHER_METRICS_ALLOWED_IPS = config('WEATHER_METRICS_ALLOWED_IPS', default='', cast=Csv())
+
 
 # Application definition
 
@@ -45,6 +137,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'weather_app.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,6 +147,9 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# URL prefix of the Django admin
+ADMIN_URL = 'admin/'
+
 ROOT_URLCONF = 'weather_project.urls'
 
 TEMPLATES = [
@@ -121,6 +217,23 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Outside DEBUG, collectstatic writes content-hashed files plus precompressed
+# .gz/.br variants, and templates reference the hashed names
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': ('django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+                    else 'weather_app.storage.CompressedManifestStaticFilesStorage'),
+    },
+}
+
+# Serve collected static files from Django with immutable caching headers
+# (for deployments without a front proxy serving STATIC_ROOT)
+WEATHER_SERVE_STATIC = config('WEATHER_SERVE_STATIC', default=False, cast=bool)
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -0,0 +1,61 @@
+"""
+Production settings for weather_project project.
+
+Lean profile for serving the anonymous, read-only public pages:
+sessions, CSRF, authentication and messages only run for the admin,
+which lives under its own prefix (ADMIN_URL).
+
+Use with:
+    DJANGO_SETTINGS_MODULE=weather_project.settings_production
+"""
+
+from decouple import Csv, config
+
+from .settings import *  # noqa: F401,F403
+
+# SECURITY WARNING: the secret key must come from the environment in production
+SECRET_KEY = config('SECRET_KEY')
+
+DEBUG = False
+
+ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='localhost,127.0.0.1', cast=Csv())
+
+# Admin is only reachable under this prefix
+ADMIN_URL = config('ADMIN_URL', default='manage/')
+
+# Middleware run for every request
+MIDDLEWARE = [
+    'weather_app.middleware.ServerTimingMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'weather_project.middleware.AdminScopedMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+# Middleware only run for requests under ADMIN_URL
+ADMIN_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+]
+
+# Metrics expose cache, upstream and latency internals: off unless enabled,
+# and then best restricted to the scraper with WEATHER_METRICS_ALLOWED_IPS
+WEATHER_METRICS = config('WEATHER_METRICS', default=False, cast=bool)
+
+# Rendered page cache is on by default in production
+WEATHER_PAGE_CACHE = config('WEATHER_PAGE_CACHE', default=True, cast=bool)
+
+# Hashed, precompressed static files (see weather_app.storage)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'weather_app.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# The admin (and its auth checks) rely on the scoped middleware above
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
@@ -14,11 +14,24 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path
-from weather_app import views
+from django.urls import path, re_path
+from weather_app import static_serve, views
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
+    path(settings.ADMIN_URL, admin.site.urls),
     path('', views.index, name='index'),
+    path('api/current', views.api_current, name='api_current'),
+    path('api/forecast', views.api_forecast, name='api_forecast'),
+    path('api/recommendations', views.api_recommendations, name='api_recommendations'),
+    path('api/recommendations/suitable', views.api_suitable_locations, name='api_suitable_locations'),
+    path('api/route', views.api_route, name='api_route'),
+    path('events', views.events, name='events'),
+    path('metrics', views.metrics, name='metrics'),
 ]
+
+if settings.WEATHER_SERVE_STATIC:
+    urlpatterns.append(
+        re_path(r'^{}(?P<path>.*)$'.format(settings.STATIC_URL.lstrip('/')), static_serve.serve, name='static')
+    )